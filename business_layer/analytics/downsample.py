@@ -0,0 +1,53 @@
+# business_layer/analytics/downsample.py
+from typing import Sequence, Tuple
+import numpy as np
+
+def lttb(x: Sequence[float], y: Sequence[float], threshold: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Peaks and
+    dips survive, unlike with plain averaging or striding.
+
+    Args:
+        x: Monotonically increasing x values
+        y: y values matching x
+        threshold: Maximum number of points to keep
+
+    Returns:
+        Tuple of (x, y) arrays with at most `threshold` points
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)).astype(int) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        if bucket + 2 < threshold - 1:
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    selected[-1] = n - 1
+
+    return x[selected], y[selected]
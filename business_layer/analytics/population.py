@@ -0,0 +1,289 @@
+# business_layer/analytics/population.py
+"""
+Population-level analytics across all users.
+
+Users are split into contiguous user_id ranges and processed by a
+multiprocessing pool. Each worker process owns one row of a shared-memory
+array and adds its per-day counts into it, so results never travel back as
+pickled lists; the parent sums the rows and writes the materialized
+population_daily_stats and population_mood_distribution tables.
+
+Run from the project root:
+
+    python -m business_layer.analytics.population --workers 8
+"""
+import argparse
+import multiprocessing as mp
+import os
+import time
+from datetime import date, timedelta
+from multiprocessing import shared_memory
+from typing import Optional, Dict, Any, List, Tuple
+
+import numpy as np
+
+from data_layer.database.connection import DatabaseConnection, open_read_only
+
+# Per-day metric rows in the shared array
+ENTRIES, MOOD_SUM, ACTIVE_USERS, JOURNAL_ENTRIES, JOURNAL_USERS = range(5)
+METRIC_COUNT = 5
+MOOD_LEVEL_COUNT = 10
+
+# Mood entries per user, local day and level: raw rows plus the per-day
+# counts of entries compacted by the retention policy
+MOOD_DAYS_SQL = """SELECT user_id, COALESCE(log_date, date(timestamp, 'localtime')) AS day,
+                          mood_level, 1 AS entries
+                   FROM mood_logs
+                   WHERE user_id BETWEEN :first_user AND :last_user
+                   UNION ALL
+                   SELECT user_id, day, mood_level, entries
+                   FROM mood_daily_summaries
+                   WHERE user_id BETWEEN :first_user AND :last_user"""
+
+# Worker process state, set up once per process by _init_worker
+_worker: Dict[str, Any] = {}
+
+def _attach(name: str, shape: tuple) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+def _init_worker(db_path: str, day_block: str, day_shape: tuple, level_block: str,
+                 level_shape: tuple, slot_counter, first_day: str, last_day: str):
+    """Attach a pool process to the shared arrays and claim its slot row."""
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    day_shm, days = _attach(day_block, day_shape)
+    level_shm, levels = _attach(level_block, level_shape)
+    _worker.update(
+        conn=open_read_only(db_path),
+        first_day=first_day,
+        last_day=last_day,
+        shm=(day_shm, level_shm),
+        days=days[slot],
+        levels=levels[slot],
+    )
+
+def _process_chunk(user_range: Tuple[int, int]) -> int:
+    """
+    Fold one user_id range into this worker's slot of the shared arrays.
+
+    Days are local days (mood_logs.log_date), and entries compacted by the
+    retention policy count through their per-day level counts. Workers read
+    the live database, so rows are limited to the days of the job's scope:
+    an entry logged after the scope was taken, or synced in with an earlier
+    date, would otherwise index outside the day arrays.
+
+    Returns:
+        Number of mood entries processed
+    """
+    first_user, last_user = user_range
+    conn, first_day, last_day = _worker['conn'], _worker['first_day'], _worker['last_day']
+    days, levels = _worker['days'], _worker['levels']
+
+    params = {'first_user': first_user, 'last_user': last_user, 'first_day': first_day, 'last_day': last_day}
+    rows = np.array(conn.execute(
+        f"""WITH moods AS ({MOOD_DAYS_SQL})
+            SELECT CAST(julianday(day) - julianday(:first_day) AS INTEGER) AS day_index,
+                   SUM(entries), SUM(mood_level * entries), COUNT(DISTINCT user_id)
+            FROM moods
+            WHERE day BETWEEN :first_day AND :last_day
+            GROUP BY day_index""",
+        params
+    ).fetchall(), dtype=np.float64).reshape(-1, 4)
+    index = rows[:, 0].astype(np.intp)
+    days[ENTRIES, index] += rows[:, 1]
+    days[MOOD_SUM, index] += rows[:, 2]
+    days[ACTIVE_USERS, index] += rows[:, 3]
+
+    rows = np.array(conn.execute(
+        """SELECT CAST(julianday(day) - julianday(:first_day) AS INTEGER) AS day_index,
+                  COUNT(*), COUNT(DISTINCT user_id)
+           FROM (SELECT user_id, date(timestamp, 'localtime') AS day
+                 FROM journal_entries
+                 WHERE user_id BETWEEN :first_user AND :last_user)
+           WHERE day BETWEEN :first_day AND :last_day
+           GROUP BY day_index""",
+        params
+    ).fetchall(), dtype=np.float64).reshape(-1, 3)
+    index = rows[:, 0].astype(np.intp)
+    days[JOURNAL_ENTRIES, index] += rows[:, 1]
+    days[JOURNAL_USERS, index] += rows[:, 2]
+
+    rows = np.array(conn.execute(
+        f"""WITH moods AS ({MOOD_DAYS_SQL})
+            SELECT mood_level, SUM(entries)
+            FROM moods
+            WHERE day BETWEEN :first_day AND :last_day
+            GROUP BY mood_level""",
+        params
+    ).fetchall(), dtype=np.float64).reshape(-1, 2)
+    levels[rows[:, 0].astype(np.intp) - 1] += rows[:, 1]
+
+    return int(rows[:, 1].sum())
+
+def partition_users(user_ids: List[int], chunk_size: int) -> List[Tuple[int, int]]:
+    """Split sorted user IDs into (first_id, last_id) ranges of chunk_size users."""
+    return [
+        (user_ids[i], user_ids[min(i + chunk_size, len(user_ids)) - 1])
+        for i in range(0, len(user_ids), chunk_size)
+    ]
+
+class PopulationAnalyticsJob:
+    """Recompute population statistics for every user in parallel."""
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 500):
+        self.db = DatabaseConnection()
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+
+    def _scope(self) -> Tuple[List[int], Optional[str], Optional[str]]:
+        """Return sorted user IDs and the first and last day with data."""
+        with self.db.read_snapshot() as conn:
+            user_ids = [row[0] for row in conn.execute("SELECT user_id FROM users ORDER BY user_id")]
+            row = conn.execute(
+                """SELECT MIN(first_day), MAX(last_day) FROM (
+                       SELECT MIN(day) AS first_day, MAX(day) AS last_day
+                       FROM (SELECT COALESCE(log_date, date(timestamp, 'localtime')) AS day FROM mood_logs)
+                       UNION ALL
+                       SELECT MIN(day), MAX(day) FROM mood_daily_summaries
+                       UNION ALL
+                       SELECT MIN(date(timestamp, 'localtime')), MAX(date(timestamp, 'localtime'))
+                       FROM journal_entries
+                   )"""
+            ).fetchone()
+        return user_ids, row[0], row[1]
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the job and write the materialized results tables.
+
+        Returns:
+            Summary with user, day and entry counts and the elapsed time
+        """
+        started = time.perf_counter()
+        user_ids, first_day, last_day = self._scope()
+        day_count = 0
+        if first_day is not None:
+            day_count = (date.fromisoformat(last_day) - date.fromisoformat(first_day)).days + 1
+        chunks = partition_users(user_ids, self.chunk_size)
+        workers = min(self.workers, max(1, len(chunks)))
+
+        day_shape = (workers, METRIC_COUNT, max(1, day_count))
+        level_shape = (workers, MOOD_LEVEL_COUNT)
+        day_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(day_shape)) * 8)
+        level_shm = shared_memory.SharedMemory(create=True, size=int(np.prod(level_shape)) * 8)
+        try:
+            days = np.ndarray(day_shape, dtype=np.float64, buffer=day_shm.buf)
+            levels = np.ndarray(level_shape, dtype=np.float64, buffer=level_shm.buf)
+            days.fill(0)
+            levels.fill(0)
+
+            processed = 0
+            if chunks and day_count and self.db.in_memory:
+                # Worker processes cannot see an in-memory database; fold in this process
+                workers = 1
+                processed = self._run_in_process(chunks, day_shm.name, day_shape, level_shm.name,
+                                                 level_shape, first_day, last_day)
+            elif chunks and day_count:
+                slot_counter = mp.Value('i', 0)
+                with mp.Pool(
+                    workers,
+                    initializer=_init_worker,
+                    initargs=(self.db.db_path, day_shm.name, day_shape, level_shm.name,
+                              level_shape, slot_counter, first_day, last_day)
+                ) as pool:
+                    processed = sum(pool.imap_unordered(_process_chunk, chunks))
+
+            totals = days.sum(axis=0)
+            level_totals = levels.sum(axis=0)
+            # Rates are relative to the users in scope, the same set the workers counted
+            self._write_results(totals, level_totals, first_day, len(user_ids))
+            del days, levels
+        finally:
+            day_shm.close()
+            day_shm.unlink()
+            level_shm.close()
+            level_shm.unlink()
+
+        return {
+            'users': len(user_ids),
+            'chunks': len(chunks),
+            'workers': workers,
+            'days': day_count,
+            'entries': processed,
+            'elapsed_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _run_in_process(self, chunks: List[Tuple[int, int]], day_block: str, day_shape: tuple,
+                        level_block: str, level_shape: tuple, first_day: str, last_day: str) -> int:
+        """Process every chunk in slot 0 of the shared arrays without a pool."""
+        _init_worker(self.db.db_path, day_block, day_shape, level_block, level_shape,
+                     mp.Value('i', 0), first_day, last_day)
+        try:
+            return sum(_process_chunk(chunk) for chunk in chunks)
+        finally:
+            _worker['conn'].close()
+            shms = _worker['shm']
+            _worker.clear()  # Release the array views before detaching
+            for block in shms:
+                block.close()
+
+    def _write_results(self, totals: np.ndarray, level_totals: np.ndarray,
+                       first_day: Optional[str], user_count: int):
+        """Replace the materialized tables with the merged results in one transaction."""
+        daily_rows = []
+        if first_day is not None:
+            start = date.fromisoformat(first_day)
+            users = max(1, user_count)
+            for offset in np.flatnonzero(totals[ENTRIES] + totals[JOURNAL_ENTRIES]):
+                entries = totals[ENTRIES, offset]
+                daily_rows.append((
+                    (start + timedelta(days=int(offset))).isoformat(),
+                    int(totals[ACTIVE_USERS, offset]),
+                    round(totals[ACTIVE_USERS, offset] / users, 4),
+                    int(entries),
+                    round(totals[MOOD_SUM, offset] / entries, 2) if entries else None,
+                    int(totals[JOURNAL_ENTRIES, offset]),
+                    round(totals[JOURNAL_USERS, offset] / users, 4)
+                ))
+
+        level_sum = level_totals.sum()
+        level_rows = [
+            (level + 1, int(count), round(count / level_sum, 4) if level_sum else 0.0)
+            for level, count in enumerate(level_totals)
+        ]
+
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("DELETE FROM population_daily_stats")
+                conn.execute("DELETE FROM population_mood_distribution")
+                conn.executemany(
+                    """INSERT INTO population_daily_stats
+                       (day, active_users, engagement_rate, entries, average_mood,
+                        journal_entries, journaling_rate)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                    daily_rows
+                )
+                conn.executemany(
+                    """INSERT INTO population_mood_distribution (mood_level, entries, share)
+                       VALUES (?, ?, ?)""",
+                    level_rows
+                )
+        finally:
+            conn.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute population-level mood analytics.")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users per work unit")
+    args = parser.parse_args(argv)
+
+    summary = PopulationAnalyticsJob(args.workers, args.chunk_size).run()
+    print(f"Processed {summary['entries']} entries for {summary['users']} users over "
+          f"{summary['days']} days in {summary['elapsed_seconds']}s "
+          f"({summary['workers']} workers, {summary['chunks']} chunks)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# business_layer/analytics/report.py
+from typing import Optional, Dict, Any, List
+import numpy as np
+import pandas as pd
+
+DAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+
+def _series_to_chart(series: pd.Series, date_format: str = '%Y-%m-%d') -> Dict[str, List]:
+    """Convert a datetime-indexed series into parallel label/value lists."""
+    series = series.dropna()
+    return {
+        'labels': series.index.strftime(date_format).tolist(),
+        'values': np.round(series.to_numpy(dtype=float), 2).tolist()
+    }
+
+def _profile_to_chart(series: pd.Series, labels: List) -> Dict[str, List]:
+    """Convert a grouped profile into label/value lists, None where there is no data."""
+    values = series.reindex(range(len(labels))).to_numpy(dtype=float)
+    return {
+        'labels': list(labels),
+        'values': [None if np.isnan(v) else round(float(v), 2) for v in values]
+    }
+
+def longest_run(mask: np.ndarray) -> Optional[tuple]:
+    """
+    Find the longest run of True values.
+
+    Args:
+        mask: Boolean array
+
+    Returns:
+        Tuple of (start, length) or None if the mask has no True values
+    """
+    if not mask.any():
+        return None
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[0::2], edges[1::2]
+    lengths = ends - starts
+    best = int(np.argmax(lengths))
+    return int(starts[best]), int(lengths[best])
+
+def _streak(daily: pd.Series, mask: np.ndarray) -> Optional[Dict[str, Any]]:
+    run = longest_run(mask)
+    if run is None:
+        return None
+    start, length = run
+    return {
+        'length': length,
+        'start': daily.index[start].strftime('%Y-%m-%d'),
+        'end': daily.index[start + length - 1].strftime('%Y-%m-%d'),
+        'average_mood': round(float(daily.iloc[start:start + length].mean()), 2)
+    }
+
+def empty_report(user_id: int) -> Dict[str, Any]:
+    """Report returned when a user has no mood entries."""
+    return {
+        'user_id': user_id,
+        'total_entries': 0,
+        'first_entry': None,
+        'last_entry': None,
+        'average_mood': 0,
+        'daily': {'labels': [], 'values': []},
+        'weekly': {'labels': [], 'values': []},
+        'monthly': {'labels': [], 'values': []},
+        'day_of_week': {'labels': list(DAY_LABELS), 'values': [None] * 7},
+        'hour_of_day': {'labels': list(range(24)), 'values': [None] * 24},
+        'volatility': {'std': 0, 'daily_change_std': 0},
+        'streaks': {'best': None, 'worst': None, 'longest_logging': None}
+    }
+
+def build_streaming_mood_report(user_id: int, blocks, good_threshold: float = 7,
+                                bad_threshold: float = 4, compacted_blocks=()) -> Dict[str, Any]:
+    """
+    Compute the long-range analytics report from streamed history blocks.
+
+    Blocks (see MoodDAO.iter_history_chunks) are folded into per-day,
+    per-weekday and per-hour sums and counts plus running moments; weekly
+    and monthly means are derived from the daily sums. Memory grows with
+    the number of calendar days covered, not with the number of entries.
+
+    Args:
+        user_id: User ID
+        blocks: Iterable of structured arrays with day, weekday, hour,
+            mood_level and epoch fields
+        good_threshold: Daily average at or above which a day counts as good
+        bad_threshold: Daily average at or below which a day counts as bad
+        compacted_blocks: Blocks of entries compacted by the retention policy
+            (see MoodDAO.iter_compacted_chunks); they count everywhere except
+            in the hour-of-day profile, since their times were not kept
+
+    Returns:
+        Dictionary of chart-ready label/value lists and summary figures
+    """
+    from business_layer.analytics.streaming import GroupedMoments, Moments, fold
+
+    moments, epochs = Moments('mood_level'), Moments('epoch')
+    days = GroupedMoments('day', 'mood_level')
+    weekdays = GroupedMoments('weekday', 'mood_level', size=7)
+    hours = GroupedMoments('hour', 'mood_level', size=24)
+    fold(blocks, moments, epochs, days, weekdays, hours)
+    fold(compacted_blocks, moments, epochs, days, weekdays)
+    if not moments.count:
+        return empty_report(user_id)
+
+    index = pd.to_datetime(days.keys, unit='D')
+    day_sums = pd.Series(days.sums.values, index=index)
+    day_counts = pd.Series(days.counts.values, index=index)
+    daily = pd.Series(days.means(), index=index)
+
+    def period_means(rule: str) -> pd.Series:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return day_sums.resample(rule).sum() / day_counts.resample(rule).sum()
+
+    daily_values = daily.to_numpy()
+    daily_change_std = daily.dropna().diff().std()
+
+    return {
+        'user_id': user_id,
+        'total_entries': moments.count,
+        'first_entry': pd.Timestamp(int(epochs.minimum), unit='s').isoformat(),
+        'last_entry': pd.Timestamp(int(epochs.maximum), unit='s').isoformat(),
+        'average_mood': round(moments.mean, 2),
+        'daily': _series_to_chart(daily),
+        'weekly': _series_to_chart(period_means('W')),
+        'monthly': _series_to_chart(period_means('MS'), '%Y-%m'),
+        'day_of_week': _profile_to_chart(pd.Series(weekdays.means()), DAY_LABELS),
+        'hour_of_day': _profile_to_chart(pd.Series(hours.means()), list(range(24))),
+        'volatility': {
+            'std': round(moments.std, 2),
+            'daily_change_std': 0 if pd.isna(daily_change_std) else round(float(daily_change_std), 2)
+        },
+        'streaks': {
+            'best': _streak(daily, daily_values >= good_threshold),
+            'worst': _streak(daily, daily_values <= bad_threshold),
+            'longest_logging': _streak(daily, ~np.isnan(daily_values))
+        }
+    }
@@ -0,0 +1,285 @@
+# business_layer/analytics/streaming.py
+"""
+Memory-bounded aggregation over streamed NumPy blocks.
+
+A query is read in fixed-size blocks (see data_layer.database.chunked) and
+each block is folded into partial aggregates. Every aggregate can merge()
+another partial of the same kind, so the work can also be split across
+users, time ranges or processes and combined afterwards. Memory depends on
+the block size and the number of groups or sketch buckets, never on the
+number of rows.
+
+    moments, levels = Moments('mood_level'), Histogram('mood_level', 1, 10)
+    fold(mood_dao.iter_history_chunks(user_id), moments, levels)
+    moments.mean, moments.std, levels.quantile(0.9)
+
+For a batch report over a user's full history, run from the project root:
+
+    python -m business_layer.analytics.streaming --user-id 1 [--chunk-size 4096]
+"""
+import argparse
+import math
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+class Aggregate(ABC):
+    """
+    A mergeable partial aggregate over one field of the streamed blocks.
+
+    Subclasses implement update() and merge().
+    """
+
+    @abstractmethod
+    def update(self, block: np.ndarray):
+        """Fold one block of rows into the aggregate."""
+
+    @abstractmethod
+    def merge(self, other: "Aggregate") -> "Aggregate":
+        """Combine another partial of the same kind into this one and return self."""
+
+def fold(blocks: Iterable[np.ndarray], *aggregates: Aggregate) -> Tuple[Aggregate, ...]:
+    """Feed every block to every aggregate, one block at a time."""
+    for block in blocks:
+        for aggregate in aggregates:
+            aggregate.update(block)
+    return aggregates
+
+class DenseStore:
+    """Float counters over a contiguous integer key range that grows as needed."""
+
+    def __init__(self, size: int = 0):
+        self.base = 0
+        self.values = np.zeros(size, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    @property
+    def keys(self) -> np.ndarray:
+        return np.arange(self.base, self.base + self.values.size)
+
+    def _cover(self, low: int, high: int):
+        """Grow the range to include keys low..high."""
+        if not self.values.size:
+            self.base = low
+            self.values = np.zeros(high - low + 1, dtype=np.float64)
+            return
+        end = self.base + self.values.size - 1
+        if low >= self.base and high <= end:
+            return
+        new_base, new_end = min(low, self.base), max(high, end)
+        values = np.zeros(new_end - new_base + 1, dtype=np.float64)
+        values[self.base - new_base:self.base - new_base + self.values.size] = self.values
+        self.base, self.values = new_base, values
+
+    def add(self, keys: np.ndarray, weights: Optional[np.ndarray] = None):
+        if not keys.size:
+            return
+        self._cover(int(keys.min()), int(keys.max()))
+        self.values += np.bincount(keys - self.base, weights=weights, minlength=self.values.size)
+
+    def merge(self, other: "DenseStore"):
+        if not other.values.size:
+            return
+        self._cover(other.base, other.base + other.values.size - 1)
+        start = other.base - self.base
+        self.values[start:start + other.values.size] += other.values
+
+class Moments(Aggregate):
+    """Count, mean, variance, minimum and maximum (Chan et al. parallel merge)."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def _combine(self, count: int, mean: float, m2: float, minimum: float, maximum: float):
+        if not count:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.minimum = min(self.minimum, minimum)
+        self.maximum = max(self.maximum, maximum)
+
+    def update(self, block: np.ndarray):
+        values = block[self.field].astype(np.float64)
+        if values.size:
+            mean = float(values.mean())
+            self._combine(values.size, mean, float(((values - mean) ** 2).sum()),
+                          float(values.min()), float(values.max()))
+
+    def merge(self, other: "Moments") -> "Moments":
+        self._combine(other.count, other.mean, other.m2, other.minimum, other.maximum)
+        return self
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.count - ddof) if self.count > ddof else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(self.variance())
+
+class GroupedMoments(Aggregate):
+    """Per-key count and sum of a value field, for integer keys (days, weekdays, hours...)."""
+
+    def __init__(self, key: str, field: str, size: int = 0):
+        self.key = key
+        self.field = field
+        self.sums = DenseStore(size)
+        self.counts = DenseStore(size)
+
+    def update(self, block: np.ndarray):
+        keys = block[self.key].astype(np.int64)
+        self.sums.add(keys, block[self.field].astype(np.float64))
+        self.counts.add(keys)
+
+    def merge(self, other: "GroupedMoments") -> "GroupedMoments":
+        self.sums.merge(other.sums)
+        self.counts.merge(other.counts)
+        return self
+
+    @property
+    def keys(self) -> np.ndarray:
+        return self.counts.keys
+
+    def means(self) -> np.ndarray:
+        """Mean per key over the covered range, NaN for keys without rows."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.counts.values > 0, self.sums.values / self.counts.values, np.nan)
+
+class Histogram(Aggregate):
+    """Exact counts of integer values in [low, high]; gives exact quantiles for small domains."""
+
+    def __init__(self, field: str, low: int, high: int):
+        self.field = field
+        self.low = low
+        self.counts = np.zeros(high - low + 1, dtype=np.int64)
+
+    def update(self, block: np.ndarray):
+        values = block[self.field].astype(np.int64) - self.low
+        values = values[(values >= 0) & (values < self.counts.size)]
+        self.counts += np.bincount(values, minlength=self.counts.size)
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        self.counts += other.counts
+        return self
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile with linear interpolation between ranks (as numpy.quantile)."""
+        total = self.count
+        if not total:
+            return None
+        cumulative = np.cumsum(self.counts)
+        rank = q * (total - 1)
+        lower = int(np.searchsorted(cumulative, math.floor(rank), side='right'))
+        upper = int(np.searchsorted(cumulative, math.ceil(rank), side='right'))
+        return self.low + lower + (upper - lower) * (rank - math.floor(rank))
+
+class QuantileSketch(Aggregate):
+    """
+    Quantiles of an unbounded numeric field within a relative error (DDSketch).
+
+    Values fall into logarithmically spaced buckets, so the sketch size
+    depends on the range of values (about 700 buckets per factor of 1e6 at
+    1% accuracy), not on how many there are. Sketches with the same accuracy
+    merge exactly.
+    """
+
+    def __init__(self, field: str, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.field = field
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = DenseStore()
+        self.negative = DenseStore()
+        self.zeros = 0
+
+    def _keys(self, values: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def update(self, block: np.ndarray):
+        values = block[self.field].astype(np.float64)
+        self.positive.add(self._keys(values[values > 0]))
+        self.negative.add(self._keys(-values[values < 0]))
+        self.zeros += int(np.count_nonzero(values == 0))
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.zeros += other.zeros
+        return self
+
+    @property
+    def count(self) -> int:
+        return int(round(self.positive.values.sum() + self.negative.values.sum())) + self.zeros
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1) of the values seen."""
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+
+        # Walk from the most negative value upwards
+        cumulative = 0.0
+        for key, count in zip(self.negative.keys[::-1], self.negative.values[::-1]):
+            cumulative += count
+            if cumulative > rank:
+                return -self._value(int(key))
+        cumulative += self.zeros
+        if cumulative > rank:
+            return 0.0
+        for key, count in zip(self.positive.keys, self.positive.values):
+            cumulative += count
+            if cumulative > rank:
+                return self._value(int(key))
+        return self._value(int(self.positive.keys[-1]))
+
+def main(argv=None):
+    import tracemalloc
+    from business_layer.analytics.report import build_streaming_mood_report
+    from data_layer.dao.mood_dao import MoodDAO
+
+    parser = argparse.ArgumentParser(description="Build a user's analytics report in bounded memory.")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--chunk-size", type=int, default=4096, help="rows per block")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    dao = MoodDAO()
+    report = build_streaming_mood_report(
+        args.user_id, dao.iter_history_chunks(args.user_id, args.chunk_size),
+        compacted_blocks=dao.iter_compacted_chunks(args.user_id, args.chunk_size)
+    )
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{report['total_entries']} entries, average {report['average_mood']}, "
+          f"{len(report['daily']['labels'])} days with entries")
+    print(f"Peak traced memory: {peak / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
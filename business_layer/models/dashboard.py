@@ -0,0 +1,37 @@
+# business_layer/models/dashboard.py
+from dataclasses import dataclass, field
+from typing import Optional, List
+from business_layer.models.mood import Mood
+from business_layer.models.wellness import WellnessState
+
+@dataclass
+class DashboardSnapshot:
+    """Everything the dashboard renders, read in one round trip."""
+    
+    user_id: int = 0
+    today_mood: Optional[Mood] = None
+    stats: dict = field(default_factory=lambda: {
+        'total_entries': 0,
+        'average_mood': 0,
+        'lowest_mood': 0,
+        'highest_mood': 0
+    })
+    recent_moods: List[Mood] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    wellness: Optional[WellnessState] = None
+    
+    @property
+    def recent_levels(self) -> List[int]:
+        """Mood levels of the recent entries, newest first."""
+        return [mood.mood_level for mood in self.recent_moods]
+    
+    def to_dict(self) -> dict:
+        """Convert snapshot to dictionary."""
+        return {
+            'user_id': self.user_id,
+            'today_mood': self.today_mood.to_dict() if self.today_mood else None,
+            'stats': dict(self.stats),
+            'recent_moods': [mood.to_dict() for mood in self.recent_moods],
+            'recommendations': list(self.recommendations),
+            'wellness': self.wellness.to_dict() if self.wellness else None
+        }
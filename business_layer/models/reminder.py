@@ -0,0 +1,15 @@
+# business_layer/models/reminder.py
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class Reminder:
+    """A daily check-in reminder due for a user who has not logged a mood today."""
+
+    user_id: int
+    username: str
+    local_date: str  # The user's local day, 'YYYY-MM-DD'
+    due_at: float  # Unix time of the preferred reminder time on that day
+
+    @property
+    def message(self) -> str:
+        return f"Hi {self.username}, how are you feeling today? Take a moment to log your mood."
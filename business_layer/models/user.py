@@ -1,8 +1,17 @@
 # business_layer/models/user.py
+import re
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# Compiled once at import; validation runs per row in bulk provisioning
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9_]{3,20}$')
+
+def normalize_email(email: Optional[str]) -> str:
+    """Canonical form of an email address, used wherever one is stored or looked up."""
+    return (email or "").strip().lower()
+
 @dataclass
 class User:
     """User model representing a user entity."""
@@ -17,23 +26,17 @@ class User:
         if self.username:
             self.username = self.username.strip()
         if self.email:
-            self.email = self.email.strip().lower()
+            self.email = normalize_email(self.email)
     
     @property
     def is_valid_email(self) -> bool:
         """Check if email format is valid."""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, self.email))
+        return bool(EMAIL_PATTERN.match(self.email))
     
     @property
     def is_valid_username(self) -> bool:
         """Check if username is valid (3-20 chars, alphanumeric + underscore)."""
-        import re
-        if not self.username or len(self.username) < 3 or len(self.username) > 20:
-            return False
-        pattern = r'^[a-zA-Z0-9_]+$'
-        return bool(re.match(pattern, self.username))
+        return bool(USERNAME_PATTERN.match(self.username))
     
     def to_dict(self) -> dict:
         """Convert user to dictionary (excluding sensitive data)."""
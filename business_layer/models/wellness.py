@@ -0,0 +1,173 @@
+# business_layer/models/wellness.py
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+# Smoothing for the wellness score: alpha = 2 / (span + 1) with a 7-entry span
+EWMA_ALPHA = 2 / (7 + 1)
+# Entries needed before a z-score is meaningful, and the alert threshold
+ANOMALY_MIN_ENTRIES = 5
+ANOMALY_Z_THRESHOLD = 2.0
+
+@dataclass
+class WellnessState:
+    """Running wellness, variance, streak and anomaly state for one user."""
+
+    user_id: int = 0
+    wellness_score: float = 0.0  # EWMA of mood levels
+    entry_count: int = 0
+    mean: float = 0.0  # Welford running mean
+    m2: float = 0.0  # Welford sum of squared deviations
+    current_streak: int = 0  # Consecutive days with at least one entry
+    best_streak: int = 0
+    last_log_date: Optional[date] = None
+    last_mood_id: Optional[int] = None
+    last_mood_level: Optional[int] = None
+    last_zscore: Optional[float] = None
+    is_anomaly: bool = False
+
+    @property
+    def variance(self) -> float:
+        """Population variance of all mood levels."""
+        return self.m2 / self.entry_count if self.entry_count else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation of all mood levels."""
+        return math.sqrt(self.variance)
+
+    def streak_as_of(self, today: Optional[date] = None) -> int:
+        """
+        Current streak as seen on a given local day.
+
+        The stored streak only changes when an entry is written, so once a
+        whole day passes without one it is reported as broken.
+
+        Args:
+            today: Local day to evaluate (defaults to today, the same local
+                day used for mood_logs.log_date)
+        """
+        today = today or date.today()
+        if self.last_log_date is None or (today - self.last_log_date).days > 1:
+            return 0
+        return self.current_streak
+
+    def _zscore(self, mood_level: int, mean: float, m2: float, count: int) -> Optional[float]:
+        if count < ANOMALY_MIN_ENTRIES:
+            return None
+        std = math.sqrt(m2 / count)
+        if std == 0:
+            return 0.0
+        return (mood_level - mean) / std
+
+    def apply_entry(self, mood_id: Optional[int], mood_level: int, log_date: date):
+        """Fold a new mood entry into the state in O(1)."""
+        # Score the entry against the history before it
+        self.last_zscore = self._zscore(mood_level, self.mean, self.m2, self.entry_count)
+        self.is_anomaly = self.last_zscore is not None and abs(self.last_zscore) >= ANOMALY_Z_THRESHOLD
+
+        self.entry_count += 1
+        delta = mood_level - self.mean
+        self.mean += delta / self.entry_count
+        self.m2 += delta * (mood_level - self.mean)
+
+        if self.entry_count == 1:
+            self.wellness_score = float(mood_level)
+        else:
+            self.wellness_score += EWMA_ALPHA * (mood_level - self.wellness_score)
+
+        if self.last_log_date is None or (log_date - self.last_log_date).days > 1:
+            self.current_streak = 1
+        elif (log_date - self.last_log_date).days == 1:
+            self.current_streak += 1
+        self.best_streak = max(self.best_streak, self.current_streak)
+        if self.last_log_date is None or log_date > self.last_log_date:
+            self.last_log_date = log_date
+
+        self.last_mood_id = mood_id
+        self.last_mood_level = mood_level
+
+    def replace_entry(self, mood_id: int, old_level: int, new_level: int):
+        """
+        Account for an edited mood level in O(1).
+
+        The running mean and variance are corrected exactly. The wellness
+        score and anomaly flag are corrected when the edited entry is the
+        latest one; older edits are picked up by a rebuild.
+        """
+        if self.entry_count == 0 or old_level == new_level:
+            return
+
+        old_mean = self.mean
+        self.mean += (new_level - old_level) / self.entry_count
+        self.m2 += (new_level - old_level) * (new_level - self.mean + old_level - old_mean)
+        self.m2 = max(self.m2, 0.0)
+
+        if mood_id == self.last_mood_id:
+            if self.entry_count == 1:
+                self.wellness_score = float(new_level)
+            else:
+                self.wellness_score += EWMA_ALPHA * (new_level - old_level)
+            if self.last_zscore is not None:
+                # Undo this entry to score it against the history before it
+                count = self.entry_count - 1
+                prior_mean = (self.mean * self.entry_count - new_level) / count
+                prior_m2 = max(self.m2 - (new_level - prior_mean) * (new_level - self.mean), 0.0)
+                self.last_zscore = self._zscore(new_level, prior_mean, prior_m2, count)
+                self.is_anomaly = self.last_zscore is not None and abs(self.last_zscore) >= ANOMALY_Z_THRESHOLD
+            self.last_mood_level = new_level
+
+    def to_dict(self, today: Optional[date] = None) -> dict:
+        """Convert state to dictionary, with the streak as seen on ``today``."""
+        return {
+            'user_id': self.user_id,
+            'wellness_score': round(self.wellness_score, 2),
+            'entry_count': self.entry_count,
+            'mean': round(self.mean, 2),
+            'std': round(self.std, 2),
+            'current_streak': self.streak_as_of(today),
+            'best_streak': self.best_streak,
+            'last_log_date': self.last_log_date.isoformat() if self.last_log_date else None,
+            'last_mood_level': self.last_mood_level,
+            'last_zscore': round(self.last_zscore, 2) if self.last_zscore is not None else None,
+            'is_anomaly': self.is_anomaly
+        }
+
+    def to_row(self) -> dict:
+        """Convert state to a user_wellness_state row."""
+        return {
+            'user_id': self.user_id,
+            'wellness_score': self.wellness_score,
+            'entry_count': self.entry_count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'current_streak': self.current_streak,
+            'best_streak': self.best_streak,
+            'last_log_date': self.last_log_date.isoformat() if self.last_log_date else None,
+            'last_mood_id': self.last_mood_id,
+            'last_mood_level': self.last_mood_level,
+            'last_zscore': self.last_zscore,
+            'is_anomaly': int(self.is_anomaly)
+        }
+
+    @classmethod
+    def from_row(cls, data: dict) -> 'WellnessState':
+        """Create WellnessState from a user_wellness_state row."""
+        last_log_date = data.get('last_log_date')
+        if isinstance(last_log_date, str):
+            last_log_date = date.fromisoformat(last_log_date)
+        return cls(
+            user_id=data['user_id'],
+            wellness_score=data['wellness_score'],
+            entry_count=data['entry_count'],
+            mean=data['mean'],
+            m2=data['m2'],
+            current_streak=data['current_streak'],
+            best_streak=data['best_streak'],
+            last_log_date=last_log_date,
+            last_mood_id=data['last_mood_id'],
+            last_mood_level=data['last_mood_level'],
+            last_zscore=data['last_zscore'],
+            is_anomaly=bool(data['is_anomaly'])
+        )
@@ -0,0 +1,109 @@
+# business_layer/passwords.py
+import argparse
+import hashlib
+import hmac
+import multiprocessing as mp
+import os
+import re
+from functools import partial
+from typing import List, Optional, Sequence
+import bcrypt
+from data_layer import settings
+
+# Prefix of every bcrypt hash ($2a$, $2b$, $2y$)
+BCRYPT_PREFIX = "$2"
+
+# Legacy salted hashes, 'salt:hex(sha256(password + salt))' (as in data/mindfulbalance.db)
+LEGACY_SALTED_PATTERN = re.compile(r"^([^:$]+):([0-9a-f]{64})$")
+
+# Operator command that hashes passwords still stored in plaintext
+UPGRADE_PLAINTEXT_COMMAND = "python -m business_layer.passwords upgrade-plaintext"
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password with bcrypt for storage."""
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("ascii")
+
+def is_hashed(stored: str) -> bool:
+    return bool(stored) and stored.startswith(BCRYPT_PREFIX)
+
+def is_legacy_hash(stored: str) -> bool:
+    return bool(stored) and LEGACY_SALTED_PATTERN.match(stored) is not None
+
+def is_plaintext(stored: str) -> bool:
+    """True for passwords stored before hashing (see UPGRADE_PLAINTEXT_COMMAND)."""
+    return bool(stored) and not is_hashed(stored) and not is_legacy_hash(stored)
+
+def verify_plaintext(password: str, stored: str) -> bool:
+    """
+    One-time check of a password stored before hashing, in constant time.
+
+    Only for rows where is_plaintext() holds; the caller must replace the
+    stored value with a hash as soon as this succeeds.
+    """
+    if not is_plaintext(stored):
+        return False
+    return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Check a password against its stored hash.
+
+    bcrypt hashes and legacy salted SHA-256 hashes are verified (the latter
+    in constant time, then upgraded by the caller, see needs_rehash).
+    Anything else is rejected: the stored value is never compared with the
+    password itself.
+    """
+    if is_hashed(stored):
+        try:
+            return bcrypt.checkpw(password.encode("utf-8"), stored.encode("ascii"))
+        except ValueError:
+            return False
+    match = LEGACY_SALTED_PATTERN.match(stored or "")
+    if match is None:
+        return False
+    salt, expected = match.groups()
+    digest = hashlib.sha256((password + salt).encode("utf-8")).hexdigest()
+    return hmac.compare_digest(digest, expected)
+
+def needs_rehash(stored: str, rounds: Optional[int] = None) -> bool:
+    """True for legacy hashes and bcrypt hashes made with a different work factor."""
+    if not is_hashed(stored):
+        return True
+    try:
+        return int(stored.split("$")[2]) != (rounds or settings.BCRYPT_ROUNDS)
+    except (IndexError, ValueError):
+        return True
+
+def hash_passwords(passwords: Sequence[str], processes: Optional[int] = None,
+                   rounds: Optional[int] = None) -> List[str]:
+    """
+    Hash many passwords in a process pool.
+
+    bcrypt is CPU bound by design, so a large batch is spread over one
+    worker per core (or `processes`); small batches are hashed in-process.
+
+    Returns:
+        Hashes in the order of `passwords`
+    """
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    processes = min(processes or os.cpu_count() or 1, len(passwords))
+    if processes <= 1:
+        return [hash_password(password, rounds) for password in passwords]
+    chunksize = max(1, len(passwords) // (processes * 4))
+    with mp.get_context("spawn").Pool(processes) as pool:
+        return pool.map(partial(hash_password, rounds=rounds), passwords, chunksize)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password storage maintenance.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade = commands.add_parser("upgrade-plaintext", help="hash every password still stored in plaintext")
+    upgrade.add_argument("--processes", type=int, help="hashing processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    from business_layer.services.user_service import UserService
+    upgraded = UserService().upgrade_plaintext_passwords(args.processes)
+    print(f"Hashed {upgraded} plaintext password(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# business_layer/services/container.py
+import threading
+from typing import Optional
+from business_layer.services.journal_service import JournalService
+from business_layer.services.mood_service import MoodService
+from business_layer.services.reminder_service import ReminderService
+from business_layer.services.session_service import SessionService
+from business_layer.services.strategy_service import StrategyCatalog, get_strategy_catalog
+from business_layer.services.user_service import UserService
+from business_layer.services.wellness_service import WellnessService
+from data_layer.api.tip_provider import TipProvider, get_tip_provider
+from data_layer.dao.cached_mood_dao import CachedMoodDAO
+from data_layer.events import DatabaseRestored, get_event_bus
+
+class ServiceContainer:
+    """
+    Process-wide holder for the application services.
+
+    Services are stateless apart from their DAOs and caches, so one instance
+    of each is shared by every session (e.g. every Flet web client). Each is
+    created on first use under a lock. Per-session state such as the logged
+    in user stays on the session object, never here.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._user_service: Optional[UserService] = None
+        self._wellness_service: Optional[WellnessService] = None
+        self._mood_cache: Optional[CachedMoodDAO] = None
+        self._mood_service: Optional[MoodService] = None
+        self._journal_service: Optional[JournalService] = None
+        self._reminder_service: Optional[ReminderService] = None
+        self._session_service: Optional[SessionService] = None
+        # The mood cache listens for itself; the other caches are dropped here
+        self.restore_subscription = get_event_bus().subscribe(DatabaseRestored, self._on_restore)
+
+    def _on_restore(self, event: DatabaseRestored):
+        if self._session_service is not None:
+            self._session_service.clear_cache()
+        self.strategy_catalog.invalidate()
+
+    @property
+    def user_service(self) -> UserService:
+        if self._user_service is None:
+            with self._lock:
+                if self._user_service is None:
+                    self._user_service = UserService()
+        return self._user_service
+
+    @property
+    def wellness_service(self) -> WellnessService:
+        if self._wellness_service is None:
+            with self._lock:
+                if self._wellness_service is None:
+                    self._wellness_service = WellnessService()
+        return self._wellness_service
+
+    @property
+    def mood_cache(self) -> CachedMoodDAO:
+        """The per-user mood read cache, subscribed to the event bus once per process."""
+        if self._mood_cache is None:
+            with self._lock:
+                if self._mood_cache is None:
+                    self._mood_cache = CachedMoodDAO()
+        return self._mood_cache
+
+    @property
+    def mood_service(self) -> MoodService:
+        if self._mood_service is None:
+            wellness_service = self.wellness_service
+            mood_cache = self.mood_cache
+            with self._lock:
+                if self._mood_service is None:
+                    self._mood_service = MoodService(wellness_service, mood_cache)
+        return self._mood_service
+
+    @property
+    def journal_service(self) -> JournalService:
+        if self._journal_service is None:
+            with self._lock:
+                if self._journal_service is None:
+                    self._journal_service = JournalService()
+        return self._journal_service
+
+    @property
+    def reminder_service(self) -> ReminderService:
+        if self._reminder_service is None:
+            with self._lock:
+                if self._reminder_service is None:
+                    self._reminder_service = ReminderService()
+        return self._reminder_service
+
+    @property
+    def session_service(self) -> SessionService:
+        if self._session_service is None:
+            with self._lock:
+                if self._session_service is None:
+                    self._session_service = SessionService()
+        return self._session_service
+
+    @property
+    def strategy_catalog(self) -> StrategyCatalog:
+        return get_strategy_catalog()
+
+    @property
+    def tip_provider(self) -> TipProvider:
+        return get_tip_provider(fallback=self.strategy_catalog.get_tip)
+
+_services: Optional[ServiceContainer] = None
+_services_lock = threading.Lock()
+
+def get_services() -> ServiceContainer:
+    """Return the process-wide service container, creating it on first use."""
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = ServiceContainer()
+    return _services
@@ -0,0 +1,23 @@
+# business_layer/services/journal_service.py
+from typing import List, Optional, Tuple
+from data_layer.dao.journal_dao import JournalDAO
+
+class JournalService:
+    """Business logic for journal entries."""
+
+    def __init__(self):
+        self.journal_dao = JournalDAO()
+
+    def save_entry(self, user_id: int, content: str) -> Tuple[bool, str, Optional[int]]:
+        """Save a journal entry for a user."""
+        content = (content or "").strip()
+        if not content:
+            return False, "Journal entry is empty", None
+        entry_id = self.journal_dao.create_entry(user_id, content)
+        if entry_id is None:
+            return False, "Failed to save journal entry", None
+        return True, "Journal entry saved", entry_id
+
+    def get_history(self, user_id: int, limit: int = 50) -> List[dict]:
+        """Get a user's journal entries, newest first."""
+        return self.journal_dao.get_user_entries(user_id, limit)
@@ -1,27 +1,56 @@
 # business_layer/services/mood_service.py
 from typing import Optional, Tuple, List
 from business_layer.models.mood import Mood
-from data_layer.dao.mood_dao import MoodDAO
+from business_layer.models.dashboard import DashboardSnapshot
+from business_layer.models.wellness import WellnessState
+from business_layer.services.strategy_service import get_strategy_catalog
+from business_layer.services.wellness_service import WellnessService
+from data_layer.dao.cached_mood_dao import CachedMoodDAO
 from data_layer.database.connection import DatabaseConnection
 from datetime import datetime, timedelta
+import sqlite3
 
 class MoodService:
     """Business logic for mood operations."""
     
-    def __init__(self):
+    def __init__(self, wellness_service: Optional[WellnessService] = None,
+                 mood_dao: Optional[CachedMoodDAO] = None):
         self.db = DatabaseConnection()
-        self.mood_dao = MoodDAO()
+        # Per-user reads are served from memory until the user writes again
+        self._owns_mood_dao = mood_dao is None
+        self.mood_dao = mood_dao or CachedMoodDAO()
+        self.strategy_catalog = get_strategy_catalog()
+        self.wellness_service = wellness_service or WellnessService()
+
+    def close(self):
+        """Release the read cache this service created (a shared one is left open)."""
+        if self._owns_mood_dao:
+            self.mood_dao.close()
     
     def log_mood(self, user_id: int, mood_level: int) -> Tuple[bool, str, Optional[dict]]:
         """Log a new mood entry and return updated statistics."""
         try:
-            # Use DAO to insert into mood_logs
-            mood_id = self.mood_dao.create_mood_entry(user_id, mood_level)
-            if mood_id is None:
+            # Fold the entry into the running wellness state (O(1)) in the
+            # same transaction as the insert
+            folded = []
+            def fold(conn, user_id, mood_id, previous_level, log_date):
+                folded.append(self.wellness_service.apply_write(
+                    conn, user_id, mood_id, mood_level, previous_level, log_date
+                ))
+
+            if self.db.one_mood_per_day:
+                # Repeat taps on the same day update today's entry in place
+                written = self.mood_dao.upsert_daily_mood(user_id, mood_level, on_write=fold) is not None
+            else:
+                # Use DAO to insert into mood_logs
+                written = self.mood_dao.create_mood_entry(user_id, mood_level, on_write=fold) is not None
+            if not written:
                 return False, "Failed to log mood", None
+            wellness = folded[-1]
 
             # Get updated statistics from mood_logs
             stats = self.mood_dao.get_mood_statistics(user_id)
+            stats['wellness'] = wellness.to_dict()
             return True, "Mood logged successfully", stats
 
         except Exception as e:
@@ -59,13 +88,34 @@ class MoodService:
         if mood_level < 1 or mood_level > 10:
             return False, "Mood level must be between 1 and 10"
         
-        success = self.mood_dao.update_mood_entry(mood_id, mood_level, notes)
+        def fold(conn, user_id, mood_id, previous_level, log_date):
+            self.wellness_service.apply_write(conn, user_id, mood_id, mood_level, previous_level, log_date)
+        
+        success = self.mood_dao.update_mood_entry(mood_id, mood_level, notes, on_write=fold)
         
         if success:
             return True, "Mood updated successfully"
         else:
             return False, "Failed to update mood. Please try again."
     
+    def delete_mood(self, mood_id: int) -> Tuple[bool, str]:
+        """
+        Delete a mood entry.
+        
+        A removed entry cannot be unfolded from the running averages, the
+        smoothed score or the streak, so the user's wellness state is
+        rebuilt in the same transaction as the delete.
+        
+        Args:
+            mood_id: Mood ID to delete
+            
+        Returns:
+            Tuple of (success, message)
+        """
+        if self.mood_dao.delete_mood_entry(mood_id, on_delete=self.wellness_service.rebuild_in_transaction):
+            return True, "Mood deleted successfully"
+        return False, "Failed to delete mood. Please try again."
+    
     def get_user_mood_history(self, user_id: int, limit: int = 10) -> List[Mood]:
         """
         Get mood history for a user.
@@ -80,52 +130,107 @@ class MoodService:
         mood_data_list = self.mood_dao.get_user_moods(user_id, limit)
         return [Mood.from_dict(mood_data) for mood_data in mood_data_list]
     
-    def get_mood_statistics(self, user_id: int) -> dict:
-        """Get mood statistics for a user."""
-        try:
-            conn = self.db.get_connection()
-            cursor = conn.cursor()
+    def get_mood_statistics(self, user_id: int, days: int = 30) -> dict:
+        """
+        Get mood statistics for a user.
+        
+        Args:
+            user_id: User ID
+            days: Number of days to analyze
             
-            # Get total entries and average mood
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_entries,
-                    AVG(mood_level) as average_mood,
-                    MIN(mood_level) as lowest_mood,
-                    MAX(mood_level) as highest_mood
-                FROM moods 
-                WHERE user_id = ?
-            """, (user_id,))
+        Returns:
+            Dictionary with total_entries, average_mood, lowest_mood and highest_mood
+        """
+        stats = self.mood_dao.get_mood_statistics(user_id, days)
+        return {
+            'total_entries': stats['total_entries'],
+            'average_mood': stats['average_mood'],
+            'lowest_mood': stats['lowest_mood'] or 0,
+            'highest_mood': stats['highest_mood'] or 0
+        }
+    
+    def get_extended_statistics(self, user_id: int, days: int = 30) -> dict:
+        """
+        Get median, percentiles, standard deviation, weekday means, trend and
+        streaks for a user, computed inside SQLite in one statement.
+        
+        Args:
+            user_id: User ID
+            days: Number of days to analyze
+            
+        Returns:
+            Dictionary of extended statistics (see MoodDAO.get_extended_statistics)
+        """
+        return self.mood_dao.get_extended_statistics(user_id, days)
+    
+    def get_dashboard_snapshot(self, user_id: int, days: int = 30, recent_limit: int = 7) -> DashboardSnapshot:
+        """
+        Get today's mood, window statistics, recent entries, recommendations
+        and wellness state from one read snapshot: a single history query plus
+        a primary-key lookup of the wellness state.
+        
+        Args:
+            user_id: User ID
+            days: Number of days covered by the statistics
+            recent_limit: Number of recent entries to include
             
-            row = cursor.fetchone()
+        Returns:
+            DashboardSnapshot for the user
+        """
+        with self.db.read_snapshot():
+            data = self.mood_dao.get_dashboard_snapshot(user_id, days, recent_limit)
+            wellness = self.wellness_service.get_state(user_id)
+        today_mood = Mood.from_dict(data['today']) if data['today'] else None
+        return DashboardSnapshot(
+            user_id=user_id,
+            today_mood=today_mood,
+            stats=data['stats'],
+            recent_moods=[Mood.from_dict(mood_data) for mood_data in data['recent']],
+            recommendations=self._build_recommendations(today_mood),
+            wellness=wellness
+        )
+    
+    def get_wellness_state(self, user_id: int) -> WellnessState:
+        """
+        Get the running wellness score, streaks and anomaly flag for a user.
+        
+        Args:
+            user_id: User ID
             
-            if row:
-                total_entries = row[0]
-                average_mood = row[1] if row[1] is not None else 0
-                return {
-                    'total_entries': total_entries,
-                    'average_mood': round(average_mood, 1),
-                    'lowest_mood': row[2] if row[2] is not None else 0,
-                    'highest_mood': row[3] if row[3] is not None else 0
-                }
-            return {
-                'total_entries': 0,
-                'average_mood': 0,
-                'lowest_mood': 0,
-                'highest_mood': 0
-            }
+        Returns:
+            WellnessState, read with a single primary-key lookup
+        """
+        return self.wellness_service.get_state(user_id)
+    
+    def get_analytics_report(self, user_id: int) -> dict:
+        """
+        Build the long-range analytics report for a user.
+        
+        Streams the full history in fixed-size NumPy blocks and folds them
+        into daily, weekly and monthly means, day-of-week and hour-of-day
+        profiles, volatility and streaks, so memory stays bounded however
+        long the history is.
+        
+        Args:
+            user_id: User ID
             
-        except Exception as e:
-            print(f"Error getting mood statistics: {e}")
-            return {
-                'total_entries': 0,
-                'average_mood': 0,
-                'lowest_mood': 0,
-                'highest_mood': 0
-            }
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        Returns:
+            Dictionary of chart-ready label/value lists and summary figures
+        """
+        from business_layer.analytics.report import build_streaming_mood_report
+        
+        def load():
+            return build_streaming_mood_report(
+                user_id, self.mood_dao.iter_history_chunks(user_id),
+                compacted_blocks=self.mood_dao.iter_compacted_chunks(user_id)
+            )
+        
+        try:
+            return self.mood_dao.get_or_load(user_id, 'analytics_report', load)
+        except sqlite3.Error as e:
+            # The empty report is not cached, so the next call tries again
+            print(f"Database error: {e}")
+            return build_streaming_mood_report(user_id, [])
     
     def get_mood_recommendations(self, user_id: int) -> List[str]:
         """
@@ -137,42 +242,9 @@ class MoodService:
         Returns:
             List of recommendation strings
         """
-        recommendations = []
-        
-        # Get recent mood
-        today_mood = self.get_today_mood(user_id)
-        recent_moods = self.get_user_mood_history(user_id, 7)  # Last 7 entries
-        
-        if today_mood:
-            if today_mood.mood_level <= 3:
-                recommendations.extend([
-                    "Consider reaching out to a trusted friend or family member",
-                    "Try some deep breathing exercises or meditation",
-                    "Take a short walk outside if possible",
-                    "Consider speaking with a mental health professional"
-                ])
-            elif today_mood.mood_level <= 5:
-                recommendations.extend([
-                    "Try journaling about your feelings",
-                    "Listen to some uplifting music",
-                    "Practice gratitude by listing three things you're thankful for",
-                    "Consider doing some light exercise"
-                ])
-            elif today_mood.mood_level >= 8:
-                recommendations.extend([
-                    "Great mood! Consider sharing your positivity with others",
-                    "This is a good time to tackle challenging tasks",
-                    "Reflect on what's contributing to your good mood",
-                    "Consider planning something fun for the future"
-                ])
-        
-        # Add general recommendations if no specific ones
-        if not recommendations:
-            recommendations.extend([
-                "Remember to practice self-care",
-                "Stay connected with loved ones",
-                "Maintain a regular sleep schedule",
-                "Consider keeping a daily mood journal"
-            ])
-        
-        return recommendations[:3]  # Return top 3 recommendations
\ No newline at end of file
+        return self.get_dashboard_snapshot(user_id).recommendations
+    
+    def _build_recommendations(self, today_mood: Optional[Mood]) -> List[str]:
+        """Pick the top 3 recommendations for today's mood from the strategy catalog."""
+        mood_level = today_mood.mood_level if today_mood else None
+        return self.strategy_catalog.get_recommendations(mood_level, 3)
\ No newline at end of file
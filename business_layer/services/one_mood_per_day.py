@@ -0,0 +1,106 @@
+# business_layer/services/one_mood_per_day.py
+"""
+Explicit migration to one-mood-per-day mode (MINDFULBALANCE_ONE_MOOD_PER_DAY).
+
+The mode needs a unique (user_id, log_date) index, which cannot be created
+while users have several entries on the same local day. Opening the database
+never deletes them; instead the mode stays off until an operator runs:
+
+    python -m business_layer.services.one_mood_per_day check
+    python -m business_layer.services.one_mood_per_day migrate [--backup-dir DIR]
+
+migrate first takes a verified backup, then keeps the latest entry of each
+user's day, creates the unique index and rebuilds the wellness state of the
+affected users, all in one transaction. The deletes go through the sync
+change log, so the merged days also converge on the user's other devices.
+Restart running app processes afterwards.
+"""
+import argparse
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+from business_layer.services.wellness_service import WellnessService
+from data_layer.database.backup import BackupManager
+from data_layer.database.connection import DatabaseConnection
+
+@dataclass
+class MigrationResult:
+    """Outcome of a one-mood-per-day migration."""
+
+    backup_path: Optional[str] = None
+    removed_entries: int = 0
+    users: int = 0
+    success: bool = False
+
+class OneMoodPerDayMigration:
+    """Merges repeated daily mood entries so the unique index can be created."""
+
+    def __init__(self, backup_manager: Optional[BackupManager] = None):
+        self.db = DatabaseConnection()
+        self.backup_manager = backup_manager or BackupManager()
+        self.wellness_service = WellnessService()
+
+    def repeated_days(self) -> int:
+        """Number of (user, local day) pairs with more than one mood entry."""
+        with self.db.read_connection() as conn:
+            return self.db.count_repeated_mood_days(conn.cursor())
+
+    def migrate(self) -> MigrationResult:
+        """
+        Back up the database, then merge repeated days in one transaction.
+
+        Nothing is deleted unless the backup was written and verified.
+
+        Returns:
+            MigrationResult with the backup path and what was changed
+        """
+        result = MigrationResult()
+        result.backup_path = self.backup_manager.create_backup()
+        if result.backup_path is None:
+            print("Backup failed; no entries were changed")
+            return result
+
+        try:
+            with self.db.write_transaction() as conn:
+                user_ids = [row[0] for row in conn.execute(
+                    "SELECT DISTINCT user_id FROM mood_logs GROUP BY user_id, log_date HAVING COUNT(*) > 1"
+                )]
+                cursor = conn.execute(
+                    """DELETE FROM mood_logs
+                       WHERE mood_id NOT IN (
+                           SELECT MAX(mood_id) FROM mood_logs GROUP BY user_id, log_date
+                       )"""
+                )
+                result.removed_entries = cursor.rowcount
+                self.db.create_unique_mood_day_index(conn.cursor())
+                for user_id in user_ids:
+                    self.wellness_service.rebuild_in_transaction(conn, user_id)
+                result.users = len(user_ids)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return result
+
+        self.db.refresh_one_mood_per_day()
+        result.success = True
+        return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate the database to one mood entry per user and day.")
+    parser.add_argument("--backup-dir", default=None, help="backup directory (default: data/backups)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("check", help="count user days with several entries")
+    commands.add_parser("migrate", help="back up, then keep the latest entry of each day")
+    args = parser.parse_args(argv)
+
+    migration = OneMoodPerDayMigration(BackupManager(args.backup_dir))
+    if args.command == "check":
+        print(f"{migration.repeated_days()} user day(s) have several mood entries")
+    elif args.command == "migrate":
+        result = migration.migrate()
+        if result.success:
+            print(f"Backup written to {result.backup_path}")
+            print(f"Removed {result.removed_entries} repeated entries for {result.users} user(s); "
+                  "restart running app processes to enable one-mood-per-day mode")
+
+if __name__ == "__main__":
+    main()
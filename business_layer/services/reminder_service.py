@@ -0,0 +1,229 @@
+# business_layer/services/reminder_service.py
+"""
+Daily check-in reminders for users who have not logged a mood yet today.
+
+The scheduler plans with one anti-join over every user's preference (see
+ReminderDAO.get_pending_reminders), keeps the result as a heap ordered by
+due time and sleeps until the earliest one. Due reminders are claimed in
+batches, which re-checks that the user still has no entry, and handed to a
+pluggable sink. Planning is repeated every `replan_interval` seconds to pick
+up changed preferences, new entries and the next local day.
+
+Set a preference and run the scheduler from the project root:
+
+    python -m business_layer.services.reminder_service set --username alice --at 20:00
+    python -m business_layer.services.reminder_service run [--replan 60] [--once]
+"""
+import argparse
+import heapq
+from abc import ABC, abstractmethod
+import re
+import threading
+import time
+from datetime import datetime
+from itertools import groupby
+from typing import Callable, List, Optional, Tuple
+from business_layer.models.reminder import Reminder
+from data_layer.dao.reminder_dao import ReminderDAO
+from data_layer.dao.user_dao import UserDAO
+
+TIME_PATTERN = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")
+# UTC-12:00 to UTC+14:00
+MIN_UTC_OFFSET = -12 * 60
+MAX_UTC_OFFSET = 14 * 60
+
+def local_utc_offset() -> int:
+    """Minutes east of UTC of this machine's current time zone."""
+    return int(datetime.now().astimezone().utcoffset().total_seconds() // 60)
+
+class ReminderSink(ABC):
+    """
+    Delivers reminders, e.g. as push notifications, emails or in-app banners.
+
+    Subclasses implement send(). Raising from it marks the whole batch as
+    undelivered, so the scheduler releases the claims and retries later.
+    """
+
+    @abstractmethod
+    def send(self, reminders: List[Reminder]):
+        """Deliver a batch of claimed reminders."""
+
+class ConsoleSink(ReminderSink):
+    """Prints each reminder."""
+
+    def send(self, reminders: List[Reminder]):
+        for reminder in reminders:
+            print(f"[{reminder.local_date}] {reminder.username}: {reminder.message}")
+
+class CallbackSink(ReminderSink):
+    """Calls a function with each reminder."""
+
+    def __init__(self, callback: Callable[[Reminder], None]):
+        self.callback = callback
+
+    def send(self, reminders: List[Reminder]):
+        for reminder in reminders:
+            self.callback(reminder)
+
+class ReminderScheduler:
+    """Fires reminders at each user's preferred local time from a heap of due times."""
+
+    def __init__(self, sink: ReminderSink, reminder_dao: Optional[ReminderDAO] = None,
+                 replan_interval: float = 60.0, batch_size: int = 1000,
+                 clock: Callable[[], float] = time.time):
+        self.sink = sink
+        self.reminder_dao = reminder_dao or ReminderDAO()
+        self.replan_interval = replan_interval
+        self.batch_size = batch_size
+        self.clock = clock
+        self._heap: List[Tuple[int, int, str, str]] = []
+        self._planned_at: Optional[float] = None
+        self.sent = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def plan(self, now: Optional[float] = None) -> int:
+        """
+        Replace the schedule with every reminder still pending.
+
+        Returns:
+            Number of scheduled reminders
+        """
+        now = self.clock() if now is None else now
+        # Rows are already (due_at, ...) tuples, so heapify is linear in the user count
+        pending = self.reminder_dao.get_pending_reminders(now)
+        heapq.heapify(pending)
+        self._heap = pending
+        self._planned_at = now
+        return len(pending)
+
+    def next_due(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """
+        Send every reminder due at `now`.
+
+        Returns:
+            Number of reminders delivered to the sink
+        """
+        now = self.clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        due.sort(key=lambda row: row[3])
+
+        sent = 0
+        for local_date, rows in groupby(due, key=lambda row: row[3]):
+            rows = list(rows)
+            for start in range(0, len(rows), self.batch_size):
+                sent += self._dispatch(local_date, rows[start:start + self.batch_size])
+        self.sent += sent
+        return sent
+
+    def _dispatch(self, local_date: str, rows: List[Tuple[int, int, str, str]]) -> int:
+        claimed = set(self.reminder_dao.claim_reminders([row[1] for row in rows], local_date))
+        reminders = [Reminder(user_id, username, day, due_at)
+                     for due_at, user_id, username, day in rows if user_id in claimed]
+        if not reminders:
+            return 0
+        try:
+            self.sink.send(reminders)
+        except Exception as e:
+            # Unclaim so the next plan retries them
+            print(f"Reminder delivery error: {e}")
+            self.reminder_dao.release_reminders([r.user_id for r in reminders], local_date)
+            return 0
+        return len(reminders)
+
+    def run(self, stop: Optional[threading.Event] = None):
+        """Plan and send reminders until `stop` is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            now = self.clock()
+            if self._planned_at is None or now - self._planned_at >= self.replan_interval:
+                self.plan(now)
+            self.run_pending(now)
+
+            wake = self._planned_at + self.replan_interval
+            next_due = self.next_due()
+            if next_due is not None:
+                wake = min(wake, next_due)
+            stop.wait(max(0.0, wake - self.clock()))
+
+class ReminderService:
+    """Business logic for daily check-in reminder preferences."""
+
+    def __init__(self):
+        self.reminder_dao = ReminderDAO()
+
+    def set_reminder(self, user_id: int, remind_at: str, utc_offset: Optional[int] = None,
+                     enabled: bool = True) -> Tuple[bool, str]:
+        """
+        Set when a user is reminded to log their mood.
+
+        Args:
+            user_id: User ID
+            remind_at: Local time of day as 'HH:MM'
+            utc_offset: Minutes east of UTC; defaults to this machine's time zone
+            enabled: Whether reminders are sent
+        """
+        remind_at = (remind_at or "").strip()
+        if not TIME_PATTERN.match(remind_at):
+            return False, "Reminder time must be HH:MM (24-hour)"
+        if utc_offset is None:
+            utc_offset = local_utc_offset()
+        if not MIN_UTC_OFFSET <= utc_offset <= MAX_UTC_OFFSET:
+            return False, "Time zone offset is out of range"
+        if not self.reminder_dao.set_preference(user_id, remind_at, utc_offset, enabled):
+            return False, "Failed to save reminder"
+        return True, f"Reminder set for {remind_at}" if enabled else "Reminders turned off"
+
+    def get_reminder(self, user_id: int) -> Optional[dict]:
+        """Get a user's reminder preference, or None if none is set."""
+        return self.reminder_dao.get_preference(user_id)
+
+    def create_scheduler(self, sink: ReminderSink, replan_interval: float = 60.0) -> ReminderScheduler:
+        return ReminderScheduler(sink, self.reminder_dao, replan_interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily check-in reminders.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    set_parser = commands.add_parser("set", help="set a user's reminder time")
+    set_parser.add_argument("--username", required=True)
+    set_parser.add_argument("--at", required=True, help="local time, HH:MM")
+    set_parser.add_argument("--offset", type=int, help="minutes east of UTC (default: this machine)")
+    set_parser.add_argument("--disable", action="store_true")
+
+    run_parser = commands.add_parser("run", help="send reminders to the console")
+    run_parser.add_argument("--replan", type=float, default=60.0, help="seconds between plans")
+    run_parser.add_argument("--once", action="store_true", help="send what is due now and exit")
+    args = parser.parse_args(argv)
+
+    service = ReminderService()
+    if args.command == "set":
+        user = UserDAO().get_user_by_username(args.username)
+        if user is None:
+            print(f"Unknown user: {args.username}")
+            return
+        _, message = service.set_reminder(user['user_id'], args.at, args.offset, not args.disable)
+        print(message)
+        return
+
+    scheduler = service.create_scheduler(ConsoleSink(), args.replan)
+    started = time.perf_counter()
+    pending = scheduler.plan()
+    print(f"Planned {pending} reminder(s) in {(time.perf_counter() - started) * 1000:.0f} ms")
+    if args.once:
+        scheduler.run_pending()
+    else:
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
+    print(f"Sent {scheduler.sent} reminder(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# business_layer/services/session_service.py
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from business_layer.models.user import User
+from data_layer import settings
+from data_layer.dao.session_dao import SessionDAO
+
+def hash_token(token: str) -> str:
+    """
+    SHA-256 of a session token, the only form that is stored.
+
+    Tokens are 256 random bits, so a fast hash is enough: unlike a password
+    there is nothing to brute-force, and a leaked table cannot be replayed.
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+class SessionService:
+    """
+    Remembered logins that let a returning user skip the password check.
+
+    A session is a random token kept by the client; restoring it is one
+    primary key lookup (or a hit in a small in-process cache) instead of a
+    bcrypt verification. Sessions expire `ttl` seconds after last use: using
+    one moves the expiry forward, written at most once per `renew_interval`.
+    Cached entries are rechecked against the database after `cache_ttl`
+    seconds, which bounds how long a revocation made by another process
+    takes to apply here. Creating a session also deletes expired ones, at
+    most once per `purge_interval`, so abandoned sessions do not pile up.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, renew_interval: Optional[float] = None,
+                 cache_size: int = 1024, cache_ttl: float = 60.0, purge_interval: Optional[float] = None):
+        self.session_dao = SessionDAO()
+        self.ttl = int(ttl if ttl is not None else settings.SESSION_TTL)
+        self.renew_interval = renew_interval if renew_interval is not None else settings.SESSION_RENEW_INTERVAL
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.purge_interval = purge_interval if purge_interval is not None else settings.SESSION_PURGE_INTERVAL
+        self._next_purge = 0.0
+        # token hash -> (user, session expiry, cache entry expiry)
+        self._cache: "OrderedDict[str, Tuple[User, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create_session(self, user: User) -> Optional[str]:
+        """
+        Start a session for an authenticated user.
+
+        Returns:
+            The token to give to the client, or None if it could not be stored
+        """
+        token = secrets.token_urlsafe(32)
+        token_hash = hash_token(token)
+        expires_at = int(time.time()) + self.ttl
+        if not self.session_dao.create_session(token_hash, user.user_id, expires_at):
+            return None
+        self._remember(token_hash, user, expires_at)
+        self._purge_if_due()
+        return token
+
+    def restore_session(self, token: Optional[str]) -> Optional[User]:
+        """
+        Return the user of a valid session, renewing it, or None.
+
+        Args:
+            token: Token from create_session
+        """
+        if not token:
+            return None
+        token_hash = hash_token(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._cache.get(token_hash)
+            if entry is not None and entry[2] > now and entry[1] > now:
+                self._cache.move_to_end(token_hash)
+            else:
+                entry = None
+                self._cache.pop(token_hash, None)
+
+        if entry is None:
+            session = self.session_dao.get_session(token_hash)
+            if session is None:
+                return None
+            if session['expires_at'] <= now:
+                self.session_dao.delete_session(token_hash)
+                return None
+            user = User.from_dict(session)
+            expires_at = session['expires_at']
+            cached_until = None
+        else:
+            # A hit does not extend the recheck deadline, or a revocation
+            # elsewhere would never apply to a session in regular use
+            user, expires_at, cached_until = entry
+
+        # Sliding expiry, without a write on every launch
+        if expires_at - now < self.ttl - self.renew_interval:
+            expires_at = int(now) + self.ttl
+            if not self.session_dao.renew_session(token_hash, expires_at):
+                self._forget(token_hash)
+                return None
+        self._remember(token_hash, user, expires_at, cached_until)
+        return user
+
+    def revoke_session(self, token: Optional[str]) -> bool:
+        """End one session (e.g. on logout)."""
+        if not token:
+            return False
+        token_hash = hash_token(token)
+        self._forget(token_hash)
+        return self.session_dao.delete_session(token_hash)
+
+    def revoke_user_sessions(self, user_id: int) -> int:
+        """End every session of a user (e.g. after a password change)."""
+        with self._lock:
+            for token_hash in [key for key, entry in self._cache.items() if entry[0].user_id == user_id]:
+                del self._cache[token_hash]
+        return self.session_dao.delete_user_sessions(user_id)
+
+    def purge_expired(self) -> int:
+        """Delete expired sessions from the database."""
+        return self.session_dao.delete_expired(int(time.time()))
+
+    def _purge_if_due(self):
+        now = time.time()
+        with self._lock:
+            if now < self._next_purge:
+                return
+            self._next_purge = now + self.purge_interval
+        self.purge_expired()
+
+    def clear_cache(self):
+        """Forget every cached session; the next restore of each reads the database."""
+        with self._lock:
+            self._cache.clear()
+
+    def _remember(self, token_hash: str, user: User, expires_at: int, cached_until: Optional[float] = None):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[token_hash] = (user, expires_at, cached_until or time.time() + self.cache_ttl)
+            self._cache.move_to_end(token_hash)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, token_hash: str):
+        with self._lock:
+            self._cache.pop(token_hash, None)
@@ -0,0 +1,104 @@
+# business_layer/services/strategy_service.py
+import threading
+from typing import Optional, Dict, List, Tuple
+from data_layer.dao.strategy_dao import CopingStrategyDAO
+
+MOOD_LEVELS = range(1, 11)
+
+class StrategyCatalog:
+    """
+    In-memory index over the coping_strategies table.
+
+    The table is read once and indexed by (category, mood level), so tips and
+    recommendations are dictionary lookups instead of queries. Writes go
+    through the catalog and rebuild the index.
+    """
+
+    def __init__(self, strategy_dao: Optional[CopingStrategyDAO] = None):
+        self.strategy_dao = strategy_dao or CopingStrategyDAO()
+        self._index: Optional[Dict[Tuple[str, Optional[int]], List[dict]]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Seed the table if empty and rebuild the index from one query."""
+        with self._lock:
+            self.strategy_dao.seed_strategies()
+            self._index = self._build_index(self.strategy_dao.get_all_strategies())
+
+    def invalidate(self):
+        """Drop the index; the next lookup reads the table again."""
+        with self._lock:
+            self._index = None
+
+    def _build_index(self, strategies: List[dict]) -> Dict[Tuple[str, Optional[int]], List[dict]]:
+        """Map (category, level) to its band's strategies; level None holds general ones."""
+        index: Dict[Tuple[str, Optional[int]], List[dict]] = {}
+        for strategy in strategies:
+            category = strategy['category'] or 'general'
+            low, high = strategy['min_level'], strategy['max_level']
+            if low is None and high is None:
+                index.setdefault((category, None), []).append(strategy)
+                continue
+            for level in MOOD_LEVELS:
+                if (low is None or level >= low) and (high is None or level <= high):
+                    index.setdefault((category, level), []).append(strategy)
+        return index
+
+    def _lookup(self, category: str, mood_level: Optional[int]) -> List[dict]:
+        index = self._index
+        if index is None:
+            self.refresh()
+            index = self._index
+        return index.get((category, mood_level)) or index.get((category, None), [])
+
+    def get_strategies(self, category: str, mood_level: Optional[int] = None) -> List[dict]:
+        """
+        Get the strategies of a category for a mood level.
+
+        Args:
+            category: Strategy category ('tip', 'recommendation', ...)
+            mood_level: Mood level (1-10), or None for general strategies
+
+        Returns:
+            List of strategy dictionaries, falling back to general ones
+        """
+        return list(self._lookup(category, mood_level))
+
+    def get_tip(self, mood_level: Optional[int]) -> str:
+        """Return a mental health tip for a mood level."""
+        tips = self._lookup('tip', mood_level)
+        if tips:
+            return tips[0]['description']
+        return "Keep going! A little self-care goes a long way."
+
+    def get_recommendations(self, mood_level: Optional[int], limit: int = 3) -> List[str]:
+        """Return up to `limit` recommendation texts for a mood level."""
+        return [strategy['description'] for strategy in self._lookup('recommendation', mood_level)[:limit]]
+
+    def add_strategy(self, title: str, description: str, category: str,
+                     min_level: Optional[int] = None, max_level: Optional[int] = None) -> Optional[int]:
+        """Add a strategy and refresh the index."""
+        strategy_id = self.strategy_dao.create_strategy(title, description, category, min_level, max_level)
+        if strategy_id is not None:
+            self.refresh()
+        return strategy_id
+
+    def remove_strategy(self, strategy_id: int) -> bool:
+        """Remove a strategy and refresh the index."""
+        removed = self.strategy_dao.delete_strategy(strategy_id)
+        if removed:
+            self.refresh()
+        return removed
+
+
+_catalog: Optional[StrategyCatalog] = None
+_catalog_lock = threading.Lock()
+
+def get_strategy_catalog() -> StrategyCatalog:
+    """Return the process-wide strategy catalog, creating it on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = StrategyCatalog()
+    return _catalog
@@ -0,0 +1,60 @@
+# business_layer/services/sync_service.py
+"""
+Synchronize a user's mood and journal history with a sync server.
+
+Start the stand-in server and sync a user from the project root:
+
+    python -m data_layer.sync.server --port 8765 --account alice
+    python -m business_layer.services.sync_service --username alice --url http://127.0.0.1:8765 --token TOKEN
+"""
+import argparse
+from typing import Optional, Tuple
+from business_layer.services.wellness_service import WellnessService
+from data_layer.dao.user_dao import UserDAO
+from data_layer.sync.engine import HttpSyncTransport, SyncEngine
+
+class SyncService:
+    """Runs delta sync for a user and refreshes derived state afterwards."""
+
+    def __init__(self, transport, wellness_service: Optional[WellnessService] = None,
+                 batch_size: int = 500):
+        self.wellness_service = wellness_service or WellnessService()
+        # Remote mood rows bypass MoodService, so the running state is
+        # recomputed in the same transaction that applies them
+        self.engine = SyncEngine(transport, batch_size, self.wellness_service.rebuild_in_transaction)
+        self.user_dao = UserDAO()
+
+    def sync_user(self, user_id: int) -> Tuple[bool, str, Optional[dict]]:
+        """
+        Push the user's local changes and pull remote ones.
+
+        The username is the account on the server, since local user ids
+        differ between devices.
+        """
+        user = self.user_dao.get_user_by_id(user_id)
+        if user is None:
+            return False, "User not found", None
+        try:
+            result = self.engine.sync(user_id, user['username'])
+        except Exception as e:
+            print(f"Sync error: {e}")
+            return False, str(e), None
+        return True, f"Sent {result['pushed']} and applied {result['applied']} change(s)", result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync a user's history with a sync server.")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--url", required=True, help="sync server base URL")
+    parser.add_argument("--token", default=None, help="account token (default: MINDFULBALANCE_SYNC_TOKEN)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    user = UserDAO().get_user_by_username(args.username)
+    if user is None:
+        print(f"Unknown user: {args.username}")
+        return
+    success, message, _ = SyncService(HttpSyncTransport(args.url, args.token), batch_size=args.batch_size).sync_user(user['user_id'])
+    print(message if success else f"Sync failed: {message}")
+
+if __name__ == "__main__":
+    main()
@@ -5,28 +5,55 @@ import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.insert(0, project_root)
 
-from business_layer.models.user import User
+import argparse
+import csv
+import time
+from dataclasses import dataclass
+from business_layer.models.user import EMAIL_PATTERN, USERNAME_PATTERN, User, normalize_email
+from business_layer.passwords import (hash_password, hash_passwords, is_plaintext, needs_rehash,
+                                      verify_password, verify_plaintext)
+from data_layer.dao.user_dao import UserDAO
 from data_layer.database.connection import DatabaseConnection
-from typing import Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
+
+MIN_PASSWORD_LENGTH = 6
+
+def validate_registration(username: str, email: str, password: str) -> Optional[str]:
+    """Return the reason a registration is invalid, or None if it is valid."""
+    if not username or not email or not password:
+        return "All fields are required"
+    if not USERNAME_PATTERN.match(username):
+        return "Username must be 3-20 letters, digits or underscores"
+    if len(password) < MIN_PASSWORD_LENGTH:
+        return f"Password must be at least {MIN_PASSWORD_LENGTH} characters"
+    if not EMAIL_PATTERN.match(email):
+        return "Invalid email address"
+    return None
+
+@dataclass
+class ProvisionResult:
+    """Outcome of one row of a bulk provisioning run."""
+
+    row: int  # 1-based position in the input
+    username: str
+    email: str
+    status: str  # 'created', 'duplicate' or 'invalid'
+    message: str = ""
+    user_id: Optional[int] = None
 
 class UserService:
     def __init__(self):
         self.db = DatabaseConnection()
+        self.user_dao = UserDAO()
 
     def register_user(self, username: str, email: str, password: str) -> Tuple[bool, str, Optional['User']]:
         """Register a new user."""
+        conn = None
         try:
-            if not username or not email or not password:
-                return False, "All fields are required", None
-
-            if len(username) < 3:
-                return False, "Username must be at least 3 characters", None
-
-            if len(password) < 6:
-                return False, "Password must be at least 6 characters", None
-
-            if "@" not in email or "." not in email:
-                return False, "Invalid email address", None
+            username, email = (username or "").strip(), normalize_email(email)
+            error = validate_registration(username, email, password)
+            if error:
+                return False, error, None
 
             conn = self.db.get_connection()
             cursor = conn.cursor()
@@ -36,8 +63,8 @@ class UserService:
             if cursor.fetchone():
                 return False, "Username or email already exists", None
 
-            # Store password directly (temporarily, until we implement proper hashing)
-            cursor.execute("INSERT INTO users (username, email, password) VALUES (?, ?, ?)", (username, email, password))
+            cursor.execute("INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
+                           (username, email, hash_password(password)))
             conn.commit()
 
             # Retrieve the user_id of the newly inserted user
@@ -54,6 +81,7 @@ class UserService:
 
     def authenticate_user(self, username_or_email: str, password: str) -> Tuple[bool, str, Optional['User']]:
         """Authenticate user login."""
+        conn = None
         try:
             print(f"Attempting to authenticate: {username_or_email}")  # Debug log
 
@@ -68,13 +96,22 @@ class UserService:
                 SELECT user_id, username, email, password
                 FROM users
                 WHERE username = ? OR email = ?
-            """, (username_or_email, username_or_email))
+            """, (username_or_email.strip(), normalize_email(username_or_email)))
             row = cursor.fetchone()
 
             if row:
                 user_id, username, email, stored_password = row
-                # If you implement password hashing, use self._verify_password
-                if password == stored_password:
+                if not stored_password:
+                    return False, "This account needs a password reset", None
+                if is_plaintext(stored_password):
+                    # Accounts from before hashing: checked once, then hashed below
+                    verified = verify_plaintext(password, stored_password)
+                else:
+                    verified = verify_password(password, stored_password)
+                if verified:
+                    # Upgrade plaintext passwords, legacy salted hashes and old work factors
+                    if needs_rehash(stored_password):
+                        self.user_dao.update_password(user_id, hash_password(password))
                     user = User(user_id=user_id, username=username, email=email)
                     return True, "Authentication successful", user
                 else:
@@ -85,4 +122,121 @@ class UserService:
             return False, f"An error occurred during authentication: {str(e)}", None
         finally:
             if conn:
-                conn.close()
\ No newline at end of file
+                conn.close()
+
+    def upgrade_plaintext_passwords(self, processes: Optional[int] = None) -> int:
+        """
+        Replace every password still stored in plaintext with its bcrypt hash.
+
+        authenticate_user also hashes these one at a time on their next
+        login; this converts the accounts that have not signed in since.
+
+        Args:
+            processes: Hashing worker processes (default: one per core)
+
+        Returns:
+            Number of passwords hashed
+        """
+        plaintext = [(user['user_id'], user['password']) for user in self.user_dao.get_stored_passwords()
+                     if is_plaintext(user['password'])]
+        hashes = hash_passwords([password for _, password in plaintext], processes)
+        return sum(self.user_dao.update_password(user_id, hashed)
+                   for (user_id, _), hashed in zip(plaintext, hashes))
+
+    def provision_users(self, rows: Iterable[Dict[str, str]], processes: Optional[int] = None,
+                        chunk_size: int = 500) -> List[ProvisionResult]:
+        """
+        Register many users at once, e.g. when onboarding an organisation.
+
+        Rows are validated first, then checked for duplicates within the
+        batch and against existing users in one query, so only new users pay
+        for hashing. Passwords are hashed in a process pool and the users
+        inserted in one transaction per chunk.
+
+        Args:
+            rows: Dictionaries with 'username', 'email' and 'password'
+            processes: Hashing worker processes (default: one per core)
+            chunk_size: Users inserted per transaction
+
+        Returns:
+            One result per input row, in input order
+        """
+        results: List[ProvisionResult] = []
+        pending: List[Tuple[ProvisionResult, str]] = []
+        seen_usernames, seen_emails = set(), set()
+        for number, row in enumerate(rows, start=1):
+            username = (row.get('username') or "").strip()
+            email = normalize_email(row.get('email'))
+            password = row.get('password') or ""
+            result = ProvisionResult(number, username, email, 'invalid')
+            results.append(result)
+
+            error = validate_registration(username, email, password)
+            if error:
+                result.message = error
+            elif username in seen_usernames:
+                result.status, result.message = 'duplicate', "Username repeated in input"
+            elif email in seen_emails:
+                result.status, result.message = 'duplicate', "Email repeated in input"
+            else:
+                seen_usernames.add(username)
+                seen_emails.add(email)
+                pending.append((result, password))
+
+        taken_usernames, taken_emails = self.user_dao.find_existing(
+            [result.username for result, _ in pending], [result.email for result, _ in pending]
+        )
+        new = []
+        for result, password in pending:
+            if result.username in taken_usernames:
+                result.status, result.message = 'duplicate', "Username already exists"
+            elif result.email in taken_emails:
+                result.status, result.message = 'duplicate', "Email already exists"
+            else:
+                new.append((result, password))
+
+        hashes = hash_passwords([password for _, password in new], processes)
+        user_ids = self.user_dao.create_users(
+            [(result.username, result.email, hashed) for (result, _), hashed in zip(new, hashes)],
+            chunk_size
+        )
+        for (result, _), user_id in zip(new, user_ids):
+            if user_id is None:
+                # Taken by a concurrent registration, or the chunk failed
+                result.status, result.message = 'duplicate', "Username or email already exists"
+            else:
+                result.status, result.message, result.user_id = 'created', "User created", user_id
+        return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Provision users in bulk from a CSV file.")
+    parser.add_argument("csv_file", help="CSV with username, email and password columns")
+    parser.add_argument("--processes", type=int, help="hashing processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="users inserted per transaction")
+    parser.add_argument("--report", help="write a per-row CSV report to this file")
+    args = parser.parse_args(argv)
+
+    with open(args.csv_file, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    started = time.perf_counter()
+    results = UserService().provision_users(rows, args.processes, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        if result.status != 'created':
+            print(f"Row {result.row} ({result.username or '-'}): {result.status}, {result.message}")
+    counts = {status: sum(1 for r in results if r.status == status)
+              for status in ('created', 'duplicate', 'invalid')}
+    print(f"{counts['created']} created, {counts['duplicate']} duplicate, "
+          f"{counts['invalid']} invalid in {elapsed:.1f}s")
+
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["row", "username", "email", "status", "message", "user_id"])
+            for r in results:
+                writer.writerow([r.row, r.username, r.email, r.status, r.message, r.user_id or ""])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# business_layer/services/wellness_service.py
+"""
+Incrementally maintained wellness score, running statistics, streaks and
+anomaly flag per user.
+
+MoodService updates the state on every write. To backfill or repair it from
+the full history, run from the project root:
+
+    python -m business_layer.services.wellness_service --rebuild [--user-id ID]
+"""
+import argparse
+import sqlite3
+from datetime import date
+from typing import Optional
+from business_layer.models.wellness import WellnessState
+from data_layer.dao.wellness_dao import WellnessDAO
+from data_layer.database.connection import DatabaseConnection
+
+class WellnessService:
+    """Business logic for the per-user wellness state."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+        self.wellness_dao = WellnessDAO()
+
+    def get_state(self, user_id: int) -> WellnessState:
+        """
+        Get the current wellness state for a user with a primary-key lookup.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            WellnessState (empty if the user has no entries yet)
+        """
+        row = self.wellness_dao.get_state(user_id)
+        return WellnessState.from_row(row) if row else WellnessState(user_id=user_id)
+
+    def apply_write(self, conn: sqlite3.Connection, user_id: int, mood_id: int, mood_level: int,
+                    previous_level: Optional[int], log_date: str) -> WellnessState:
+        """
+        Fold a mood write into the user's state inside the writer's transaction.
+
+        Called from MoodDAO's on_write hook, so the entry and the state commit
+        together, and the BEGIN IMMEDIATE write lock serializes concurrent
+        updates from any process.
+
+        Args:
+            conn: Connection of the mood write transaction
+            user_id: User ID
+            mood_id: Written mood ID
+            mood_level: New mood level
+            previous_level: Level before an edit, or None for a new entry
+            log_date: Local day of the entry ('YYYY-MM-DD'), as stored in log_date
+        """
+        row = self.wellness_dao.get_state(user_id, conn)
+        state = WellnessState.from_row(row) if row else WellnessState(user_id=user_id)
+        if previous_level is None:
+            state.apply_entry(mood_id, mood_level, date.fromisoformat(log_date))
+        else:
+            state.replace_entry(mood_id, previous_level, mood_level)
+        self.wellness_dao.save_state(state.to_row(), conn)
+        return state
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """
+        Recompute wellness state from the mood history.
+
+        Entries compacted by the retention policy are replayed from their
+        per-day level counts: counts, mean, variance and streaks stay exact,
+        while the smoothed score and, for a fully compacted history, the
+        latest-entry fields see a compacted day's entries in level order.
+
+        Args:
+            user_id: Rebuild one user, or everyone when None
+
+        Returns:
+            Number of user states written
+        """
+        # One write transaction: readers see the old state or the new one,
+        # and no mood write can land between the history read and the save
+        try:
+            with self.db.write_transaction() as conn:
+                return self.rebuild_in_transaction(conn, user_id)
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return 0
+
+    def rebuild_in_transaction(self, conn: sqlite3.Connection, user_id: Optional[int] = None) -> int:
+        """
+        Recompute wellness state inside the caller's write transaction, e.g.
+        together with a migration that changed the mood history.
+
+        Args:
+            conn: Connection of the write transaction (errors propagate)
+            user_id: Rebuild one user, or everyone when None
+
+        Returns:
+            Number of user states written
+        """
+        states = []
+        state = None
+        for row in self.wellness_dao.iter_history(user_id, conn):
+            if state is None or state.user_id != row['user_id']:
+                if state is not None:
+                    states.append(state.to_row())
+                state = WellnessState(user_id=row['user_id'])
+            log_date = date.fromisoformat(row['log_date'])
+            # Compacted entries arrive as one row per day and level
+            for _ in range(row['entries']):
+                state.apply_entry(row['mood_id'], row['mood_level'], log_date)
+        if state is not None:
+            states.append(state.to_row())
+
+        self.wellness_dao.delete_state(user_id, conn)
+        if states:
+            self.wellness_dao.save_states(states, conn)
+        return len(states)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain per-user wellness state.")
+    parser.add_argument("--rebuild", action="store_true", help="recompute state from mood history")
+    parser.add_argument("--user-id", type=int, default=None, help="limit to one user")
+    args = parser.parse_args(argv)
+
+    if not args.rebuild:
+        parser.print_help()
+        return
+    count = WellnessService().rebuild(args.user_id)
+    print(f"Rebuilt wellness state for {count} user(s)")
+
+if __name__ == "__main__":
+    main()
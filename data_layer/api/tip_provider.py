@@ -0,0 +1,281 @@
+# data_layer/api/tip_provider.py
+"""
+Mental health tips from a remote HTTP endpoint, cached per mood band.
+
+The endpoint is called as GET <url>?band=<band> and must answer with JSON,
+either {"tips": ["...", ...]} or {"tip": "..."}. Responses are kept in
+memory and in a JSON file for TIP_CACHE_TTL seconds. get_tip() never waits
+for the network: it answers from the cache (fresh or stale) or from the
+injected fallback (the service container passes the strategy catalog) and
+refreshes the band in the background. After repeated failures a circuit
+breaker stops calling the endpoint for a while.
+
+To try it against a local stub, serve a JSON file and point the provider at
+it, e.g. from the project root:
+
+    python -m data_layer.api.tip_provider --url http://127.0.0.1:8000/tips.json --level 3
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from data_layer import settings
+
+# Mood bands share the level ranges of the bundled tips
+MOOD_BANDS = [("very_low", 1, 2), ("low", 3, 4), ("neutral", 5, 6), ("good", 7, 8), ("great", 9, 10)]
+
+def band_for(mood_level: Optional[int]) -> str:
+    """Return the mood band name for a level (None counts as neutral)."""
+    if mood_level is not None:
+        for name, low, high in MOOD_BANDS:
+            if low <= mood_level <= high:
+                return name
+    return "neutral"
+
+DEFAULT_TIP = "Keep going! A little self-care goes a long way."
+
+def default_tip(mood_level: Optional[int]) -> str:
+    """Fallback used until a richer one is injected."""
+    return DEFAULT_TIP
+
+def parse_tips(payload) -> List[str]:
+    """
+    Validate a response body and return its non-blank tips.
+
+    Raises:
+        ValueError: If the body is not {"tips": [str, ...]} or {"tip": str},
+            or holds no tips
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("response is not a JSON object")
+    tips = payload.get("tips") or ([payload["tip"]] if payload.get("tip") else [])
+    # A bare string would otherwise be split into characters
+    if not isinstance(tips, list) or not all(isinstance(tip, str) for tip in tips):
+        raise ValueError("tips must be a list of strings")
+    tips = [tip.strip() for tip in tips if tip.strip()]
+    if not tips:
+        raise ValueError("response contains no tips")
+    return tips
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency for a cool-down period.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    allow() returns False until `reset_timeout` seconds have passed; then a
+    single trial call is let through (half-open). Success closes it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class TipProvider:
+    """Non-blocking, cached access to remote tips with a bundled fallback."""
+
+    def __init__(self, url: Optional[str] = None, ttl: Optional[float] = None,
+                 timeout: Optional[float] = None, cache_path: Optional[str] = None,
+                 fallback: Callable[[Optional[int]], str] = default_tip,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.url = url if url is not None else settings.TIP_API_URL
+        self.ttl = ttl if ttl is not None else settings.TIP_CACHE_TTL
+        timeout = timeout if timeout is not None else settings.TIP_API_TIMEOUT
+        self.timeout = (min(timeout, 2.0), timeout)  # (connect, read)
+        self.cache_path = cache_path if cache_path is not None else settings.TIP_CACHE_PATH
+        self.fallback = fallback
+        self.breaker = breaker or CircuitBreaker()
+
+        # Pooled keep-alive connections; the breaker, not urllib3, handles retries
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+        self.session.headers["Accept"] = "application/json"
+
+        self._cache: Dict[str, Tuple[float, List[str]]] = self._load_cache()
+        self._rotation: Dict[str, int] = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tip-refresh")
+
+    def _load_cache(self) -> Dict[str, Tuple[float, List[str]]]:
+        """Read the on-disk cache ({band: {"fetched_at": epoch, "tips": [...]}})."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            return {band: (float(entry["fetched_at"]), list(entry["tips"]))
+                    for band, entry in raw.items() if entry.get("tips")}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    def _save_cache(self):
+        """Write the cache atomically so readers never see a partial file."""
+        with self._lock:
+            raw = {band: {"fetched_at": fetched_at, "tips": tips}
+                   for band, (fetched_at, tips) in self._cache.items()}
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            partial_path = f"{self.cache_path}.{os.getpid()}.partial"
+            with open(partial_path, "w", encoding="utf-8") as f:
+                json.dump(raw, f)
+            os.replace(partial_path, self.cache_path)
+        except OSError as e:
+            print(f"Tip cache error: {e}")
+
+    def _is_fresh(self, band: str) -> bool:
+        entry = self._cache.get(band)
+        return entry is not None and time.time() - entry[0] < self.ttl
+
+    def fetch(self, band: str) -> Optional[List[str]]:
+        """
+        Fetch a band's tips from the endpoint on the calling thread.
+
+        Returns:
+            List of tips, or None if the endpoint is unset, failing or the
+            circuit is open
+        """
+        if not self.url or not self.breaker.allow():
+            return None
+        # Every exit records an outcome, or a half-open breaker would wait
+        # for its trial call forever
+        succeeded = False
+        try:
+            response = self.session.get(self.url, params={"band": band}, timeout=self.timeout)
+            response.raise_for_status()
+            tips = parse_tips(response.json())
+            succeeded = True
+        except (requests.RequestException, ValueError) as e:
+            print(f"Tip service error ({band}): {e}")
+            return None
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+        with self._lock:
+            self._cache[band] = (time.time(), tips)
+        self._save_cache()
+        return tips
+
+    def refresh_async(self, band: str):
+        """Schedule a background fetch of a band unless one is already queued."""
+        if not self.url:
+            return
+        with self._lock:
+            if band in self._pending:
+                return
+            self._pending.add(band)
+
+        def run():
+            try:
+                self.fetch(band)
+            finally:
+                with self._lock:
+                    self._pending.discard(band)
+
+        self._executor.submit(run)
+
+    def prefetch(self):
+        """Refresh every band whose cached tips are missing or expired, in the background."""
+        for band, _, _ in MOOD_BANDS:
+            if not self._is_fresh(band):
+                self.refresh_async(band)
+
+    def get_tip(self, mood_level: Optional[int]) -> str:
+        """
+        Return a tip for a mood level without waiting for the network.
+
+        Cached remote tips (rotating through the band's list) are preferred,
+        even when expired; otherwise the bundled tip is returned. Missing or
+        expired bands are refreshed in the background for next time.
+        """
+        band = band_for(mood_level)
+        if not self._is_fresh(band):
+            self.refresh_async(band)
+
+        with self._lock:
+            entry = self._cache.get(band)
+            if entry:
+                tips = entry[1]
+                index = self._rotation.get(band, 0)
+                self._rotation[band] = index + 1
+                return tips[index % len(tips)]
+        return self.fallback(mood_level)
+
+_provider: Optional[TipProvider] = None
+_provider_lock = threading.Lock()
+
+def get_tip_provider(fallback: Optional[Callable[[Optional[int]], str]] = None) -> TipProvider:
+    """
+    Return the process-wide tip provider, creating it on first use.
+
+    Args:
+        fallback: If given, installed as the provider's fallback for tips
+            that are not cached yet
+    """
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = TipProvider()
+    if fallback is not None:
+        _provider.fallback = fallback
+    return _provider
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch a mental health tip through the tip provider.")
+    parser.add_argument("--url", default=None, help="tip endpoint (default: MINDFULBALANCE_TIP_API_URL)")
+    parser.add_argument("--level", type=int, default=5, help="mood level (1-10)")
+    parser.add_argument("--cache", default=None, help="cache file (default: data/tip_cache.json)")
+    args = parser.parse_args(argv)
+
+    provider = TipProvider(url=args.url, cache_path=args.cache)
+    band = band_for(args.level)
+    tips = provider.fetch(band)
+    print(f"Fetched {len(tips)} tips for band '{band}'" if tips else f"No remote tips for band '{band}'")
+    print(provider.get_tip(args.level))
+
+if __name__ == "__main__":
+    main()
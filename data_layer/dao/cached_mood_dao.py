@@ -0,0 +1,176 @@
+# data_layer/dao/cached_mood_dao.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Optional, Dict, Any, List, Tuple
+from data_layer import settings
+from data_layer.dao.mood_dao import MoodDAO
+from data_layer.events import (
+    DatabaseRestored, HistoryCompacted, MoodDeleted, MoodLogged, MoodUpdated, SyncApplied, get_event_bus
+)
+
+class CachedMoodDAO:
+    """
+    Read-through cache in front of MoodDAO for per-user reads.
+
+    Results are keyed by user, query, parameters and the current date (for
+    the "today" and "last N days" windows). A user's generation is moved
+    forward synchronously by the write events that MoodDAO, the sync engine
+    and the retention policy publish after commit, so a user's next read
+    after a write always misses. Entries also expire after `ttl` seconds,
+    which bounds staleness for writes made by other processes, and the
+    least recently used entries are evicted beyond `max_entries`.
+
+    Generations are only remembered for the `max_entries` most recently
+    written users; users without one share a base generation, which moves
+    forward whenever a remembered one is dropped.
+
+    Writes and uncached reads are passed straight to the wrapped DAO. One
+    instance is shared per process (see ServiceContainer); call close() on
+    any other instance to unsubscribe it from the event bus.
+    """
+
+    def __init__(self, dao: Optional[MoodDAO] = None, max_entries: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.dao = dao or MoodDAO()
+        self.max_entries = int(max_entries if max_entries is not None else settings.MOOD_CACHE_SIZE)
+        self.ttl = ttl if ttl is not None else settings.MOOD_CACHE_TTL
+        self._entries: "OrderedDict[tuple, Tuple[int, float, Any]]" = OrderedDict()
+        self._generations: "OrderedDict[int, int]" = OrderedDict()
+        self._base_generation = 0
+        self._next_generation = 1
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.subscription = get_event_bus().subscribe(
+            (MoodLogged, MoodUpdated, MoodDeleted, SyncApplied, HistoryCompacted, DatabaseRestored),
+            self._on_event
+        )
+
+    def _on_event(self, event):
+        if isinstance(event, DatabaseRestored):
+            self.invalidate_all()
+        else:
+            self.invalidate(event.user_id)
+
+    def __getattr__(self, name):
+        # Everything not cached below goes to the DAO
+        if name == 'dao':
+            raise AttributeError(name)
+        return getattr(self.dao, name)
+
+    def invalidate(self, user_id: int):
+        """Make every cached result of a user stale."""
+        with self._lock:
+            # Generations only grow, so a dropped one can never match again
+            self._generations[user_id] = self._next_generation
+            self._generations.move_to_end(user_id)
+            self._next_generation += 1
+            while len(self._generations) > max(self.max_entries, 1):
+                self._generations.popitem(last=False)
+                self._base_generation = self._next_generation
+                self._next_generation += 1
+            self.invalidations += 1
+
+    def invalidate_all(self):
+        """Make every cached result stale (e.g. after a restore from backup)."""
+        with self._lock:
+            self._generations.clear()
+            self._base_generation = self._next_generation
+            self._next_generation += 1
+            self._entries.clear()
+            self.invalidations += 1
+
+    def _generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, self._base_generation)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        """Unsubscribe from the event bus and drop every cached result; later reads go to the DAO."""
+        self.subscription.cancel()
+        with self._lock:
+            self.max_entries = 0
+            self._entries.clear()
+            self._generations.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'tracked_users': len(self._generations),
+                'max_entries': self.max_entries
+            }
+
+    def get_or_load(self, user_id: int, name: str, load, params: tuple = ()):
+        """
+        Cache a value derived from a user's mood data (e.g. a report).
+
+        Args:
+            user_id: User ID whose writes invalidate the value
+            name: Cache name of the value
+            load: Called with no arguments on a miss
+            params: Extra key parts
+        """
+        return self._cached(user_id, name, params, load)
+
+    def _cached(self, user_id: int, query: str, params: tuple = (), load=None):
+        if load is None:
+            load = lambda: getattr(self.dao, query)(user_id, *params)
+        if self.max_entries <= 0:
+            return load()
+
+        key = (user_id, query, params, date.today())
+        with self._lock:
+            # Read the generation before querying: a write that lands during
+            # the query bumps it, and the stored result is stale at once
+            generation = self._generation(user_id)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation and entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[2]
+            else:
+                self.misses += 1
+                entry = None
+        if entry is not None:
+            # Callers may modify what they get back (e.g. MoodService.log_mood)
+            return copy.deepcopy(value)
+
+        value = load()
+        with self._lock:
+            self._entries[key] = (generation, time.monotonic() + self.ttl, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def get_today_mood(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return self._cached(user_id, 'get_today_mood')
+
+    def get_user_moods(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        return self._cached(user_id, 'get_user_moods', (limit,))
+
+    def get_mood_statistics(self, user_id: int, days: int = 30) -> Dict[str, Any]:
+        return self._cached(user_id, 'get_mood_statistics', (days,))
+
+    def get_extended_statistics(self, user_id: int, days: int = 30,
+                                good_threshold: float = 7, bad_threshold: float = 4) -> Dict[str, Any]:
+        return self._cached(user_id, 'get_extended_statistics', (days, good_threshold, bad_threshold))
+
+    def get_dashboard_snapshot(self, user_id: int, days: int = 30, recent_limit: int = 7) -> Dict[str, Any]:
+        return self._cached(user_id, 'get_dashboard_snapshot', (days, recent_limit))
@@ -0,0 +1,90 @@
+# data_layer/dao/journal_dao.py
+from typing import Optional, Dict, Any, List
+from data_layer.database.connection import DatabaseConnection
+from data_layer.events import JournalSaved, get_event_bus
+import sqlite3
+
+class JournalDAO:
+    """Data Access Object for Journal operations."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+        self.events = get_event_bus()
+
+    def create_entry(self, user_id: int, content: str) -> Optional[int]:
+        """
+        Create a new journal entry in the database.
+
+        Args:
+            user_id: User ID
+            content: Journal text
+
+        Returns:
+            Entry ID if successful, None if failed
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "INSERT INTO journal_entries (user_id, content) VALUES (?, ?)",
+                    (user_id, content)
+                )
+                conn.commit()
+                entry_id = cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+        self.events.publish(JournalSaved(user_id, entry_id))
+        return entry_id
+
+    def get_user_entries(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get a user's journal entries, newest first.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of journal entry dictionaries
+        """
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """SELECT entry_id, user_id, content, timestamp
+                       FROM journal_entries
+                       WHERE user_id = ?
+                       ORDER BY timestamp DESC, entry_id DESC
+                       LIMIT ?""",
+                    (user_id, limit)
+                )
+                return [{
+                    'entry_id': row['entry_id'],
+                    'user_id': row['user_id'],
+                    'content': row['content'],
+                    'timestamp': row['timestamp']
+                } for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+
+    def delete_entry(self, entry_id: int) -> bool:
+        """
+        Delete a journal entry.
+
+        Args:
+            entry_id: Entry ID to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM journal_entries WHERE entry_id = ?", (entry_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
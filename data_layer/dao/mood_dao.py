@@ -1,16 +1,54 @@
 # data_layer/dao/mood_dao.py
-from typing import Optional, Dict, Any, List
+from typing import Callable, Optional, Dict, Any, List, Tuple
+from data_layer.database.chunked import DEFAULT_CHUNK_SIZE, read_chunks
 from data_layer.database.connection import DatabaseConnection
+from data_layer.events import MoodDeleted, MoodLogged, MoodUpdated, get_event_bus
+import json
+import math
 import sqlite3
 from datetime import datetime, date
 
+WEEKDAY_NAMES = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Called inside a mood write transaction, before commit, as
+# on_write(conn, user_id, mood_id, previous_level, log_date); previous_level
+# is None for a new entry. Raising rolls the write back.
+OnWrite = Callable[[sqlite3.Connection, int, int, Optional[int], str], None]
+
+# Called inside a mood delete transaction, before commit, as
+# on_delete(conn, user_id). Raising rolls the delete back.
+OnDelete = Callable[[sqlite3.Connection, int], None]
+
+# Columns of the blocks yielded by MoodDAO.iter_history_chunks
+HISTORY_CHUNK_DTYPE = [
+    ('day', 'i8'),         # Days since 1970-01-01
+    ('weekday', 'i1'),     # 0 = Monday
+    ('hour', 'i1'),
+    ('mood_level', 'i2'),
+    ('epoch', 'i8'),       # Seconds since 1970-01-01
+]
+
+# Mood levels in a statistics window: raw entries plus the per-day level
+# counts of entries compacted by the retention policy (see
+# data_layer.database.retention). Takes :user_id and :window, a date
+# modifier such as '-30 days'.
+WINDOW_LEVELS_SQL = """SELECT mood_level, 1 AS entries
+                       FROM mood_logs
+                       WHERE user_id = :user_id AND timestamp >= datetime('now', :window)
+                       UNION ALL
+                       SELECT mood_level, entries
+                       FROM mood_daily_summaries
+                       WHERE user_id = :user_id AND day >= date('now', 'localtime', :window)"""
+
 class MoodDAO:
     """Data Access Object for Mood operations."""
     
     def __init__(self):
         self.db = DatabaseConnection()
+        self.events = get_event_bus()
     
-    def create_mood_entry(self, user_id: int, mood_level: int, notes: str = "") -> Optional[int]:
+    def create_mood_entry(self, user_id: int, mood_level: int, notes: str = "",
+                          on_write: Optional[OnWrite] = None) -> Optional[int]:
         """
         Create a new mood entry in the database.
         
@@ -18,22 +56,82 @@ class MoodDAO:
             user_id: User ID
             mood_level: Mood level (1-10)
             notes: Optional notes about the mood
+            on_write: Derived-state update run in the same transaction
             
         Returns:
             Mood ID if successful, None if failed
         """
+        today = date.today().isoformat()
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute(
+                    "INSERT INTO mood_logs (user_id, mood_level, notes, log_date) VALUES (?, ?, ?, ?)",
+                    (user_id, mood_level, notes, today)
+                )
+                mood_id = cursor.lastrowid
+                if on_write:
+                    on_write(conn, user_id, mood_id, None, today)
+                conn.commit()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+        self.events.publish(MoodLogged(user_id, mood_id, mood_level, today))
+        return mood_id
+    
+    def upsert_daily_mood(self, user_id: int, mood_level: int, notes: str = "",
+                          on_write: Optional[OnWrite] = None) -> Optional[Tuple[int, Optional[int]]]:
+        """
+        Record the user's mood for today, updating today's entry if there is one.
+        
+        Relies on the unique (user_id, log_date) index created in
+        one-mood-per-day mode. The previous level is read in the same write
+        transaction so callers can correct running statistics.
+        
+        Args:
+            user_id: User ID
+            mood_level: Mood level (1-10)
+            notes: Optional notes about the mood
+            on_write: Derived-state update run in the same transaction
+            
+        Returns:
+            Tuple of (mood ID, previous level or None if the entry is new),
+            None if failed
+        """
+        today = date.today().isoformat()
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
                 cursor.execute(
-                    "INSERT INTO mood_logs (user_id, mood_level, notes) VALUES (?, ?, ?)",
-                    (user_id, mood_level, notes)
+                    "SELECT mood_level FROM mood_logs WHERE user_id = ? AND log_date = ?",
+                    (user_id, today)
+                )
+                previous = cursor.fetchone()
+                cursor.execute(
+                    """INSERT INTO mood_logs (user_id, mood_level, notes, log_date)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT (user_id, log_date) DO UPDATE SET
+                           mood_level = excluded.mood_level,
+                           notes = excluded.notes,
+                           timestamp = CURRENT_TIMESTAMP
+                       RETURNING mood_id""",
+                    (user_id, mood_level, notes, today)
                 )
+                mood_id = cursor.fetchone()[0]
+                previous_level = previous['mood_level'] if previous else None
+                if on_write:
+                    on_write(conn, user_id, mood_id, previous_level, today)
                 conn.commit()
-                return cursor.lastrowid
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return None
+        if previous_level is None:
+            self.events.publish(MoodLogged(user_id, mood_id, mood_level, today))
+        else:
+            self.events.publish(MoodUpdated(user_id, mood_id, mood_level, previous_level))
+        return mood_id, previous_level
     
     def get_mood_by_id(self, mood_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -46,7 +144,7 @@ class MoodDAO:
             Mood dictionary if found, None otherwise
         """
         try:
-            with self.db.get_connection() as conn:
+            with self.db.read_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT mood_id, user_id, mood_level, notes, timestamp FROM mood_logs WHERE mood_id = ?",
@@ -78,7 +176,7 @@ class MoodDAO:
             List of mood dictionaries
         """
         try:
-            with self.db.get_connection() as conn:
+            with self.db.read_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     """SELECT mood_id, user_id, mood_level, notes, timestamp 
@@ -112,13 +210,14 @@ class MoodDAO:
         """
         try:
             today = date.today().strftime('%Y-%m-%d')
-            with self.db.get_connection() as conn:
+            with self.db.read_connection() as conn:
                 cursor = conn.cursor()
+                # Served by the (user_id, log_date) index; a single row in one-mood-per-day mode
                 cursor.execute(
                     """SELECT mood_id, user_id, mood_level, notes, timestamp 
                        FROM mood_logs 
-                       WHERE user_id = ? AND date(timestamp) = ?
-                       ORDER BY timestamp DESC 
+                       WHERE user_id = ? AND log_date = ?
+                       ORDER BY mood_id DESC 
                        LIMIT 1""",
                     (user_id, today)
                 )
@@ -136,7 +235,8 @@ class MoodDAO:
             print(f"Database error: {e}")
             return None
     
-    def update_mood_entry(self, mood_id: int, mood_level: int, notes: str = "") -> bool:
+    def update_mood_entry(self, mood_id: int, mood_level: int, notes: str = "",
+                          on_write: Optional[OnWrite] = None) -> bool:
         """
         Update an existing mood entry.
         
@@ -144,6 +244,7 @@ class MoodDAO:
             mood_id: Mood ID to update
             mood_level: New mood level
             notes: Updated notes
+            on_write: Derived-state update run in the same transaction
             
         Returns:
             True if successful, False otherwise
@@ -151,22 +252,31 @@ class MoodDAO:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("SELECT user_id, mood_level, log_date FROM mood_logs WHERE mood_id = ?", (mood_id,))
+                previous = cursor.fetchone()
                 cursor.execute(
                     "UPDATE mood_logs SET mood_level = ?, notes = ? WHERE mood_id = ?",
                     (mood_level, notes, mood_id)
                 )
+                if previous is not None and on_write:
+                    on_write(conn, previous['user_id'], mood_id, previous['mood_level'], previous['log_date'])
                 conn.commit()
-                return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
+        if previous is None:
+            return False
+        self.events.publish(MoodUpdated(previous['user_id'], mood_id, mood_level, previous['mood_level']))
+        return True
     
-    def delete_mood_entry(self, mood_id: int) -> bool:
+    def delete_mood_entry(self, mood_id: int, on_delete: Optional[OnDelete] = None) -> bool:
         """
         Delete a mood entry.
         
         Args:
             mood_id: Mood ID to delete
+            on_delete: Derived-state update run in the same transaction
             
         Returns:
             True if successful, False otherwise
@@ -174,12 +284,19 @@ class MoodDAO:
         try:
             with self.db.get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM mood_logs WHERE mood_id = ?", (mood_id,))
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("DELETE FROM mood_logs WHERE mood_id = ? RETURNING user_id", (mood_id,))
+                deleted = cursor.fetchone()
+                if deleted is not None and on_delete:
+                    on_delete(conn, deleted['user_id'])
                 conn.commit()
-                return cursor.rowcount > 0
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
+        if deleted is None:
+            return False
+        self.events.publish(MoodDeleted(deleted['user_id'], mood_id))
+        return True
     
     def get_mood_statistics(self, user_id: int, days: int = 30) -> Dict[str, Any]:
         """
@@ -193,17 +310,16 @@ class MoodDAO:
             Dictionary with mood statistics
         """
         try:
-            with self.db.get_connection() as conn:
+            with self.db.read_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
-                    """SELECT 
-                        COUNT(*) as total_entries,
-                        AVG(mood_level) as average_mood,
-                        MIN(mood_level) as lowest_mood,
-                        MAX(mood_level) as highest_mood
-                       FROM mood_logs 
-                       WHERE user_id = ? AND datetime(timestamp) >= datetime('now', '-{} days')""".format(days),
-                    (user_id,)
+                    f"""WITH levels AS ({WINDOW_LEVELS_SQL})
+                        SELECT COALESCE(SUM(entries), 0) AS total_entries,
+                               SUM(mood_level * entries) * 1.0 / SUM(entries) AS average_mood,
+                               MIN(mood_level) AS lowest_mood,
+                               MAX(mood_level) AS highest_mood
+                        FROM levels""",
+                    {'user_id': user_id, 'window': f"-{int(days)} days"}
                 )
                 row = cursor.fetchone()
                 if row:
@@ -226,4 +342,327 @@ class MoodDAO:
                 'average_mood': 0,
                 'lowest_mood': 0,
                 'highest_mood': 0
-            }
\ No newline at end of file
+            }
+    
+    def get_extended_statistics(self, user_id: int, days: int = 30,
+                                good_threshold: float = 7, bad_threshold: float = 4) -> Dict[str, Any]:
+        """
+        Get distribution, trend, weekday and streak statistics in one statement.
+        
+        The entries in the window are read once through the (user_id,
+        timestamp) index into a materialized CTE, together with the per-day
+        level counts of compacted entries. Percentiles come from the
+        cumulative level counts, streaks from gaps-and-islands over the
+        logged days, and the trend from least-squares sums (compacted days
+        count at local noon), so nothing but one result row leaves SQLite.
+        
+        Args:
+            user_id: User ID
+            days: Number of days to analyze
+            good_threshold: Daily average at or above which a day counts as good
+            bad_threshold: Daily average at or below which a day counts as bad
+            
+        Returns:
+            Dictionary with basic stats, median, percentiles, std_dev,
+            day_of_week means, trend_per_day and streaks
+        """
+        stats = {
+            'total_entries': 0,
+            'average_mood': 0,
+            'lowest_mood': 0,
+            'highest_mood': 0,
+            'median': None,
+            'percentiles': {'p25': None, 'p50': None, 'p75': None, 'p90': None},
+            'std_dev': None,
+            'day_of_week': {name: None for name in WEEKDAY_NAMES},
+            'trend_per_day': None,
+            'streaks': {'best': None, 'worst': None, 'longest_logging': None}
+        }
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """WITH entries AS MATERIALIZED (
+                           -- Each row stands for `weight` entries of one level
+                           SELECT mood_level, log_date, julianday(timestamp) AS jd, 1 AS weight
+                           FROM mood_logs
+                           WHERE user_id = :user_id AND timestamp >= datetime('now', :window)
+                           UNION ALL
+                           -- Compacted days keep no times of day; place them at local noon
+                           SELECT mood_level, day, julianday(day, '+12 hours', 'utc'), entries
+                           FROM mood_daily_summaries
+                           WHERE user_id = :user_id AND day >= date('now', 'localtime', :window)
+                       ),
+                       totals AS (
+                           SELECT SUM(weight) AS n,
+                                  SUM(mood_level * weight) * 1.0 / SUM(weight) AS mean,
+                                  MIN(mood_level) AS lowest,
+                                  MAX(mood_level) AS highest,
+                                  SUM(mood_level * mood_level * weight) AS sum_yy,
+                                  MIN(jd) AS jd0
+                           FROM entries
+                       ),
+                       regression AS (
+                           SELECT SUM((e.jd - t.jd0) * e.weight) AS sx,
+                                  SUM(e.mood_level * e.weight) AS sy,
+                                  SUM((e.jd - t.jd0) * (e.jd - t.jd0) * e.weight) AS sxx,
+                                  SUM((e.jd - t.jd0) * e.mood_level * e.weight) AS sxy
+                           FROM entries e, totals t
+                       ),
+                       levels AS (
+                           -- Range of sorted positions (0-based) held by each mood level
+                           SELECT mood_level,
+                                  SUM(SUM(weight)) OVER (ORDER BY mood_level) - SUM(weight) AS first_pos,
+                                  SUM(SUM(weight)) OVER (ORDER BY mood_level) - 1 AS last_pos
+                           FROM entries
+                           GROUP BY mood_level
+                       ),
+                       quantiles (name, p) AS (
+                           VALUES ('p25', 0.25), ('p50', 0.5), ('p75', 0.75), ('p90', 0.9)
+                       ),
+                       ranks AS (
+                           SELECT q.name, (t.n - 1) * q.p AS rank,
+                                  CAST((t.n - 1) * q.p AS INTEGER) AS low,
+                                  MIN(CAST((t.n - 1) * q.p AS INTEGER) + 1, t.n - 1) AS high
+                           FROM quantiles q, totals t
+                       ),
+                       percentiles AS (
+                           -- Linear interpolation between the two nearest ranks
+                           SELECT r.name,
+                                  MAX(CASE WHEN r.low BETWEEN l.first_pos AND l.last_pos THEN l.mood_level END)
+                                  + (r.rank - r.low)
+                                  * (MAX(CASE WHEN r.high BETWEEN l.first_pos AND l.last_pos THEN l.mood_level END)
+                                     - MAX(CASE WHEN r.low BETWEEN l.first_pos AND l.last_pos THEN l.mood_level END))
+                                  AS value
+                           FROM ranks r, levels l
+                           GROUP BY r.name
+                       ),
+                       daily AS (
+                           SELECT log_date AS day, SUM(mood_level * weight) * 1.0 / SUM(weight) AS average
+                           FROM entries
+                           GROUP BY log_date
+                       ),
+                       weekdays AS (
+                           SELECT CAST(strftime('%w', day) AS INTEGER) AS weekday,
+                                  AVG(average) AS average
+                           FROM daily
+                           GROUP BY weekday
+                       ),
+                       flagged AS (
+                           SELECT 'longest_logging' AS kind, day, average FROM daily
+                           UNION ALL
+                           SELECT 'best', day, average FROM daily WHERE average >= :good
+                           UNION ALL
+                           SELECT 'worst', day, average FROM daily WHERE average <= :bad
+                       ),
+                       islands AS (
+                           -- Consecutive days share julianday(day) - rank
+                           SELECT kind, day, average,
+                                  julianday(day) - ROW_NUMBER() OVER (PARTITION BY kind ORDER BY day) AS island
+                           FROM flagged
+                       ),
+                       runs AS (
+                           SELECT kind, COUNT(*) AS length, MIN(day) AS start, MAX(day) AS finish,
+                                  AVG(average) AS average,
+                                  ROW_NUMBER() OVER (PARTITION BY kind ORDER BY COUNT(*) DESC, MIN(day)) AS rank
+                           FROM islands
+                           GROUP BY kind, island
+                       )
+                       SELECT t.n, t.mean, t.lowest, t.highest, t.sum_yy,
+                              r.sx, r.sy, r.sxx, r.sxy,
+                              (SELECT json_group_object(name, value) FROM percentiles) AS percentiles,
+                              (SELECT json_group_object(weekday, average) FROM weekdays) AS weekdays,
+                              (SELECT json_group_object(kind, json_object(
+                                          'length', length, 'start', start, 'end', finish,
+                                          'average_mood', round(average, 2)))
+                               FROM runs WHERE rank = 1) AS streaks
+                       FROM totals t, regression r""",
+                    {'user_id': user_id, 'window': f"-{int(days)} days",
+                     'good': good_threshold, 'bad': bad_threshold}
+                )
+                row = cursor.fetchone()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return stats
+        
+        n = row['n'] if row else 0
+        if not n:
+            return stats
+        
+        stats.update({
+            'total_entries': n,
+            'average_mood': round(row['mean'], 1),
+            'lowest_mood': row['lowest'],
+            'highest_mood': row['highest']
+        })
+        
+        percentiles = json.loads(row['percentiles'])
+        stats['percentiles'] = {name: round(percentiles[name], 2) for name in stats['percentiles']}
+        stats['median'] = stats['percentiles']['p50']
+        
+        if n > 1:
+            variance = (row['sum_yy'] - n * row['mean'] ** 2) / (n - 1)
+            stats['std_dev'] = round(math.sqrt(max(variance, 0.0)), 2)
+            denominator = n * row['sxx'] - row['sx'] ** 2
+            if denominator > 1e-12:
+                stats['trend_per_day'] = round((n * row['sxy'] - row['sx'] * row['sy']) / denominator, 4)
+        
+        # strftime('%w') counts from Sunday = 0
+        weekdays = json.loads(row['weekdays'])
+        stats['day_of_week'] = {
+            name: round(weekdays[str((index + 1) % 7)], 2) if str((index + 1) % 7) in weekdays else None
+            for index, name in enumerate(WEEKDAY_NAMES)
+        }
+        
+        stats['streaks'].update(json.loads(row['streaks'] or '{}'))
+        return stats
+    
+    def get_dashboard_snapshot(self, user_id: int, days: int = 30, recent_limit: int = 7) -> Dict[str, Any]:
+        """
+        Get everything the dashboard shows in a single statement.
+        
+        The window statistics and the most recent entries are read by one
+        query, so they always come from the same snapshot. Today's mood is the
+        newest recent entry when it was logged today.
+        
+        Args:
+            user_id: User ID
+            days: Number of days covered by the statistics
+            recent_limit: Number of recent entries to return (at least 1)
+            
+        Returns:
+            Dictionary with 'stats', 'recent' (newest first) and 'today'
+        """
+        snapshot = {
+            'stats': {
+                'total_entries': 0,
+                'average_mood': 0,
+                'lowest_mood': 0,
+                'highest_mood': 0
+            },
+            'recent': [],
+            'today': None
+        }
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""WITH levels AS ({WINDOW_LEVELS_SQL}),
+                        stats AS (
+                           SELECT COALESCE(SUM(entries), 0) AS total_entries,
+                                  SUM(mood_level * entries) * 1.0 / SUM(entries) AS average_mood,
+                                  MIN(mood_level) AS lowest_mood,
+                                  MAX(mood_level) AS highest_mood
+                           FROM levels
+                       ),
+                       recent AS (
+                           SELECT mood_id, user_id, mood_level, notes, timestamp, log_date
+                           FROM mood_logs
+                           WHERE user_id = :user_id
+                           ORDER BY timestamp DESC, mood_id DESC
+                           LIMIT :recent_limit
+                       )
+                       SELECT stats.*, recent.*
+                       FROM stats LEFT JOIN recent ON 1
+                       ORDER BY recent.timestamp DESC, recent.mood_id DESC""",
+                    {'user_id': user_id, 'window': f"-{int(days)} days", 'recent_limit': max(1, recent_limit)}
+                )
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return snapshot
+        
+        if not rows:
+            return snapshot
+        
+        first = rows[0]
+        if first['total_entries']:
+            snapshot['stats'] = {
+                'total_entries': first['total_entries'],
+                'average_mood': round(first['average_mood'], 1),
+                'lowest_mood': first['lowest_mood'],
+                'highest_mood': first['highest_mood']
+            }
+        
+        snapshot['recent'] = [{
+            'mood_id': row['mood_id'],
+            'user_id': row['user_id'],
+            'mood_level': row['mood_level'],
+            'notes': row['notes'],
+            'timestamp': row['timestamp']
+        } for row in rows if row['mood_id'] is not None]
+        
+        today = date.today().strftime('%Y-%m-%d')
+        if snapshot['recent'] and rows[0]['log_date'] == today:
+            snapshot['today'] = snapshot['recent'][0]
+        
+        return snapshot
+    
+    def iter_history_chunks(self, user_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Stream a user's full mood history as fixed-size NumPy blocks.
+        
+        Calendar fields are derived in SQL, so each block is purely numeric
+        (see HISTORY_CHUNK_DTYPE); days are the entries' local log dates.
+        Rows come in no particular order, and the block buffer is reused:
+        fold each block before asking for the next. Entries compacted by
+        the retention policy are streamed by iter_compacted_chunks.
+        
+        Args:
+            user_id: User ID
+            chunk_size: Rows per block
+            
+        Yields:
+            Structured arrays of at most chunk_size rows
+        """
+        with self.db.read_connection() as conn:
+            yield from read_chunks(
+                conn,
+                """SELECT CAST(julianday(day) - 2440587.5 AS INTEGER),
+                          (CAST(strftime('%w', day) AS INTEGER) + 6) % 7,
+                          CAST(strftime('%H', timestamp) AS INTEGER),
+                          mood_level,
+                          CAST(strftime('%s', timestamp) AS INTEGER)
+                   FROM (SELECT COALESCE(log_date, date(timestamp, 'localtime')) AS day, timestamp, mood_level
+                         FROM mood_logs
+                         WHERE user_id = ? AND timestamp IS NOT NULL)""",
+                (user_id,),
+                HISTORY_CHUNK_DTYPE,
+                chunk_size
+            )
+    
+    def iter_compacted_chunks(self, user_id: int, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Stream the entries compacted by the retention policy as history blocks.
+        
+        Each per-day level count is expanded back into that many rows with
+        the HISTORY_CHUNK_DTYPE layout. Times of day were not kept: hour is
+        -1 and epoch is local noon of the day.
+        
+        Args:
+            user_id: User ID
+            chunk_size: Rows per block
+            
+        Yields:
+            Structured arrays of at most chunk_size rows (buffer reused)
+        """
+        with self.db.read_connection() as conn:
+            yield from read_chunks(
+                conn,
+                """WITH RECURSIVE copies (n) AS (
+                       SELECT 1
+                       UNION ALL
+                       SELECT n + 1 FROM copies
+                       WHERE n < (SELECT MAX(entries) FROM mood_daily_summaries WHERE user_id = :user_id)
+                   )
+                   SELECT CAST(julianday(s.day) - 2440587.5 AS INTEGER),
+                          (CAST(strftime('%w', s.day) AS INTEGER) + 6) % 7,
+                          -1,
+                          s.mood_level,
+                          CAST(strftime('%s', s.day, '+12 hours', 'utc') AS INTEGER)
+                   FROM mood_daily_summaries s JOIN copies c ON c.n <= s.entries
+                   WHERE s.user_id = :user_id""",
+                {'user_id': user_id},
+                HISTORY_CHUNK_DTYPE,
+                chunk_size
+            )
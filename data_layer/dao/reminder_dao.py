@@ -0,0 +1,194 @@
+# data_layer/dao/reminder_dao.py
+import json
+from typing import Optional, Dict, Any, List, Tuple
+from data_layer.database.connection import DatabaseConnection
+import sqlite3
+
+# A user's local day at :now (Unix seconds), from their offset in minutes east of UTC
+LOCAL_DATE_SQL = "date(:now, 'unixepoch', printf('%+d minutes', p.utc_offset))"
+
+# Whether a user has a mood entry on a local day of their offset. Same as
+# date(m.timestamp, printf('%+d minutes', offset)) = day, written as a UTC
+# timestamp range so each probe is one (user_id, timestamp) index range scan.
+# log_date cannot be used: it is the local day of the machine that logged.
+LOGGED_ON_LOCAL_DATE_SQL = """EXISTS (
+    SELECT 1 FROM mood_logs m
+    WHERE m.user_id = {user_id}
+      AND m.timestamp >= datetime({day}, printf('%+d minutes', -{utc_offset}))
+      AND m.timestamp < datetime({day}, '+1 day', printf('%+d minutes', -{utc_offset}))
+)"""
+
+class ReminderDAO:
+    """Data Access Object for daily check-in reminder preferences."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+
+    def set_preference(self, user_id: int, remind_at: str, utc_offset: int = 0,
+                       enabled: bool = True) -> bool:
+        """
+        Create or replace a user's reminder preference.
+
+        Args:
+            user_id: User ID
+            remind_at: Local time of day as 'HH:MM'
+            utc_offset: Minutes east of UTC of the user's time zone
+            enabled: Whether reminders are sent
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    """INSERT INTO reminder_preferences (user_id, remind_at, utc_offset, enabled)
+                       VALUES (?, ?, ?, ?)
+                       ON CONFLICT (user_id) DO UPDATE SET
+                           remind_at = excluded.remind_at,
+                           utc_offset = excluded.utc_offset,
+                           enabled = excluded.enabled""",
+                    (user_id, remind_at, utc_offset, int(enabled))
+                )
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def get_preference(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get a user's reminder preference.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Preference dictionary or None if the user has none
+        """
+        try:
+            with self.db.read_connection() as conn:
+                row = conn.execute(
+                    """SELECT user_id, remind_at, utc_offset, enabled, last_sent_date
+                       FROM reminder_preferences WHERE user_id = ?""",
+                    (user_id,)
+                ).fetchone()
+                if row is None:
+                    return None
+                return {
+                    'user_id': row['user_id'],
+                    'remind_at': row['remind_at'],
+                    'utc_offset': row['utc_offset'],
+                    'enabled': bool(row['enabled']),
+                    'last_sent_date': row['last_sent_date']
+                }
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    def get_pending_reminders(self, now: float) -> List[Tuple[int, int, str, str]]:
+        """
+        Find every enabled user with no mood entry for their local day.
+
+        One anti-join over all preferences: each NOT EXISTS probe is a
+        single range scan of the (user_id, timestamp) index over the user's
+        local day, so there is no per-user query. The due time is computed in SQL as well. Rows are
+        plain tuples ordered like heap entries, since this can return
+        hundreds of thousands of them.
+
+        Args:
+            now: Current time in Unix seconds
+
+        Returns:
+            List of (due_at, user_id, username, local_date) tuples, where
+            due_at is the Unix time of remind_at on the user's local day
+        """
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(
+                    f"""WITH local AS (
+                            SELECT p.user_id, p.remind_at, p.utc_offset, p.last_sent_date,
+                                   {LOCAL_DATE_SQL} AS local_date
+                            FROM reminder_preferences p
+                            WHERE p.enabled = 1
+                        )
+                        SELECT CAST(strftime('%s', l.local_date || ' ' || l.remind_at) AS INTEGER)
+                                   - l.utc_offset * 60,
+                               l.user_id, u.username, l.local_date
+                        FROM local l
+                        JOIN users u ON u.user_id = l.user_id
+                        WHERE (l.last_sent_date IS NULL OR l.last_sent_date < l.local_date)
+                          AND NOT {LOGGED_ON_LOCAL_DATE_SQL.format(
+                              user_id='l.user_id', day='l.local_date', utc_offset='l.utc_offset')}""",
+                    {'now': now}
+                )
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+
+    def claim_reminders(self, user_ids: List[int], local_date: str) -> List[int]:
+        """
+        Mark reminders for a local day as sent, skipping users who have
+        logged a mood, been reminded or disabled reminders since planning.
+
+        The check and the update are one statement, so concurrent schedulers
+        never claim the same reminder twice.
+
+        Args:
+            user_ids: Users due a reminder
+            local_date: Their local day ('YYYY-MM-DD')
+
+        Returns:
+            IDs of the users that should be reminded now
+        """
+        if not user_ids:
+            return []
+        try:
+            with self.db.get_connection() as conn:
+                logged = LOGGED_ON_LOCAL_DATE_SQL.format(
+                    user_id='reminder_preferences.user_id', day=':day',
+                    utc_offset='reminder_preferences.utc_offset'
+                )
+                cursor = conn.execute(
+                    f"""UPDATE reminder_preferences SET last_sent_date = :day
+                        WHERE user_id IN (SELECT value FROM json_each(:ids))
+                          AND enabled = 1
+                          AND (last_sent_date IS NULL OR last_sent_date < :day)
+                          AND NOT {logged}
+                        RETURNING user_id""",
+                    {'day': local_date, 'ids': json.dumps(user_ids)}
+                )
+                claimed = [row[0] for row in cursor.fetchall()]
+                conn.commit()
+                return claimed
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+
+    def release_reminders(self, user_ids: List[int], local_date: str) -> bool:
+        """
+        Undo claim_reminders for reminders that could not be delivered.
+
+        Args:
+            user_ids: Users whose reminder failed
+            local_date: The local day they were claimed for
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not user_ids:
+            return True
+        try:
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    """UPDATE reminder_preferences SET last_sent_date = NULL
+                       WHERE user_id IN (SELECT value FROM json_each(?)) AND last_sent_date = ?""",
+                    (json.dumps(user_ids), local_date)
+                )
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
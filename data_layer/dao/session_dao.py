@@ -0,0 +1,134 @@
+# data_layer/dao/session_dao.py
+from typing import Optional, Dict, Any
+from data_layer.database.connection import DatabaseConnection
+import sqlite3
+
+class SessionDAO:
+    """Data Access Object for remembered login sessions."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+
+    def create_session(self, token_hash: str, user_id: int, expires_at: int) -> bool:
+        """
+        Store a new session.
+
+        Args:
+            token_hash: SHA-256 hex digest of the session token
+            user_id: User the session belongs to
+            expires_at: Expiry in Unix seconds
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO sessions (token_hash, user_id, expires_at) VALUES (?, ?, ?)",
+                    (token_hash, user_id, expires_at)
+                )
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def get_session(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a session and its user by token hash (one primary key lookup).
+
+        Args:
+            token_hash: SHA-256 hex digest of the session token
+
+        Returns:
+            Dictionary with the session expiry and user fields, or None
+        """
+        try:
+            with self.db.read_connection() as conn:
+                row = conn.execute(
+                    """SELECT s.user_id, s.expires_at, u.username, u.email, u.created_at
+                       FROM sessions s
+                       JOIN users u ON u.user_id = s.user_id
+                       WHERE s.token_hash = ?""",
+                    (token_hash,)
+                ).fetchone()
+                if row is None:
+                    return None
+                return {
+                    'user_id': row['user_id'],
+                    'expires_at': row['expires_at'],
+                    'username': row['username'],
+                    'email': row['email'],
+                    'created_at': row['created_at']
+                }
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    def renew_session(self, token_hash: str, expires_at: int) -> bool:
+        """
+        Move a session's expiry forward.
+
+        Returns:
+            True if the session still exists, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                # Never moves it back if another client renewed it further
+                cursor = conn.execute(
+                    "UPDATE sessions SET expires_at = MAX(expires_at, ?) WHERE token_hash = ?",
+                    (expires_at, token_hash)
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def delete_session(self, token_hash: str) -> bool:
+        """
+        Delete one session.
+
+        Returns:
+            True if a session was deleted, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.execute("DELETE FROM sessions WHERE token_hash = ?", (token_hash,))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def delete_user_sessions(self, user_id: int) -> int:
+        """
+        Delete every session of a user.
+
+        Returns:
+            Number of sessions deleted
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
+                conn.commit()
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return 0
+
+    def delete_expired(self, now: int) -> int:
+        """
+        Delete sessions that expired before `now` (Unix seconds).
+
+        Returns:
+            Number of sessions deleted
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+                conn.commit()
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return 0
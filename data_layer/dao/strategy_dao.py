@@ -0,0 +1,140 @@
+# data_layer/dao/strategy_dao.py
+from typing import Optional, Dict, Any, List, Iterable
+from data_layer.database.connection import DatabaseConnection
+import sqlite3
+
+# Bundled catalog: (title, description, category, min_level, max_level).
+# None bounds mark general entries used when no band matches.
+DEFAULT_STRATEGIES = [
+    # Mental health tips shown after saving a journal entry
+    ("Reach out", "It's okay to feel down. Try talking to a friend or practicing deep breathing.", "tip", 1, 2),
+    ("Move a little", "Take a short walk or listen to your favorite music to lift your mood.", "tip", 3, 4),
+    ("Self-care", "Keep going! A little self-care goes a long way.", "tip", 5, 6),
+    ("Share it", "Great job! Remember to share your positivity with others.", "tip", 7, 8),
+    ("Keep it up", "You're doing amazing! Keep up the positive mindset!", "tip", 9, 10),
+
+    # Dashboard recommendations
+    ("Connect", "Consider reaching out to a trusted friend or family member", "recommendation", 1, 3),
+    ("Breathe", "Try some deep breathing exercises or meditation", "recommendation", 1, 3),
+    ("Get outside", "Take a short walk outside if possible", "recommendation", 1, 3),
+    ("Professional support", "Consider speaking with a mental health professional", "recommendation", 1, 3),
+    ("Journal", "Try journaling about your feelings", "recommendation", 4, 5),
+    ("Music", "Listen to some uplifting music", "recommendation", 4, 5),
+    ("Gratitude", "Practice gratitude by listing three things you're thankful for", "recommendation", 4, 5),
+    ("Light exercise", "Consider doing some light exercise", "recommendation", 4, 5),
+    ("Spread positivity", "Great mood! Consider sharing your positivity with others", "recommendation", 8, 10),
+    ("Take on challenges", "This is a good time to tackle challenging tasks", "recommendation", 8, 10),
+    ("Reflect", "Reflect on what's contributing to your good mood", "recommendation", 8, 10),
+    ("Plan ahead", "Consider planning something fun for the future", "recommendation", 8, 10),
+    ("Self-care", "Remember to practice self-care", "recommendation", None, None),
+    ("Stay connected", "Stay connected with loved ones", "recommendation", None, None),
+    ("Sleep", "Maintain a regular sleep schedule", "recommendation", None, None),
+    ("Mood journal", "Consider keeping a daily mood journal", "recommendation", None, None),
+]
+
+class CopingStrategyDAO:
+    """Data Access Object for coping strategy operations."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+
+    def get_all_strategies(self) -> List[Dict[str, Any]]:
+        """
+        Get every coping strategy in catalog order.
+
+        Returns:
+            List of strategy dictionaries
+        """
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """SELECT strategy_id, title, description, category, min_level, max_level
+                       FROM coping_strategies
+                       ORDER BY strategy_id"""
+                )
+                return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+
+    def seed_strategies(self, strategies: Iterable[tuple] = DEFAULT_STRATEGIES) -> int:
+        """
+        Insert the bundled strategies in one transaction if the table is empty.
+
+        Args:
+            strategies: Rows of (title, description, category, min_level, max_level)
+
+        Returns:
+            Number of rows inserted
+        """
+        try:
+            conn = self.db.get_connection()
+            try:
+                with conn:
+                    cursor = conn.cursor()
+                    cursor.execute("SELECT EXISTS (SELECT 1 FROM coping_strategies)")
+                    if cursor.fetchone()[0]:
+                        return 0
+                    cursor.executemany(
+                        """INSERT INTO coping_strategies
+                           (title, description, category, min_level, max_level)
+                           VALUES (?, ?, ?, ?, ?)""",
+                        list(strategies)
+                    )
+                    return cursor.rowcount
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return 0
+
+    def create_strategy(self, title: str, description: str, category: str,
+                        min_level: Optional[int] = None, max_level: Optional[int] = None) -> Optional[int]:
+        """
+        Create a new coping strategy.
+
+        Args:
+            title: Short title
+            description: Text shown to the user
+            category: 'tip' or 'recommendation'
+            min_level: Lowest mood level the strategy applies to (None = any)
+            max_level: Highest mood level the strategy applies to (None = any)
+
+        Returns:
+            Strategy ID if successful, None if failed
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """INSERT INTO coping_strategies
+                       (title, description, category, min_level, max_level)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    (title, description, category, min_level, max_level)
+                )
+                conn.commit()
+                return cursor.lastrowid
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    def delete_strategy(self, strategy_id: int) -> bool:
+        """
+        Delete a coping strategy.
+
+        Args:
+            strategy_id: Strategy ID to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM coping_strategies WHERE strategy_id = ?", (strategy_id,))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
@@ -1,6 +1,8 @@
 # data_layer/dao/user_dao.py
-from typing import Optional, Dict, Any
+import json
+from typing import Optional, Dict, Any, List, Sequence, Set, Tuple
 from data_layer.database.connection import DatabaseConnection
+from data_layer.events import UserRegistered, get_event_bus
 import sqlite3
 
 class UserDAO:
@@ -8,6 +10,7 @@ class UserDAO:
     
     def __init__(self):
         self.db = DatabaseConnection()
+        self.events = get_event_bus()
     
     def create_user(self, username: str, email: str, password: str) -> Optional[int]:
         """
@@ -29,12 +32,14 @@ class UserDAO:
                     (username, email, password)
                 )
                 conn.commit()
-                return cursor.lastrowid
+                user_id = cursor.lastrowid
         except sqlite3.IntegrityError:
             # Username or email already exists
             return None
         except sqlite3.Error:
             return None
+        self.events.publish(UserRegistered(user_id, username))
+        return user_id
     
     def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """
@@ -131,4 +136,112 @@ class UserDAO:
     
     def email_exists(self, email: str) -> bool:
         """Check if email already exists."""
-        return self.get_user_by_email(email) is not None
\ No newline at end of file
+        return self.get_user_by_email(email) is not None
+    
+    def update_password(self, user_id: int, password: str) -> bool:
+        """
+        Replace a user's stored password.
+        
+        Args:
+            user_id: User ID
+            password: Hashed password
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.db.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("UPDATE users SET password = ? WHERE user_id = ?", (password, user_id))
+                conn.commit()
+                return cursor.rowcount > 0
+        except sqlite3.Error:
+            return False
+    
+    def get_stored_passwords(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve every user's stored password value.
+        
+        Returns:
+            List of dictionaries with 'user_id' and 'password'
+        """
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT user_id, password FROM users ORDER BY user_id")
+                return [{'user_id': row['user_id'], 'password': row['password']} for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return []
+    
+    def find_existing(self, usernames: Sequence[str], emails: Sequence[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        Find which of the given usernames and emails are already taken.
+        
+        Args:
+            usernames: Usernames to check
+            emails: Email addresses to check
+            
+        Returns:
+            Tuple of (taken usernames, taken emails)
+        """
+        try:
+            with self.db.read_connection() as conn:
+                cursor = conn.cursor()
+                # Each value is one lookup in the UNIQUE index of its column
+                cursor.execute(
+                    "SELECT username FROM users WHERE username IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(usernames)),)
+                )
+                taken_usernames = {row[0] for row in cursor.fetchall()}
+                cursor.execute(
+                    "SELECT email FROM users WHERE email IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(emails)),)
+                )
+                taken_emails = {row[0] for row in cursor.fetchall()}
+                return taken_usernames, taken_emails
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return set(), set()
+    
+    def create_users(self, users: Sequence[Tuple[str, str, str]], chunk_size: int = 500) -> List[Optional[int]]:
+        """
+        Create many users, committing once per chunk.
+        
+        Rows whose username or email is taken (including by an earlier row,
+        or by a concurrent registration) are skipped rather than failing
+        the chunk.
+        
+        Args:
+            users: (username, email, hashed password) tuples
+            chunk_size: Rows per transaction
+            
+        Returns:
+            User ID per row, None where the row was a duplicate or failed
+        """
+        user_ids: List[Optional[int]] = []
+        for start in range(0, len(users), chunk_size):
+            chunk = users[start:start + chunk_size]
+            try:
+                with self.db.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("BEGIN IMMEDIATE")
+                    created = []
+                    for username, email, password in chunk:
+                        row = cursor.execute(
+                            """INSERT INTO users (username, email, password) VALUES (?, ?, ?)
+                               ON CONFLICT DO NOTHING
+                               RETURNING user_id""",
+                            (username, email, password)
+                        ).fetchone()
+                        created.append(row[0] if row else None)
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                user_ids.extend([None] * len(chunk))
+                continue
+            user_ids.extend(created)
+            for user_id, (username, _, _) in zip(created, chunk):
+                if user_id is not None:
+                    self.events.publish(UserRegistered(user_id, username))
+        return user_ids
@@ -0,0 +1,150 @@
+# data_layer/dao/wellness_dao.py
+from typing import Optional, Dict, Any, Iterator, List
+from data_layer.database.connection import DatabaseConnection
+import sqlite3
+
+STATE_COLUMNS = (
+    'user_id', 'wellness_score', 'entry_count', 'mean', 'm2', 'current_streak',
+    'best_streak', 'last_log_date', 'last_mood_id', 'last_mood_level',
+    'last_zscore', 'is_anomaly'
+)
+
+class WellnessDAO:
+    """Data Access Object for the per-user wellness state."""
+
+    def __init__(self):
+        self.db = DatabaseConnection()
+
+    def get_state(self, user_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the wellness state row for a user.
+
+        Args:
+            user_id: User ID
+            conn: Connection of a caller's write transaction; errors then
+                propagate so the caller can roll back
+
+        Returns:
+            State dictionary if found, None otherwise
+        """
+        query = f"SELECT {', '.join(STATE_COLUMNS)} FROM user_wellness_state WHERE user_id = ?"
+        if conn is not None:
+            row = conn.execute(query, (user_id,)).fetchone()
+            return dict(row) if row else None
+        try:
+            with self.db.read_connection() as conn:
+                row = conn.execute(query, (user_id,)).fetchone()
+                return dict(row) if row else None
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return None
+
+    def save_states(self, states: List[Dict[str, Any]], conn: Optional[sqlite3.Connection] = None) -> bool:
+        """
+        Insert or replace wellness state rows in one transaction.
+
+        Args:
+            states: State dictionaries keyed by STATE_COLUMNS
+            conn: Connection of a caller's write transaction; the rows are
+                then written without committing and errors propagate
+
+        Returns:
+            True if successful, False otherwise
+        """
+        placeholders = ', '.join('?' for _ in STATE_COLUMNS)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in STATE_COLUMNS[1:])
+        query = f"""INSERT INTO user_wellness_state ({', '.join(STATE_COLUMNS)})
+                    VALUES ({placeholders})
+                    ON CONFLICT(user_id) DO UPDATE SET {updates},
+                        updated_at = CURRENT_TIMESTAMP"""
+        rows = [tuple(state[column] for column in STATE_COLUMNS) for state in states]
+        if conn is not None:
+            conn.executemany(query, rows)
+            return True
+        try:
+            conn = self.db.get_connection()
+            try:
+                with conn:
+                    conn.executemany(query, rows)
+                return True
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def save_state(self, state: Dict[str, Any], conn: Optional[sqlite3.Connection] = None) -> bool:
+        """Insert or replace a single wellness state row."""
+        return self.save_states([state], conn)
+
+    def iter_history(self, user_id: Optional[int] = None,
+                     conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Row]:
+        """
+        Stream mood entries in chronological order per user, for rebuilds.
+
+        Entries compacted by the retention policy come first within their
+        day as one row per day and mood level, with mood_id NULL and the
+        number of entries in `entries`; their order within the day was not
+        kept.
+
+        Args:
+            user_id: Limit to one user, or None for everyone
+            conn: Connection to read through (e.g. a rebuild's write
+                transaction); a read-only connection otherwise
+
+        Yields:
+            Rows with mood_id, user_id, mood_level, log_date (the local day,
+            as written by MoodDAO) and entries (1 for raw entries)
+        """
+        where, params = "", ()
+        if user_id is not None:
+            where, params = " WHERE user_id = ?", (user_id, user_id)
+        query = f"""SELECT mood_id, user_id, mood_level, log_date, entries FROM (
+                        SELECT mood_id, user_id, mood_level,
+                               COALESCE(log_date, date(timestamp, 'localtime')) AS log_date,
+                               timestamp, 1 AS entries
+                        FROM mood_logs{where}
+                        UNION ALL
+                        SELECT NULL, user_id, mood_level, day, NULL, entries
+                        FROM mood_daily_summaries{where}
+                    )
+                    ORDER BY user_id, log_date, timestamp, mood_id, mood_level"""
+
+        if conn is not None:
+            yield from self._fetch_batches(conn.execute(query, params))
+            return
+        with self.db.read_connection() as conn:
+            yield from self._fetch_batches(conn.execute(query, params))
+
+    @staticmethod
+    def _fetch_batches(cursor: sqlite3.Cursor) -> Iterator[sqlite3.Row]:
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            yield from rows
+
+    def delete_state(self, user_id: Optional[int] = None, conn: Optional[sqlite3.Connection] = None) -> bool:
+        """
+        Delete the state of one user, or of everyone when user_id is None.
+
+        With `conn` the delete joins the caller's transaction (no commit,
+        errors propagate).
+        """
+        if conn is not None:
+            if user_id is None:
+                conn.execute("DELETE FROM user_wellness_state")
+            else:
+                conn.execute("DELETE FROM user_wellness_state WHERE user_id = ?", (user_id,))
+            return True
+        try:
+            with self.db.get_connection() as conn:
+                if user_id is None:
+                    conn.execute("DELETE FROM user_wellness_state")
+                else:
+                    conn.execute("DELETE FROM user_wellness_state WHERE user_id = ?", (user_id,))
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
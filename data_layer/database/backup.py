@@ -0,0 +1,211 @@
+# data_layer/database/backup.py
+"""
+Online backups of the application database.
+
+Backups use sqlite3.Connection.backup, copying a bounded number of pages per
+step and sleeping between steps. The source is a read-only connection that
+holds one read transaction for the whole copy: under WAL that pins a
+consistent snapshot, so concurrent writes neither block nor restart the
+backup. Each backup is verified with PRAGMA integrity_check and kept as one
+of a fixed number of rotating generations.
+
+Run from the project root:
+
+    python -m data_layer.database.backup create [--keep 7]
+    python -m data_layer.database.backup list
+    python -m data_layer.database.backup restore <backup file>
+"""
+import argparse
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from urllib.parse import quote
+from data_layer.database.connection import DatabaseConnection
+from data_layer.events import ALL_USERS, DatabaseRestored, get_event_bus
+
+BACKUP_PREFIX = "mindfulbalance-"
+BACKUP_SUFFIX = ".db"
+
+class BackupManager:
+    """Creates, verifies, rotates and restores database backups."""
+
+    def __init__(self, backup_dir: Optional[str] = None, keep: int = 7,
+                 pages_per_step: int = 256, sleep_seconds: float = 0.01):
+        self.db = DatabaseConnection()
+        self.backup_dir = backup_dir or os.path.join(self.db.data_dir, "backups")
+        self.keep = max(1, keep)
+        self.pages_per_step = max(1, pages_per_step)
+        self.sleep_seconds = sleep_seconds
+
+    def _copy(self, source: sqlite3.Connection, target: sqlite3.Connection, progress=None):
+        """Copy source into target in page-bounded steps, yielding between steps."""
+        def on_step(status, remaining, total):
+            if progress:
+                progress(total - remaining, total)
+            # Give writers a window between steps
+            if remaining and self.sleep_seconds:
+                time.sleep(self.sleep_seconds)
+
+        source.backup(target, pages=self.pages_per_step, progress=on_step)
+
+    def verify(self, path: str) -> bool:
+        """
+        Check a database file with PRAGMA integrity_check.
+
+        Args:
+            path: Database file to check
+
+        Returns:
+            True if SQLite reports 'ok', False otherwise
+        """
+        try:
+            conn = sqlite3.connect(f"file:{quote(path)}?mode=ro", uri=True)
+            try:
+                return self._integrity_ok(conn)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"Database error: {e}")
+            return False
+
+    def _integrity_ok(self, conn: sqlite3.Connection) -> bool:
+        return [row[0] for row in conn.execute("PRAGMA integrity_check")] == ["ok"]
+
+    def create_backup(self, progress=None) -> Optional[str]:
+        """
+        Take a hot backup of the live database and rotate old generations.
+
+        Args:
+            progress: Optional callback(pages_done, pages_total)
+
+        Returns:
+            Path of the verified backup, or None if it failed
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        final_path = os.path.join(self.backup_dir, f"{BACKUP_PREFIX}{stamp}{BACKUP_SUFFIX}")
+        partial_path = final_path + ".partial"
+
+        try:
+            source = self.db.get_read_connection()
+            target = sqlite3.connect(partial_path)
+            try:
+                # Pin the WAL snapshot so steps never see (and restart on) new writes
+                source.execute("BEGIN")
+                source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+                self._copy(source, target, progress)
+                source.rollback()
+            finally:
+                target.close()
+                source.close()
+
+            if not self.verify(partial_path):
+                print(f"Backup failed integrity check: {partial_path}")
+                os.remove(partial_path)
+                return None
+
+            os.replace(partial_path, final_path)
+            self.rotate()
+            return final_path
+        except (sqlite3.Error, OSError) as e:
+            print(f"Backup error: {e}")
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            return None
+
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """
+        List completed backups, newest first.
+
+        Returns:
+            List of dictionaries with path, size and created time
+        """
+        if not os.path.isdir(self.backup_dir):
+            return []
+        backups = []
+        for name in os.listdir(self.backup_dir):
+            if name.startswith(BACKUP_PREFIX) and name.endswith(BACKUP_SUFFIX):
+                path = os.path.join(self.backup_dir, name)
+                stat = os.stat(path)
+                backups.append({
+                    'path': path,
+                    'size': stat.st_size,
+                    'created': datetime.fromtimestamp(stat.st_mtime)
+                })
+        # Names embed the timestamp, so they sort chronologically
+        return sorted(backups, key=lambda backup: os.path.basename(backup['path']), reverse=True)
+
+    def rotate(self) -> List[str]:
+        """Delete all but the newest `keep` backups and return the removed paths."""
+        removed = []
+        for backup in self.list_backups()[self.keep:]:
+            os.remove(backup['path'])
+            removed.append(backup['path'])
+        return removed
+
+    def restore(self, backup_path: str, progress=None) -> bool:
+        """
+        Restore the live database from a backup.
+
+        The backup is verified first and copied into the live database
+        through the backup API, so open connections see the restored
+        content instead of a replaced file. On success DatabaseRestored is
+        published, so in-process caches drop what they read before.
+
+        Args:
+            backup_path: Backup file to restore
+            progress: Optional callback(pages_done, pages_total)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not os.path.exists(backup_path) or not self.verify(backup_path):
+            print(f"Refusing to restore unverified backup: {backup_path}")
+            return False
+        try:
+            source = sqlite3.connect(f"file:{quote(backup_path)}?mode=ro", uri=True)
+            target = self.db.get_connection()
+            try:
+                # A restore must not interleave with writers
+                source.backup(target, progress=(lambda s, r, t: progress(t - r, t)) if progress else None)
+            finally:
+                target.close()
+                source.close()
+            # The live database may be an in-memory one, so check it through a connection
+            with self.db.read_connection() as conn:
+                restored = self._integrity_ok(conn)
+        except sqlite3.Error as e:
+            print(f"Restore error: {e}")
+            return False
+        # Every user's data may have changed, whatever the check says
+        get_event_bus().publish(DatabaseRestored(ALL_USERS, backup_path))
+        return restored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Back up and restore the MindfulBalance database.")
+    parser.add_argument("--dir", default=None, help="backup directory (default: data/backups)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="take a verified hot backup")
+    create.add_argument("--keep", type=int, default=7, help="generations to keep")
+    create.add_argument("--pages", type=int, default=256, help="pages copied per step")
+    create.add_argument("--sleep", type=float, default=0.01, help="seconds to sleep between steps")
+    commands.add_parser("list", help="list backups")
+    restore = commands.add_parser("restore", help="restore the database from a backup")
+    restore.add_argument("path", help="backup file to restore")
+    args = parser.parse_args(argv)
+
+    if args.command == "create":
+        manager = BackupManager(args.dir, args.keep, args.pages, args.sleep)
+        path = manager.create_backup()
+        print(f"Backup written to {path}" if path else "Backup failed")
+    elif args.command == "list":
+        for backup in BackupManager(args.dir).list_backups():
+            print(f"{backup['created']:%Y-%m-%d %H:%M:%S}  {backup['size']:>12}  {backup['path']}")
+    elif args.command == "restore":
+        ok = BackupManager(args.dir).restore(args.path)
+        print("Restore complete" if ok else "Restore failed")
+
+if __name__ == "__main__":
+    main()
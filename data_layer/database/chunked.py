@@ -0,0 +1,41 @@
+# data_layer/database/chunked.py
+from typing import Iterator, Sequence
+import sqlite3
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 4096
+
+def read_chunks(conn: sqlite3.Connection, query: str, params: Sequence = (),
+                dtype=None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Run a query and yield its rows as blocks of a NumPy structured array.
+
+    Rows are fetched with fetchmany(chunk_size) into one preallocated
+    buffer that is reused for every block, so memory stays bounded by the
+    chunk size however many rows the query returns. A yielded block is only
+    valid until the next one is requested; copy it to keep it.
+
+    Args:
+        conn: Open connection (kept open while iterating)
+        query: SELECT whose columns match `dtype` in order; must not return NULLs
+        params: Query parameters
+        dtype: Structured dtype, e.g. [('day', 'i8'), ('mood_level', 'i2')]
+        chunk_size: Rows per block
+
+    Yields:
+        Structured arrays of at most chunk_size rows
+    """
+    buffer = np.empty(max(1, chunk_size), dtype=np.dtype(dtype))
+    cursor = conn.cursor()
+    cursor.row_factory = None  # Plain tuples convert straight into the buffer
+    cursor.execute(query, params)
+    try:
+        while True:
+            rows = cursor.fetchmany(buffer.size)
+            if not rows:
+                break
+            block = buffer[:len(rows)]
+            block[:] = rows
+            yield block
+    finally:
+        cursor.close()
@@ -1,33 +1,205 @@
 # data_layer/database/connection.py
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import quote
+from data_layer import settings
+
+# Read snapshots opened by read_snapshot(), keyed by database path per thread
+_snapshot_state = threading.local()
+
+# Synced tables: primary key and the columns whose changes are replicated
+SYNCED_TABLES = {
+    "mood_logs": ("mood_id", ("mood_level", "notes", "timestamp")),
+    "journal_entries": ("entry_id", ("content", "timestamp")),
+}
+
+# Private in-memory database shared by all connections of the process
+MEMORY_DATABASE = "file::memory:?cache=shared"
+
+# Database files whose schema has been set up by this process
+_initialized_paths = set()
+_initialize_lock = threading.Lock()
+
+# One open connection per in-memory database; SQLite drops it when the last one closes
+_memory_keepers = {}
+
+# Whether each initialized database enforces one mood entry per user and day
+_one_mood_per_day = {}
+
+# Operator command that merges repeated entries before the mode can be enforced
+ONE_MOOD_PER_DAY_MIGRATION = "python -m business_layer.services.one_mood_per_day migrate"
+
+def is_uri(db_path: str) -> bool:
+    return db_path.startswith("file:")
+
+def is_memory(db_path: str) -> bool:
+    """True for in-memory targets (file::memory:... or a URI with mode=memory)."""
+    return db_path == ":memory:" or db_path.startswith("file::memory:") or "mode=memory" in db_path
+
+def open_read_only(db_path: str):
+    """Open a read-only connection to an existing database (no schema setup)."""
+    if is_memory(db_path):
+        # Shared-cache memory databases have table locks instead of WAL;
+        # reading uncommitted data keeps readers from blocking on writers
+        conn = sqlite3.connect(db_path, uri=True)
+        conn.execute("PRAGMA read_uncommitted = ON")
+    elif is_uri(db_path):
+        conn = sqlite3.connect(f"{db_path}{'&' if '?' in db_path else '?'}mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(f"file:{quote(db_path)}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only = ON")
+    return conn
 
 class DatabaseConnection:
     """Handles SQLite database connections and basic operations."""
     
-    def __init__(self):
-        # Create data directory in the project root
-        self.project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        self.data_dir = os.path.join(self.project_root, "data")
-        os.makedirs(self.data_dir, exist_ok=True)
-        
-        # Set database file path
-        self.db_path = os.path.join(self.data_dir, "mindfulbalance.db")
+    def __init__(self, db_path: str = None):
+        self.project_root = settings.PROJECT_ROOT
+        self.data_dir = settings.DATA_DIR
+
+        # Database target: settings.DATABASE unless given (file path or SQLite URI)
+        self.db_path = db_path or settings.DATABASE
+        if self.db_path == ":memory:":
+            # A plain :memory: database is private to one connection
+            self.db_path = MEMORY_DATABASE
+        self.in_memory = is_memory(self.db_path)
         
-        # Initialize database if it doesn't exist
-        self.initialize_database()
+        # Initialize database if it doesn't exist (once per process)
+        self.ensure_initialized()
+
+    @property
+    def one_mood_per_day(self) -> bool:
+        """
+        True when one-mood-per-day mode is on and enforced by the unique
+        (user_id, log_date) index; False while repeated entries still exist.
+        """
+        return _one_mood_per_day.get(self.db_path, False)
 
     def get_connection(self):
         """Create a connection to the SQLite database with row factory"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=is_uri(self.db_path))
         conn.row_factory = sqlite3.Row  # This enables column access by name
         return conn
 
+    def get_read_connection(self):
+        """
+        Create a read-only connection to the SQLite database.
+
+        The connection is opened through a ``file:...?mode=ro`` URI, so it can
+        never take the write lock. With the database in WAL mode it reads
+        alongside writers instead of blocking them.
+        """
+        return open_read_only(self.db_path)
+
+    @contextmanager
+    def read_connection(self):
+        """
+        Yield a connection for a read-only query.
+
+        Inside read_snapshot() the snapshot connection is reused, so every
+        read in the block sees the same data. Otherwise a short-lived
+        read-only connection is opened and closed around the query.
+        """
+        snapshots = getattr(_snapshot_state, 'connections', {})
+        conn = snapshots.get(self.db_path)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self.get_read_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Run a group of reads against one consistent snapshot.
+
+        Opens a read-only connection with a deferred transaction; SQLite pins
+        the WAL snapshot at the first SELECT and keeps it until the block
+        exits. (In-memory databases have no WAL, so there the reads are not
+        isolated from concurrent writers.) Any read_connection() call from the same thread, through any
+        DatabaseConnection for this file, joins the snapshot. Nested calls
+        reuse the outer snapshot.
+        """
+        if not hasattr(_snapshot_state, 'connections'):
+            _snapshot_state.connections = {}
+        snapshots = _snapshot_state.connections
+
+        if self.db_path in snapshots:
+            yield snapshots[self.db_path]
+            return
+
+        conn = self.get_read_connection()
+        conn.execute("BEGIN")
+        snapshots[self.db_path] = conn
+        try:
+            yield conn
+        finally:
+            del snapshots[self.db_path]
+            conn.rollback()
+            conn.close()
+
+    @contextmanager
+    def write_transaction(self):
+        """
+        Yield a connection inside a BEGIN IMMEDIATE transaction.
+
+        The write lock is taken up front, so reads made in the block cannot
+        be invalidated by another process before the commit. Commits when
+        the block exits normally and rolls back if it raises.
+        """
+        conn = self.get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def ensure_initialized(self):
+        """
+        Run initialize_database() the first time this process opens the file.
+
+        DAOs and services each create a DatabaseConnection; only the first
+        one for a given path pays for the schema DDL. The directory of a
+        database file is created here, and an in-memory database gets a
+        connection that keeps it alive for the rest of the process.
+        """
+        if self.db_path in _initialized_paths:
+            return
+        with _initialize_lock:
+            if self.db_path not in _initialized_paths:
+                if self.in_memory:
+                    _memory_keepers[self.db_path] = sqlite3.connect(
+                        self.db_path, uri=True, check_same_thread=False
+                    )
+                elif not is_uri(self.db_path):
+                    directory = os.path.dirname(os.path.abspath(self.db_path))
+                    os.makedirs(directory, exist_ok=True)
+                self.initialize_database()
+                _initialized_paths.add(self.db_path)
+
     def initialize_database(self):
         """Initialize the database with required tables"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        # Free pages can be reclaimed in small steps (PRAGMA incremental_vacuum).
+        # Only takes effect on a new database; see RetentionManager for existing ones.
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+        # WAL lets read-only connections run while log_mood is writing
+        cursor.execute("PRAGMA journal_mode = WAL")
+
         # Create users table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS users (
@@ -51,6 +223,26 @@ class DatabaseConnection:
             )
         """)
 
+        # Per-user history lookups (dashboard, history, stats windows)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_mood_logs_user_timestamp
+            ON mood_logs (user_id, timestamp)
+        """)
+
+        # Local calendar day of each entry, for per-day lookups
+        if self._add_column_if_missing(cursor, "mood_logs", "log_date", "TEXT"):
+            cursor.execute("UPDATE mood_logs SET log_date = date(timestamp, 'localtime')")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_mood_logs_log_date
+            AFTER INSERT ON mood_logs
+            WHEN NEW.log_date IS NULL
+            BEGIN
+                UPDATE mood_logs SET log_date = date(NEW.timestamp, 'localtime')
+                WHERE mood_id = NEW.mood_id;
+            END
+        """)
+        _one_mood_per_day[self.db_path] = self._index_mood_log_days(cursor)
+
         # Create journal_entries table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS journal_entries (
@@ -61,6 +253,10 @@ class DatabaseConnection:
                 FOREIGN KEY (user_id) REFERENCES users (user_id)
             )
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_journal_entries_user_timestamp
+            ON journal_entries (user_id, timestamp)
+        """)
 
         # Create coping_strategies table
         cursor.execute("""
@@ -71,10 +267,265 @@ class DatabaseConnection:
                 category TEXT
             )
         """)
+        # Mood band a strategy applies to (NULL bounds = any mood)
+        self._add_column_if_missing(cursor, "coping_strategies", "min_level", "INTEGER")
+        self._add_column_if_missing(cursor, "coping_strategies", "max_level", "INTEGER")
+
+        # Mood entries compacted by the retention policy: a per-day histogram
+        # of mood levels (day is the local log_date), so counts, means,
+        # variance, percentiles and streaks stay exact after compaction
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS mood_daily_summaries (
+                user_id INTEGER NOT NULL,
+                day DATE NOT NULL,
+                mood_level INTEGER NOT NULL,
+                entries INTEGER NOT NULL,
+                noted_entries INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, day, mood_level),
+                FOREIGN KEY (user_id) REFERENCES users (user_id)
+            ) WITHOUT ROWID
+        """)
+
+        # Incrementally maintained per-user wellness state (see WellnessService)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_wellness_state (
+                user_id INTEGER PRIMARY KEY,
+                wellness_score REAL NOT NULL DEFAULT 0,
+                entry_count INTEGER NOT NULL DEFAULT 0,
+                mean REAL NOT NULL DEFAULT 0,
+                m2 REAL NOT NULL DEFAULT 0,
+                current_streak INTEGER NOT NULL DEFAULT 0,
+                best_streak INTEGER NOT NULL DEFAULT 0,
+                last_log_date DATE,
+                last_mood_id INTEGER,
+                last_mood_level INTEGER,
+                last_zscore REAL,
+                is_anomaly INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (user_id) REFERENCES users (user_id)
+            )
+        """)
+
+        # Materialized results of the population analytics job
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS population_daily_stats (
+                day DATE PRIMARY KEY,
+                active_users INTEGER NOT NULL,
+                engagement_rate REAL NOT NULL,
+                entries INTEGER NOT NULL,
+                average_mood REAL,
+                journal_entries INTEGER NOT NULL,
+                journaling_rate REAL NOT NULL,
+                computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS population_mood_distribution (
+                mood_level INTEGER PRIMARY KEY,
+                entries INTEGER NOT NULL,
+                share REAL NOT NULL,
+                computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Daily check-in reminder settings (see ReminderService). remind_at is
+        # local 'HH:MM'; utc_offset is minutes east of UTC for the user's day.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reminder_preferences (
+                user_id INTEGER PRIMARY KEY,
+                remind_at TEXT NOT NULL DEFAULT '20:00',
+                utc_offset INTEGER NOT NULL DEFAULT 0,
+                enabled INTEGER NOT NULL DEFAULT 1,
+                last_sent_date DATE,
+                FOREIGN KEY (user_id) REFERENCES users (user_id)
+            )
+        """)
+
+        # Remembered logins (see SessionService). Only a SHA-256 of each token
+        # is stored; expires_at is Unix seconds and slides forward on use.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                token_hash TEXT PRIMARY KEY,
+                user_id INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at INTEGER NOT NULL,
+                FOREIGN KEY (user_id) REFERENCES users (user_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sessions_user
+            ON sessions (user_id)
+        """)
+
+        # Change tracking for delta sync (see data_layer.sync)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        cursor.execute("""
+            INSERT OR IGNORE INTO sync_state (key, value)
+            VALUES ('device_id', lower(hex(randomblob(16))))
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_changes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                table_name TEXT NOT NULL,
+                row_uuid TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                op TEXT NOT NULL CHECK(op IN ('upsert', 'delete')),
+                row_version INTEGER,
+                updated_at TEXT,
+                updated_by TEXT
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_sync_changes_user_seq
+            ON sync_changes (user_id, seq)
+        """)
+        for table, (key, columns) in SYNCED_TABLES.items():
+            self._add_sync_tracking(cursor, table, key, columns)
 
         conn.commit()
         conn.close()
 
+    def _add_column_if_missing(self, cursor, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table (for databases created by older versions)."""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            return True
+        return False
+
+    def _add_sync_tracking(self, cursor, table: str, key: str, columns):
+        """
+        Give a table row identities and versions and log its changes.
+
+        Every row gets a global row_uuid and a row_version that local writes
+        increment; updated_at/updated_by break ties between equal versions.
+        Triggers append each local insert, update or delete to sync_changes.
+        Rows applied by the sync engine already carry their uuid and version,
+        so the triggers leave them alone.
+        """
+        stamp = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+        device = "(SELECT value FROM sync_state WHERE key = 'device_id')"
+
+        added = self._add_column_if_missing(cursor, table, "row_uuid", "TEXT")
+        self._add_column_if_missing(cursor, table, "row_version", "INTEGER")
+        self._add_column_if_missing(cursor, table, "updated_at", "TEXT")
+        self._add_column_if_missing(cursor, table, "updated_by", "TEXT")
+        if added:
+            # Existing history is queued for the first push
+            cursor.execute(f"""
+                UPDATE {table}
+                SET row_uuid = lower(hex(randomblob(16))), row_version = 1,
+                    updated_at = {stamp}, updated_by = {device}
+            """)
+            cursor.execute(f"""
+                INSERT INTO sync_changes (table_name, row_uuid, user_id, op)
+                SELECT '{table}', row_uuid, user_id, 'upsert' FROM {table} ORDER BY {key}
+            """)
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_row_uuid ON {table} (row_uuid)")
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_insert
+            AFTER INSERT ON {table}
+            WHEN NEW.row_uuid IS NULL
+            BEGIN
+                UPDATE {table}
+                SET row_uuid = lower(hex(randomblob(16))), row_version = 1,
+                    updated_at = {stamp}, updated_by = {device}
+                WHERE {key} = NEW.{key};
+                INSERT INTO sync_changes (table_name, row_uuid, user_id, op)
+                SELECT '{table}', row_uuid, user_id, 'upsert' FROM {table} WHERE {key} = NEW.{key};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_update
+            AFTER UPDATE OF {', '.join(columns)} ON {table}
+            WHEN NEW.row_version IS OLD.row_version AND NEW.updated_at IS OLD.updated_at
+            BEGIN
+                UPDATE {table}
+                SET row_version = OLD.row_version + 1, updated_at = {stamp}, updated_by = {device}
+                WHERE {key} = NEW.{key};
+                INSERT INTO sync_changes (table_name, row_uuid, user_id, op)
+                VALUES ('{table}', NEW.row_uuid, NEW.user_id, 'upsert');
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_delete
+            AFTER DELETE ON {table}
+            WHEN OLD.row_uuid IS NOT NULL
+            BEGIN
+                INSERT INTO sync_changes (table_name, row_uuid, user_id, op, row_version, updated_at, updated_by)
+                VALUES ('{table}', OLD.row_uuid, OLD.user_id, 'delete', OLD.row_version + 1, {stamp}, {device});
+            END
+        """)
+
+    def _index_mood_log_days(self, cursor) -> bool:
+        """
+        Index mood_logs by (user_id, log_date), unique in one-mood-per-day mode.
+
+        Mood history is never deleted here. If users already have several
+        entries on a day, the index stays non-unique, the mode stays off and
+        the operator is told to run the explicit migration, which backs up
+        the database before merging them.
+
+        Returns:
+            True if the unique index is in place
+        """
+        unique = settings.ONE_MOOD_PER_DAY
+        cursor.execute("PRAGMA index_list(mood_logs)")
+        existing = {row[1]: bool(row[2]) for row in cursor.fetchall()}
+        if unique and not existing.get("idx_mood_logs_user_day"):
+            repeated = self.count_repeated_mood_days(cursor)
+            if repeated:
+                print(f"One-mood-per-day mode is not active: {repeated} user day(s) have several "
+                      f"mood entries. Back up and merge them with: {ONE_MOOD_PER_DAY_MIGRATION}")
+                unique = False
+        if existing.get("idx_mood_logs_user_day") == unique:
+            return unique
+        cursor.execute("DROP INDEX IF EXISTS idx_mood_logs_user_day")
+        cursor.execute(f"""
+            CREATE {'UNIQUE ' if unique else ''}INDEX idx_mood_logs_user_day
+            ON mood_logs (user_id, log_date)
+        """)
+        return unique
+
+    @staticmethod
+    def count_repeated_mood_days(cursor) -> int:
+        """Number of (user, local day) pairs with more than one mood entry."""
+        cursor.execute("""
+            SELECT COUNT(*) FROM (
+                SELECT 1 FROM mood_logs GROUP BY user_id, log_date HAVING COUNT(*) > 1
+            )
+        """)
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def create_unique_mood_day_index(cursor):
+        """
+        Replace the (user_id, log_date) index with the unique one.
+
+        Raises sqlite3.IntegrityError if repeated entries remain. Run it in
+        the caller's write transaction, then refresh_one_mood_per_day().
+        """
+        cursor.execute("DROP INDEX IF EXISTS idx_mood_logs_user_day")
+        cursor.execute("CREATE UNIQUE INDEX idx_mood_logs_user_day ON mood_logs (user_id, log_date)")
+
+    def refresh_one_mood_per_day(self) -> bool:
+        """
+        Re-check whether one-mood-per-day mode is enforced, e.g. after a
+        migration in this process. Other running processes pick the unique
+        index up on restart.
+        """
+        with self.read_connection() as conn:
+            indexes = {row[1]: bool(row[2]) for row in conn.execute("PRAGMA index_list(mood_logs)")}
+        enforced = settings.ONE_MOOD_PER_DAY and indexes.get("idx_mood_logs_user_day", False)
+        _one_mood_per_day[self.db_path] = enforced
+        return enforced
+
     def test_connection(self):
         """Test the database connection and print the location"""
         try:
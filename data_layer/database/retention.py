@@ -0,0 +1,226 @@
+# data_layer/database/retention.py
+"""
+Retention policy for mood history.
+
+Raw mood_logs rows older than the retention window are folded into per-day
+mood level counts in mood_daily_summaries and deleted, a bounded batch per
+transaction. The statistics, analytics report, population job and wellness
+rebuild read the summaries together with the raw rows, so compacted history
+still counts everywhere except in the hour-of-day profile.
+Freed pages are returned to the file system with PRAGMA incremental_vacuum,
+a few pages at a time, so maintenance can run in idle time without long
+write locks.
+
+Run from the project root:
+
+    python -m data_layer.database.retention run [--days 365]
+    python -m data_layer.database.retention idle [--budget 0.2] [--interval 60]
+    python -m data_layer.database.retention enable-incremental-vacuum
+"""
+import argparse
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Any
+from data_layer.database.connection import DatabaseConnection
+from data_layer.events import HistoryCompacted, get_event_bus
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+@dataclass
+class RetentionPolicy:
+    """How much raw history to keep and how much work to do per step."""
+
+    raw_days: int = 365  # Raw entries older than this are compacted
+    batch_size: int = 500  # Rows compacted per transaction
+    vacuum_pages: int = 100  # Pages reclaimed per incremental_vacuum step
+
+class RetentionManager:
+    """Compacts old mood entries into daily summaries and reclaims free pages."""
+
+    def __init__(self, policy: RetentionPolicy = None):
+        self.db = DatabaseConnection()
+        self.events = get_event_bus()
+        self.policy = policy or RetentionPolicy()
+
+    def compact_batch(self) -> int:
+        """
+        Compact one batch of raw entries older than the retention window.
+
+        The batch is counted into mood_daily_summaries per local day and mood
+        level (merging with existing counts) and deleted in a single
+        transaction. Entries with changes still waiting to be pushed are left
+        alone until the sync engine has sent them. A HistoryCompacted event
+        is published per affected user after the commit.
+
+        Returns:
+            Number of raw entries compacted (0 when nothing is left)
+        """
+        conn = self.db.get_connection()
+        try:
+            with conn:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS retention_batch (mood_id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM temp.retention_batch")
+                # Rows are appended chronologically, so the oldest sit at the start of the rowid order
+                cursor = conn.execute(
+                    """INSERT INTO temp.retention_batch (mood_id)
+                       SELECT mood_id FROM mood_logs
+                       WHERE timestamp < datetime('now', ?)
+                         AND row_uuid NOT IN (SELECT row_uuid FROM sync_changes WHERE table_name = 'mood_logs')
+                       ORDER BY mood_id
+                       LIMIT ?""",
+                    (f"-{int(self.policy.raw_days)} days", self.policy.batch_size)
+                )
+                compacted = cursor.rowcount
+                if compacted <= 0:
+                    return 0
+
+                per_user = conn.execute(
+                    """SELECT user_id, COUNT(*) FROM mood_logs
+                       WHERE mood_id IN (SELECT mood_id FROM temp.retention_batch)
+                       GROUP BY user_id"""
+                ).fetchall()
+                conn.execute(
+                    """INSERT INTO mood_daily_summaries (user_id, day, mood_level, entries, noted_entries)
+                       SELECT user_id, COALESCE(log_date, date(timestamp, 'localtime')) AS day, mood_level,
+                              COUNT(*), SUM(CASE WHEN TRIM(COALESCE(notes, '')) <> '' THEN 1 ELSE 0 END)
+                       FROM mood_logs
+                       WHERE mood_id IN (SELECT mood_id FROM temp.retention_batch)
+                       GROUP BY user_id, day, mood_level
+                       ON CONFLICT (user_id, day, mood_level) DO UPDATE SET
+                           entries = entries + excluded.entries,
+                           noted_entries = noted_entries + excluded.noted_entries"""
+                )
+                # Compaction is local housekeeping: keep the deletes out of the
+                # sync change log. Rows with unpushed changes were skipped above,
+                # so every compacted row is already on the server.
+                last_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sync_changes").fetchone()[0]
+                conn.execute("DELETE FROM mood_logs WHERE mood_id IN (SELECT mood_id FROM temp.retention_batch)")
+                conn.execute("DELETE FROM sync_changes WHERE seq > ? AND op = 'delete'", (last_seq,))
+        except sqlite3.Error as e:
+            print(f"Retention error: {e}")
+            return 0
+        finally:
+            conn.close()
+
+        for user_id, entries in per_user:
+            self.events.publish(HistoryCompacted(user_id, entries))
+        return compacted
+
+    def reclaim(self, pages: int = None) -> int:
+        """
+        Return up to `pages` free pages to the file system.
+
+        Returns:
+            Number of free pages left afterwards
+        """
+        conn = self.db.get_connection()
+        try:
+            conn.execute(f"PRAGMA incremental_vacuum({int(pages or self.policy.vacuum_pages)})").fetchall()
+            return conn.execute("PRAGMA freelist_count").fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Retention error: {e}")
+            return 0
+        finally:
+            conn.close()
+
+    def run_idle_step(self, budget_seconds: float = 0.2) -> Dict[str, Any]:
+        """
+        Do as much compaction and page reclaiming as fits in a time budget.
+
+        Each unit of work is one bounded transaction, so a step never holds
+        the write lock for long and can be called whenever the app is idle.
+
+        Returns:
+            Dictionary with compacted rows, free pages left and whether work remains
+        """
+        deadline = time.monotonic() + budget_seconds
+        compacted = 0
+        batch = 1
+        while batch and time.monotonic() < deadline:
+            batch = self.compact_batch()
+            compacted += batch
+
+        free_pages = self.reclaim() if self.incremental_vacuum_enabled() else 0
+        while free_pages and time.monotonic() < deadline:
+            free_pages = self.reclaim()
+
+        return {
+            'compacted': compacted,
+            'free_pages': free_pages,
+            'pending': bool(batch) or bool(free_pages)
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Apply the policy to completion, batch by batch."""
+        compacted = 0
+        batch = self.compact_batch()
+        while batch:
+            compacted += batch
+            batch = self.compact_batch()
+
+        free_pages = self.reclaim() if self.incremental_vacuum_enabled() else 0
+        while free_pages:
+            before = free_pages
+            free_pages = self.reclaim()
+            if free_pages >= before:
+                break
+        return {'compacted': compacted, 'free_pages': free_pages}
+
+    def incremental_vacuum_enabled(self) -> bool:
+        """Check whether the database file uses auto_vacuum=INCREMENTAL."""
+        with self.db.read_connection() as conn:
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Switch an existing database to auto_vacuum=INCREMENTAL.
+
+        Databases created before the setting existed need one full VACUUM to
+        change modes. This rewrites the whole file, so run it in a maintenance
+        window; afterwards all reclaiming is incremental.
+
+        Returns:
+            True if the database now uses incremental auto-vacuum
+        """
+        if self.incremental_vacuum_enabled():
+            return True
+        conn = self.db.get_connection()
+        try:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        except sqlite3.Error as e:
+            print(f"Retention error: {e}")
+        finally:
+            conn.close()
+        return self.incremental_vacuum_enabled()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply the mood history retention policy.")
+    parser.add_argument("--days", type=int, default=RetentionPolicy.raw_days, help="days of raw entries to keep")
+    parser.add_argument("--batch-size", type=int, default=RetentionPolicy.batch_size, help="rows per transaction")
+    parser.add_argument("--vacuum-pages", type=int, default=RetentionPolicy.vacuum_pages, help="pages per vacuum step")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("run", help="compact and reclaim until done")
+    idle = commands.add_parser("idle", help="run small maintenance steps in a loop")
+    idle.add_argument("--budget", type=float, default=0.2, help="seconds of work per step")
+    idle.add_argument("--interval", type=float, default=60, help="seconds between steps")
+    commands.add_parser("enable-incremental-vacuum", help="convert an existing database (full VACUUM)")
+    args = parser.parse_args(argv)
+
+    manager = RetentionManager(RetentionPolicy(args.days, args.batch_size, args.vacuum_pages))
+    if args.command == "run":
+        result = manager.run()
+        print(f"Compacted {result['compacted']} entries; {result['free_pages']} free pages left")
+    elif args.command == "idle":
+        while True:
+            result = manager.run_idle_step(args.budget)
+            if result['compacted']:
+                print(f"Compacted {result['compacted']} entries; {result['free_pages']} free pages left")
+            time.sleep(0 if result['pending'] else args.interval)
+    elif args.command == "enable-incremental-vacuum":
+        ok = manager.enable_incremental_vacuum()
+        print("Incremental auto-vacuum enabled" if ok else "Could not enable incremental auto-vacuum")
+
+if __name__ == "__main__":
+    main()
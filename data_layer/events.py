@@ -0,0 +1,193 @@
+# data_layer/events.py
+"""
+In-process publish/subscribe for data changes.
+
+The DAOs publish an event after each successful commit. Subscribers choose
+how they are called:
+
+- "sync": inline on the writing thread, before the DAO call returns. Use for
+  cheap bookkeeping that must be current when the write returns.
+- "async": on a single background worker, in publish order. With
+  coalesce=True, events that arrive while an earlier one is still waiting
+  are merged per user, so a burst of writes runs the handler once with the
+  latest event.
+
+    bus = get_event_bus()
+    subscription = bus.subscribe((MoodLogged, MoodUpdated), refresh, delivery="async", coalesce=True)
+    ...
+    subscription.cancel()
+
+A failing handler is reported and skipped; it never fails the write.
+
+Events belong to one user, except DatabaseRestored, which carries ALL_USERS
+and means every cached read is stale.
+"""
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+@dataclass(frozen=True)
+class DataEvent:
+    """Base class of all change events; an event belongs to one user (or ALL_USERS)."""
+    user_id: int
+
+@dataclass(frozen=True)
+class UserRegistered(DataEvent):
+    username: str
+
+@dataclass(frozen=True)
+class MoodLogged(DataEvent):
+    mood_id: int
+    mood_level: int
+    log_date: str
+
+@dataclass(frozen=True)
+class MoodUpdated(DataEvent):
+    mood_id: int
+    mood_level: int
+    previous_level: Optional[int] = None
+
+@dataclass(frozen=True)
+class MoodDeleted(DataEvent):
+    mood_id: int
+
+@dataclass(frozen=True)
+class JournalSaved(DataEvent):
+    entry_id: int
+
+@dataclass(frozen=True)
+class SyncApplied(DataEvent):
+    """Remote rows were applied by the sync engine; counts are per table."""
+    counts: Dict[str, int] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class HistoryCompacted(DataEvent):
+    """Old raw mood entries were folded into daily summaries by the retention policy."""
+    entries: int
+
+# user_id of events that affect every user
+ALL_USERS = 0
+
+@dataclass(frozen=True)
+class DatabaseRestored(DataEvent):
+    """The live database was replaced with the contents of a backup (user_id is ALL_USERS)."""
+    backup_path: str
+
+EventTypes = Union[Type[DataEvent], Tuple[Type[DataEvent], ...]]
+
+class Subscription:
+    """A handler registered for one or more event types."""
+
+    def __init__(self, bus: "EventBus", event_types: Tuple[Type[DataEvent], ...],
+                 handler: Callable[[Any], None], delivery: str, coalesce: bool):
+        self.bus = bus
+        self.event_types = event_types
+        self.handler = handler
+        self.delivery = delivery
+        self.coalesce = coalesce
+        self.active = True
+        # Latest waiting event per user (coalescing subscriptions only)
+        self._pending: Dict[int, DataEvent] = {}
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Stop delivering events to this handler, including queued ones."""
+        self.active = False
+        self.bus._remove(self)
+
+class EventBus:
+    """Typed publish/subscribe with sync and queued async delivery."""
+
+    def __init__(self):
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[Subscription, int, Optional[DataEvent]]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+
+    def subscribe(self, event_types: EventTypes, handler: Callable[[Any], None],
+                  delivery: str = "sync", coalesce: bool = False) -> Subscription:
+        """
+        Register a handler for an event type or a tuple of types (subclasses included).
+
+        Args:
+            event_types: Event class or tuple of event classes
+            handler: Called with the event
+            delivery: "sync" (inline) or "async" (background worker)
+            coalesce: Merge waiting async events per user, keeping the latest
+
+        Returns:
+            Subscription; call cancel() to unsubscribe
+        """
+        if delivery not in ("sync", "async"):
+            raise ValueError(f"Unknown delivery mode: {delivery}")
+        if coalesce and delivery != "async":
+            raise ValueError("Only async subscriptions can coalesce")
+        if not isinstance(event_types, tuple):
+            event_types = (event_types,)
+        subscription = Subscription(self, event_types, handler, delivery, coalesce)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def _remove(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def publish(self, event: DataEvent):
+        """Deliver an event to its subscribers. Call only after the change is committed."""
+        for subscription in self._subscriptions:  # Copy-on-write list, safe to iterate
+            if not isinstance(event, subscription.event_types):
+                continue
+            if subscription.delivery == "sync":
+                self._call(subscription, event)
+            elif subscription.coalesce:
+                with subscription._lock:
+                    waiting = event.user_id in subscription._pending
+                    subscription._pending[event.user_id] = event
+                if not waiting:
+                    self._enqueue(subscription, event.user_id, None)
+            else:
+                self._enqueue(subscription, event.user_id, event)
+
+    def _enqueue(self, subscription: Subscription, user_id: int, event: Optional[DataEvent]):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name="event-bus", daemon=True)
+                    self._worker.start()
+        self._queue.put((subscription, user_id, event))
+
+    def _run(self):
+        while True:
+            subscription, user_id, event = self._queue.get()
+            try:
+                if event is None:
+                    with subscription._lock:
+                        event = subscription._pending.pop(user_id, None)
+                if event is not None and subscription.active:
+                    self._call(subscription, event)
+            finally:
+                self._queue.task_done()
+
+    def _call(self, subscription: Subscription, event: DataEvent):
+        try:
+            subscription.handler(event)
+        except Exception as e:
+            print(f"Event handler error ({type(event).__name__}): {e}")
+
+    def flush(self):
+        """Block until every queued async event has been handled."""
+        self._queue.join()
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+def get_event_bus() -> EventBus:
+    """Return the process-wide event bus, creating it on first use."""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
@@ -0,0 +1,58 @@
+# data_layer/settings.py
+"""
+Per-deployment settings, read from MINDFULBALANCE_* environment variables.
+
+Variables can also be put in a .env file in the project root; values already
+set in the environment take precedence.
+"""
+import os
+from dotenv import load_dotenv
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean environment variable ('1', 'true', 'yes', 'on')."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def env_float(name: str, default: float) -> float:
+    """Read a numeric environment variable, falling back to default if unset or invalid."""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+# Directory for the database file, backups and caches (created on first use, not on import)
+DATA_DIR = os.environ.get("MINDFULBALANCE_DATA_DIR") or os.path.join(PROJECT_ROOT, "data")
+
+# Database: a file path, a SQLite URI, or file::memory:?cache=shared for a
+# private in-memory database shared by every connection in the process
+DATABASE = os.environ.get("MINDFULBALANCE_DATABASE") or os.path.join(DATA_DIR, "mindfulbalance.db")
+
+# Keep at most one mood entry per user per local day; repeat taps update it in place
+ONE_MOOD_PER_DAY = env_flag("MINDFULBALANCE_ONE_MOOD_PER_DAY")
+
+# Per-user read cache in front of MoodDAO: maximum entries (0 disables it) and lifetime in seconds
+MOOD_CACHE_SIZE = int(env_float("MINDFULBALANCE_MOOD_CACHE_SIZE", 2048))
+MOOD_CACHE_TTL = env_float("MINDFULBALANCE_MOOD_CACHE_TTL", 300)
+
+# Remote tips: endpoint (unset = bundled tips only), cache lifetime and request timeout in seconds
+TIP_API_URL = os.environ.get("MINDFULBALANCE_TIP_API_URL") or None
+TIP_CACHE_TTL = env_float("MINDFULBALANCE_TIP_CACHE_TTL", 6 * 60 * 60)
+TIP_API_TIMEOUT = env_float("MINDFULBALANCE_TIP_API_TIMEOUT", 3.0)
+TIP_CACHE_PATH = os.environ.get("MINDFULBALANCE_TIP_CACHE_PATH") or os.path.join(DATA_DIR, "tip_cache.json")
+
+# Bearer token of the account synced by HttpSyncTransport (issued by the sync server)
+SYNC_TOKEN = os.environ.get("MINDFULBALANCE_SYNC_TOKEN") or None
+
+# bcrypt work factor for stored passwords (each +1 doubles the hashing time)
+BCRYPT_ROUNDS = int(env_float("MINDFULBALANCE_BCRYPT_ROUNDS", 12))
+
+# Remembered logins: lifetime in seconds since last use, and how often use renews it
+SESSION_TTL = env_float("MINDFULBALANCE_SESSION_TTL", 30 * 24 * 60 * 60)
+SESSION_RENEW_INTERVAL = env_float("MINDFULBALANCE_SESSION_RENEW_INTERVAL", 24 * 60 * 60)
+# Expired sessions are deleted on login, at most once per interval (seconds)
+SESSION_PURGE_INTERVAL = env_float("MINDFULBALANCE_SESSION_PURGE_INTERVAL", 60 * 60)
@@ -0,0 +1,293 @@
+# data_layer/sync/engine.py
+"""
+Offline-first delta sync of mood and journal rows.
+
+Local writes are captured by triggers into sync_changes (see
+DatabaseConnection._add_sync_tracking). push() sends the rows changed since
+the last push in gzip-compressed batches and drops the acknowledged log
+entries; pull() fetches rows changed on the server since the stored cursor.
+Both sides resolve conflicts with last-writer-wins on
+(row_version, updated_at, updated_by), so the work done is proportional to
+the number of changed rows, not the size of the database.
+
+Rows are exchanged per account (the username), since local user ids differ
+between devices. HttpSyncTransport authenticates with the account's bearer
+token (MINDFULBALANCE_SYNC_TOKEN by default).
+"""
+import gzip
+import json
+import sqlite3
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from data_layer import settings
+from data_layer.database.connection import DatabaseConnection, SYNCED_TABLES
+from data_layer.events import SyncApplied, get_event_bus
+
+# Columns sent for each synced table, besides the row identity and version
+PAYLOAD_COLUMNS = {
+    "mood_logs": ("mood_level", "notes", "timestamp", "log_date"),
+    "journal_entries": ("content", "timestamp"),
+}
+
+def row_clock(change: Dict[str, Any]) -> Tuple[int, str, str]:
+    """Ordering key for last-writer-wins: higher wins."""
+    return (int(change["row_version"] or 0), change["updated_at"] or "", change["updated_by"] or "")
+
+class HttpSyncTransport:
+    """Talks to a sync server over HTTP with gzip-compressed JSON bodies."""
+
+    def __init__(self, base_url: str, token: Optional[str] = None, timeout: float = 10.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        token = token if token is not None else settings.SYNC_TOKEN
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            data=body,
+            headers={
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+                "Accept-Encoding": "gzip"
+            },
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def push(self, account: str, device_id: str, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self._post(f"/accounts/{account}/push", {"device_id": device_id, "changes": changes})
+
+    def pull(self, account: str, device_id: str, cursor: int, limit: int) -> Dict[str, Any]:
+        return self._post(f"/accounts/{account}/pull", {"device_id": device_id, "cursor": cursor, "limit": limit})
+
+# Derived-state update run in a pull transaction that applied mood rows: (conn, user_id)
+OnMoodsApplied = Callable[[sqlite3.Connection, int], None]
+
+class SyncEngine:
+    """Pushes local changes and pulls remote ones for one user at a time."""
+
+    def __init__(self, transport, batch_size: int = 500, on_moods_applied: Optional[OnMoodsApplied] = None):
+        self.db = DatabaseConnection()
+        self.events = get_event_bus()
+        self.transport = transport
+        self.batch_size = max(1, batch_size)
+        self.on_moods_applied = on_moods_applied
+
+    def _get_state(self, conn: sqlite3.Connection, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: Any):
+        conn.execute(
+            "INSERT INTO sync_state (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, str(value))
+        )
+
+    def device_id(self) -> str:
+        with self.db.read_connection() as conn:
+            return self._get_state(conn, "device_id")
+
+    def pending_changes(self, user_id: int) -> int:
+        """Number of logged local changes not pushed yet."""
+        with self.db.read_connection() as conn:
+            return conn.execute("SELECT COUNT(*) FROM sync_changes WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+    def _next_batch(self, conn: sqlite3.Connection, user_id: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Collect the next batch of changes for a user, coalesced per row.
+
+        Returns:
+            Tuple of (highest log seq covered, changes); seq 0 when nothing is pending
+        """
+        seqs = conn.execute(
+            "SELECT seq FROM sync_changes WHERE user_id = ? ORDER BY seq LIMIT ?",
+            (user_id, self.batch_size)
+        ).fetchall()
+        if not seqs:
+            return 0, []
+        cutoff = seqs[-1]["seq"]
+
+        # Only the latest logged change of each row matters
+        latest = conn.execute(
+            """SELECT c.* FROM sync_changes c
+               JOIN (SELECT MAX(seq) AS seq FROM sync_changes
+                     WHERE user_id = ? AND seq <= ?
+                     GROUP BY table_name, row_uuid) last ON last.seq = c.seq
+               ORDER BY c.seq""",
+            (user_id, cutoff)
+        ).fetchall()
+
+        changes = []
+        for change in latest:
+            table = change["table_name"]
+            if change["op"] == "delete":
+                changes.append({
+                    "table": table, "row_uuid": change["row_uuid"], "deleted": True,
+                    "row_version": change["row_version"], "updated_at": change["updated_at"],
+                    "updated_by": change["updated_by"], "data": None
+                })
+                continue
+            columns = PAYLOAD_COLUMNS[table]
+            row = conn.execute(
+                f"SELECT row_uuid, row_version, updated_at, updated_by, {', '.join(columns)} "
+                f"FROM {table} WHERE row_uuid = ?",
+                (change["row_uuid"],)
+            ).fetchone()
+            if row is None:
+                # Deleted later; the delete is logged after the cutoff. Retention
+                # never compacts rows with pending changes, so nothing is lost here
+                continue
+            changes.append({
+                "table": table, "row_uuid": row["row_uuid"], "deleted": False,
+                "row_version": row["row_version"], "updated_at": row["updated_at"],
+                "updated_by": row["updated_by"], "data": {column: row[column] for column in columns}
+            })
+        return cutoff, changes
+
+    def push(self, user_id: int, account: str) -> int:
+        """
+        Send the user's pending changes to the server in batches.
+
+        Returns:
+            Number of row changes sent
+        """
+        device_id = self.device_id()
+        sent = 0
+        while True:
+            with self.db.read_connection() as conn:
+                cutoff, changes = self._next_batch(conn, user_id)
+            if not cutoff:
+                return sent
+            if changes:
+                self.transport.push(account, device_id, changes)
+                sent += len(changes)
+            # Acknowledged: later writes have higher seqs and stay queued
+            with self.db.get_connection() as conn:
+                conn.execute("DELETE FROM sync_changes WHERE user_id = ? AND seq <= ?", (user_id, cutoff))
+                self._set_state(conn, f"push_seq:{user_id}", cutoff)
+            conn.close()
+
+    def _apply(self, conn: sqlite3.Connection, user_id: int, change: Dict[str, Any]) -> bool:
+        """Apply one remote change with last-writer-wins. Returns True if it was applied."""
+        table = change["table"]
+        key, _ = SYNCED_TABLES[table]
+        columns = PAYLOAD_COLUMNS[table]
+        local = conn.execute(
+            f"SELECT {key}, row_version, updated_at, updated_by FROM {table} WHERE row_uuid = ?",
+            (change["row_uuid"],)
+        ).fetchone()
+        if local is not None and row_clock(dict(local)) >= row_clock(change):
+            return False
+
+        if change["deleted"]:
+            if local is not None:
+                conn.execute(f"DELETE FROM {table} WHERE {key} = ?", (local[key],))
+            return local is not None
+
+        data = change["data"]
+        clock = (change["row_version"], change["updated_at"], change["updated_by"])
+        if local is not None:
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            conn.execute(
+                f"UPDATE {table} SET {assignments}, row_version = ?, updated_at = ?, updated_by = ? "
+                f"WHERE {key} = ?",
+                (*[data[column] for column in columns], *clock, local[key])
+            )
+            return True
+
+        try:
+            conn.execute(
+                f"INSERT INTO {table} (user_id, {', '.join(columns)}, row_uuid, row_version, updated_at, updated_by) "
+                f"VALUES (?, {', '.join('?' for _ in columns)}, ?, ?, ?, ?)",
+                (user_id, *[data[column] for column in columns], change["row_uuid"], *clock)
+            )
+            return True
+        except sqlite3.IntegrityError:
+            # One-mood-per-day mode: another device logged the same day
+            if table != "mood_logs":
+                raise
+            return self._resolve_same_day(conn, user_id, change)
+
+    def _resolve_same_day(self, conn: sqlite3.Connection, user_id: int, change: Dict[str, Any]) -> bool:
+        """Keep the newer of two entries for the same day; the loser is deleted everywhere."""
+        local = conn.execute(
+            "SELECT mood_id, row_uuid, row_version, updated_at, updated_by FROM mood_logs "
+            "WHERE user_id = ? AND log_date = ?",
+            (user_id, change["data"]["log_date"])
+        ).fetchone()
+        if row_clock(dict(local)) >= row_clock(change):
+            # Tombstone the remote entry so the server drops it too
+            conn.execute(
+                "INSERT INTO sync_changes (table_name, row_uuid, user_id, op, row_version, updated_at, updated_by) "
+                "VALUES ('mood_logs', ?, ?, 'delete', ?, strftime('%Y-%m-%dT%H:%M:%fZ', 'now'), "
+                "(SELECT value FROM sync_state WHERE key = 'device_id'))",
+                (change["row_uuid"], user_id, int(change["row_version"]) + 1)
+            )
+            return False
+        conn.execute("DELETE FROM mood_logs WHERE mood_id = ?", (local["mood_id"],))
+        return self._apply(conn, user_id, change)
+
+    def pull(self, user_id: int, account: str) -> Dict[str, int]:
+        """
+        Fetch and apply the server's changes since the stored cursor.
+
+        Each batch is applied in one transaction; when it changed mood rows,
+        on_moods_applied runs in that transaction too, so derived state
+        never misses another device's entries.
+
+        Returns:
+            Dictionary with 'received', 'applied' and per-table applied counts
+        """
+        device_id = self.device_id()
+        cursor_key = f"pull_cursor:{user_id}"
+        with self.db.read_connection() as conn:
+            cursor = int(self._get_state(conn, cursor_key, "0"))
+
+        result = {"received": 0, "applied": 0, **{table: 0 for table in SYNCED_TABLES}}
+        while True:
+            response = self.transport.pull(account, device_id, cursor, self.batch_size)
+            changes = response.get("changes", [])
+            conn = self.db.get_connection()
+            try:
+                with conn:
+                    # Changes logged by the triggers while applying remote rows are not ours to push
+                    start_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sync_changes").fetchone()[0]
+                    applied_uuids = []
+                    moods_applied = False
+                    for change in changes:
+                        if change["table"] in SYNCED_TABLES and self._apply(conn, user_id, change):
+                            applied_uuids.append(change["row_uuid"])
+                            result[change["table"]] += 1
+                            moods_applied = moods_applied or change["table"] == "mood_logs"
+                    if moods_applied and self.on_moods_applied:
+                        self.on_moods_applied(conn, user_id)
+                    conn.executemany(
+                        "DELETE FROM sync_changes WHERE seq > ? AND row_uuid = ?",
+                        [(start_seq, row_uuid) for row_uuid in applied_uuids]
+                    )
+                    cursor = int(response.get("cursor", cursor))
+                    self._set_state(conn, cursor_key, cursor)
+            finally:
+                conn.close()
+            result["received"] += len(changes)
+            result["applied"] += len(applied_uuids)
+            if not response.get("more"):
+                break
+        if result["applied"]:
+            self.events.publish(SyncApplied(user_id, {table: result[table] for table in SYNCED_TABLES}))
+        return result
+
+    def sync(self, user_id: int, account: str) -> Dict[str, int]:
+        """Push local changes, then pull remote ones."""
+        pushed = self.push(user_id, account)
+        result = self.pull(user_id, account)
+        result["pushed"] = pushed
+        return result
@@ -0,0 +1,251 @@
+# data_layer/sync/server.py
+"""
+Stand-in sync server for development and tests.
+
+Keeps the latest version of every synced row per account in its own SQLite
+file, resolves pushes with the same last-writer-wins rule as the client and
+serves pulls by a per-account change sequence. Deleted rows are kept as
+tombstones so they replicate like any other change.
+
+Every request must carry the account's token as "Authorization: Bearer
+<token>"; a token only opens its own account. Only SHA-256 hashes of the
+tokens are stored. Run from the project root, giving each account a token
+(a random one is generated and printed when omitted):
+
+    python -m data_layer.sync.server [--port 8765] [--db data/sync_server.db] --account alice[=TOKEN]
+
+SyncStore has the same push/pull interface as HttpSyncTransport, so tests can
+hand it to SyncEngine directly without HTTP.
+"""
+import argparse
+import gzip
+import hashlib
+import hmac
+import json
+import re
+import secrets
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from data_layer.sync.engine import row_clock
+
+class SyncStore:
+    """Server-side row store with a per-account change sequence."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS rows (
+                    account TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    row_uuid TEXT NOT NULL,
+                    row_version INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL,
+                    updated_by TEXT NOT NULL,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    data TEXT,
+                    server_seq INTEGER NOT NULL,
+                    PRIMARY KEY (account, table_name, row_uuid)
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_rows_account_seq ON rows (account, server_seq)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS accounts (
+                    account TEXT PRIMARY KEY,
+                    last_seq INTEGER NOT NULL DEFAULT 0,
+                    token_hash TEXT
+                )
+            """)
+            columns = [row["name"] for row in self.conn.execute("PRAGMA table_info(accounts)")]
+            if "token_hash" not in columns:
+                self.conn.execute("ALTER TABLE accounts ADD COLUMN token_hash TEXT")
+
+    @staticmethod
+    def _hash_token(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def set_token(self, account: str, token: Optional[str] = None) -> str:
+        """
+        Set the bearer token of an account, creating the account if needed.
+
+        Args:
+            account: Account name (the username)
+            token: Token to accept; a random one is generated if omitted
+
+        Returns:
+            The token, to hand to the account's devices
+        """
+        token = token or secrets.token_urlsafe(32)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO accounts (account, token_hash) VALUES (?, ?) "
+                "ON CONFLICT (account) DO UPDATE SET token_hash = excluded.token_hash",
+                (account, self._hash_token(token))
+            )
+        return token
+
+    def is_authorized(self, account: str, token: Optional[str]) -> bool:
+        """True if `token` is the bearer token of `account`."""
+        if not token:
+            return False
+        with self._lock:
+            row = self.conn.execute("SELECT token_hash FROM accounts WHERE account = ?", (account,)).fetchone()
+        if row is None or row["token_hash"] is None:
+            return False
+        return hmac.compare_digest(row["token_hash"], self._hash_token(token))
+
+    def _last_seq(self, account: str) -> int:
+        row = self.conn.execute("SELECT last_seq FROM accounts WHERE account = ?", (account,)).fetchone()
+        return row["last_seq"] if row else 0
+
+    def push(self, account: str, device_id: str, changes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Store the changes that are newer than the server's copy."""
+        accepted = 0
+        with self._lock, self.conn:
+            seq = self._last_seq(account)
+            for change in changes:
+                current = self.conn.execute(
+                    "SELECT row_version, updated_at, updated_by FROM rows "
+                    "WHERE account = ? AND table_name = ? AND row_uuid = ?",
+                    (account, change["table"], change["row_uuid"])
+                ).fetchone()
+                if current is not None and row_clock(dict(current)) >= row_clock(change):
+                    continue
+                seq += 1
+                self.conn.execute(
+                    """INSERT INTO rows (account, table_name, row_uuid, row_version, updated_at,
+                                         updated_by, deleted, data, server_seq)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (account, table_name, row_uuid) DO UPDATE SET
+                           row_version = excluded.row_version,
+                           updated_at = excluded.updated_at,
+                           updated_by = excluded.updated_by,
+                           deleted = excluded.deleted,
+                           data = excluded.data,
+                           server_seq = excluded.server_seq""",
+                    (account, change["table"], change["row_uuid"], change["row_version"],
+                     change["updated_at"], change["updated_by"], int(bool(change["deleted"])),
+                     json.dumps(change["data"]) if change["data"] is not None else None, seq)
+                )
+                accepted += 1
+            self.conn.execute(
+                "INSERT INTO accounts (account, last_seq) VALUES (?, ?) "
+                "ON CONFLICT (account) DO UPDATE SET last_seq = excluded.last_seq",
+                (account, seq)
+            )
+        return {"accepted": accepted, "rejected": len(changes) - accepted, "cursor": seq}
+
+    def pull(self, account: str, device_id: str, cursor: int, limit: int) -> Dict[str, Any]:
+        """Return rows changed after `cursor` by other devices, oldest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                """SELECT * FROM rows
+                   WHERE account = ? AND server_seq > ? AND updated_by != ?
+                   ORDER BY server_seq
+                   LIMIT ?""",
+                (account, cursor, device_id, limit + 1)
+            ).fetchall()
+            more = len(rows) > limit
+            rows = rows[:limit]
+            # With nothing left to send, skip past this device's own changes
+            next_cursor = rows[-1]["server_seq"] if more else self._last_seq(account)
+        return {
+            "changes": [{
+                "table": row["table_name"],
+                "row_uuid": row["row_uuid"],
+                "row_version": row["row_version"],
+                "updated_at": row["updated_at"],
+                "updated_by": row["updated_by"],
+                "deleted": bool(row["deleted"]),
+                "data": json.loads(row["data"]) if row["data"] is not None else None
+            } for row in rows],
+            "cursor": max(cursor, next_cursor),
+            "more": more
+        }
+
+ROUTE = re.compile(r"^/accounts/([^/]+)/(push|pull)$")
+
+def make_handler(store: SyncStore):
+    """Build a request handler class serving `store`."""
+
+    class SyncRequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            match = ROUTE.match(self.path)
+            if not match:
+                self.send_error(404)
+                return
+            account, action = match.groups()
+            authorization = self.headers.get("Authorization", "")
+            token = authorization[len("Bearer "):] if authorization.startswith("Bearer ") else None
+            if not store.is_authorized(account, token):
+                self.send_response(401)
+                self.send_header("WWW-Authenticate", 'Bearer realm="mindfulbalance-sync"')
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            try:
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.headers.get("Content-Encoding") == "gzip":
+                    body = gzip.decompress(body)
+                request = json.loads(body)
+                if action == "push":
+                    result = store.push(account, request["device_id"], request["changes"])
+                else:
+                    result = store.pull(account, request["device_id"], int(request["cursor"]), int(request["limit"]))
+            except (ValueError, KeyError, OSError) as e:
+                self.send_error(400, str(e))
+                return
+
+            payload = json.dumps(result, separators=(",", ":")).encode("utf-8")
+            compress = "gzip" in self.headers.get("Accept-Encoding", "")
+            if compress:
+                payload = gzip.compress(payload)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return SyncRequestHandler
+
+def serve(host: str = "127.0.0.1", port: int = 8765, db_path: str = ":memory:",
+          store: Optional[SyncStore] = None) -> ThreadingHTTPServer:
+    """Create (but do not start) an HTTP server for a SyncStore."""
+    return ThreadingHTTPServer((host, port), make_handler(store or SyncStore(db_path)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the stand-in MindfulBalance sync server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=":memory:", help="server database file (default: in memory)")
+    parser.add_argument("--account", action="append", default=[], metavar="NAME[=TOKEN]",
+                        help="set an account's token; a random one is printed if omitted (repeatable)")
+    args = parser.parse_args(argv)
+
+    store = SyncStore(args.db)
+    for spec in args.account:
+        account, _, token = spec.partition("=")
+        token = store.set_token(account, token or None)
+        print(f"Token for account '{account}': {token}")
+
+    server = serve(args.host, args.port, store=store)
+    print(f"Sync server listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
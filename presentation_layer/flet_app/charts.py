@@ -0,0 +1,139 @@
+# presentation_layer/flet_app/charts.py
+import threading
+from dataclasses import dataclass
+from datetime import date
+from io import BytesIO
+from typing import Dict, List, Tuple
+
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.transforms import blended_transform_factory
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Output settings for a rendered chart."""
+
+    name: str
+    format: str = "png"
+    dpi: int = 150
+    figsize: Tuple[float, float] = (12, 10)
+
+RENDER_PROFILES = {
+    "thumbnail": RenderProfile("thumbnail", "png", 50, (12, 10)),
+    "full": RenderProfile("full", "png", 150, (12, 10)),
+    "svg": RenderProfile("svg", "svg", 72, (12, 10)),
+}
+
+MOOD_LABELS = {1: 'Terrible', 3: 'Bad', 5: 'Okay', 7: 'Good', 10: 'Excellent'}
+
+class MoodChartRenderer:
+    """
+    Renders the analytics dashboard with matplotlib's object-oriented API.
+
+    Nothing goes through pyplot: each thread keeps its own pre-styled Figure
+    per figure size, draws the data onto it, renders through FigureCanvasAgg
+    and then removes the data artists again so the template is reused.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _template(self, figsize: Tuple[float, float]):
+        """Return this thread's styled figure and axes for a figure size."""
+        templates: Dict = self._local.__dict__.setdefault('templates', {})
+        if figsize not in templates:
+            templates[figsize] = self._build_template(figsize)
+        return templates[figsize]
+
+    def _build_template(self, figsize: Tuple[float, float]):
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+        ax1, ax2, ax3 = fig.subplots(3, 1)
+        fig.subplots_adjust(left=0.07, right=0.98, top=0.92, bottom=0.07, hspace=0.55)
+
+        ax1.set_title('Mood Trends Over Time', fontweight='bold')
+        ax1.set_ylabel('Mood Level (1-10)')
+        ax1.grid(True, alpha=0.3)
+        ax1.set_ylim(0, 11)
+        # Reference lines and labels pinned to the left edge of the axes
+        label_transform = blended_transform_factory(ax1.transAxes, ax1.transData)
+        for level, label in MOOD_LABELS.items():
+            ax1.axhline(y=level, color='gray', linestyle='--', alpha=0.3)
+            ax1.text(0.005, level, label, fontsize=8, alpha=0.7, transform=label_transform)
+
+        ax2.set_title('Journaling Frequency', fontweight='bold')
+        ax2.set_ylabel('Journal Entries')
+
+        ax3.set_title('Wellness Score (7-day Average)', fontweight='bold')
+        ax3.set_ylabel('Wellness Score')
+        ax3.set_ylim(0, 11)
+
+        for ax in (ax1, ax2, ax3):
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
+            ax.xaxis.set_major_locator(mdates.AutoDateLocator(minticks=3, maxticks=10))
+            ax.tick_params(axis='x', labelrotation=45)
+
+        return fig, (ax1, ax2, ax3)
+
+    def render_mood_dashboard(self, title: str, dates: List[date], mood_levels: List[int],
+                              journal_counts: Dict[date, int], wellness_dates: List[date],
+                              wellness_scores: List[float], profile: str = "full") -> bytes:
+        """
+        Render the three-panel mood dashboard.
+
+        Args:
+            title: Figure title
+            dates: Entry dates for the mood trend
+            mood_levels: Mood levels matching dates
+            journal_counts: Journal entries per date
+            wellness_dates: Dates of the wellness scores
+            wellness_scores: Wellness scores matching wellness_dates
+            profile: Key of RENDER_PROFILES
+
+        Returns:
+            Encoded image bytes (PNG or SVG)
+        """
+        settings = RENDER_PROFILES[profile]
+        fig, (ax1, ax2, ax3) = self._template(settings.figsize)
+        added = []
+        try:
+            fig.suptitle(title, fontsize=16, fontweight='bold')
+
+            added.extend(ax1.plot(dates, mood_levels, marker='o', linestyle='-',
+                                  linewidth=2, markersize=6, color='#2E86AB'))
+
+            if journal_counts:
+                added.append(ax2.bar(list(journal_counts.keys()), list(journal_counts.values()),
+                                     color='#A23B72', alpha=0.7))
+            else:
+                added.append(ax2.text(0.5, 0.5, 'No journal entries available',
+                                      transform=ax2.transAxes, ha='center', va='center', fontsize=12))
+
+            if wellness_scores:
+                added.append(ax3.fill_between(wellness_dates, wellness_scores, alpha=0.3, color='#F18F01'))
+                added.extend(ax3.plot(wellness_dates, wellness_scores, color='#F18F01', linewidth=2))
+            else:
+                added.append(ax3.text(0.5, 0.5, 'Need at least 7 mood entries for wellness score',
+                                      transform=ax3.transAxes, ha='center', va='center', fontsize=12))
+
+            # Shared date range with half a day of padding on both sides
+            if dates:
+                start, end = mdates.date2num(min(dates)), mdates.date2num(max(dates))
+                for ax in (ax1, ax2, ax3):
+                    ax.set_xlim(start - 0.5, end + 0.5)
+            ax2.relim()
+            ax2.autoscale_view(scalex=False)
+
+            buffer = BytesIO()
+            fig.savefig(buffer, format=settings.format, dpi=settings.dpi)
+            return buffer.getvalue()
+        finally:
+            for artist in added:
+                artist.remove()
+
+_renderer = MoodChartRenderer()
+
+def get_chart_renderer() -> MoodChartRenderer:
+    """Return the shared chart renderer."""
+    return _renderer
@@ -1,10 +1,7 @@
 # presentation_layer/flet_app/main.py
 import os
 import sys
-import matplotlib
-import matplotlib.pyplot as plt
-matplotlib.use('Agg')
-import matplotlib.dates as mdates
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import numpy as np
 
@@ -13,27 +10,61 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
 sys.path.append(project_root)
 
 import flet as ft
-from business_layer.services.user_service import UserService
-from business_layer.services.mood_service import MoodService
-from data_layer.database.connection import DatabaseConnection
-from io import BytesIO
+from business_layer.services.container import ServiceContainer, get_services
+from business_layer.models.mood import Mood
+from data_layer.events import JournalSaved, MoodDeleted, MoodLogged, MoodUpdated, SyncApplied, get_event_bus
+from presentation_layer.flet_app.charts import get_chart_renderer
+from presentation_layer.flet_app import native_charts
+from presentation_layer.flet_app.view_state import ViewState
 import base64
 
+# Dashboard data is read off the UI thread; shared by all sessions
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard-prefetch")
+
+# Client storage key of the remembered-login token
+SESSION_STORAGE_KEY = "mindfulbalance.session_token"
+
+def card(content: ft.Control, padding: int = 40) -> ft.Container:
+    """White rounded card used by every screen."""
+    return ft.Container(
+        content=content,
+        padding=padding,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=10,
+        shadow=ft.BoxShadow(
+            spread_radius=1,
+            blur_radius=15,
+            color=ft.Colors.BLUE_GREY_300,
+            offset=ft.Offset(0, 0)
+        )
+    )
+
 class LoginApp:
     """Main Flet application for user authentication."""
-    
-    def __init__(self):
-        self.user_service = UserService()
-        self.mood_service = MoodService()
+
+    def __init__(self, services: ServiceContainer = None):
+        # Services are shared by all sessions; everything set below is per session
+        services = services or get_services()
+        self.user_service = services.user_service
+        self.mood_service = services.mood_service
+        self.journal_service = services.journal_service
+        self.tip_provider = services.tip_provider
+        self.session_service = services.session_service
         self.current_user = None
+        self.session_token = None  # Remembered-login token of this client
+        self.view = None  # ViewState, created once the page exists
         self.average_mood_text = ft.Text("0.0", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_600)
         self.total_entries_text = ft.Text("0", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN_600)
+        self.today_mood_text = ft.Text("Not logged", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.AMBER_700)
+        self.wellness_text = ft.Text("0.0", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.ORANGE_700)
+        self.streak_text = ft.Text("", size=12, color=ft.Colors.GREY_600)
+        self.recent_moods_row = ft.Row([], alignment=ft.MainAxisAlignment.CENTER, spacing=10)
+        self.welcome_text = ft.Text("", size=24, weight=ft.FontWeight.BOLD, color=ft.Colors.BLUE_700)
+        self.success_text = ft.Text("", size=16, color=ft.Colors.GREEN_600, text_align=ft.TextAlign.CENTER)
+        self.dashboard_future = None  # Pending DashboardSnapshot for the current user
+        self.data_subscription = None  # Event bus subscription for the current user's changes
         self.latest_journal = ""  # <-- Add this line
         self.last_mood_level = None  # Track last mood selected
-        
-        # Initialize databaseeeeeee
-        db = DatabaseConnection()
-        db.initialize_database()
 
     def main(self, page: ft.Page):
         page.title = "MindfulBalance"
@@ -43,219 +74,144 @@ class LoginApp:
         page.window_resizable = False
         page.vertical_alignment = ft.MainAxisAlignment.CENTER
         page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-        
-        # Show welcome screen initially
-        self.show_welcome_screen(page)
+        self.view = ViewState(page)
+        page.on_close = lambda e: self.stop_watching_user_data()
+
+        # Returning users go straight to the dashboard; others see the welcome screen
+        user = self.restore_session(page)
+        if user:
+            self.start_user_session(page, user)
+        else:
+            self.show_welcome_screen(page)
 
     def create_mood_plots(self, page: ft.Page):
         """Create and display mood trend plots using matplotlib."""
         if not self.current_user:
             return
 
-        try:
-            print("Starting to create mood plots...")  # Debug
-            
-            # Get mood history for the last 30 days
-            mood_history = self.mood_service.get_user_mood_history(self.current_user.user_id, 30)
-            print(f"Retrieved {len(mood_history)} mood entries")  # Debug
-
-            if not mood_history:
-                page.snack_bar = ft.SnackBar(
-                    content=ft.Text("No mood data available for plotting"),
-                    bgcolor=ft.Colors.ORANGE_600
-                )
-                page.snack_bar.open = True
-                page.update()
-                return
-
-            # Prepare data for plotting
-            dates = []
-            mood_levels = []
-            journal_counts = {}
-
-            for mood in mood_history:
-                if mood.timestamp:
-                    # Handle different timestamp formats
-                    if isinstance(mood.timestamp, str):
-                        try:
-                            timestamp = datetime.fromisoformat(mood.timestamp)
-                        except:
-                            timestamp = datetime.strptime(mood.timestamp, '%Y-%m-%d %H:%M:%S')
-                    else:
-                        timestamp = mood.timestamp
-                    
-                    date = timestamp.date()
-                    dates.append(date)
-                    mood_levels.append(mood.mood_level)
-
-                    # Count journal entries (notes)
-                    if mood.notes and mood.notes.strip():
-                        journal_counts[date] = journal_counts.get(date, 0) + 1
-
-            if not dates:
-                page.snack_bar = ft.SnackBar(
-                    content=ft.Text("No valid mood data for plotting"),
-                    bgcolor=ft.Colors.ORANGE_600
-                )
-                page.snack_bar.open = True
-                page.update()
-                return
-
-            print(f"Processed {len(dates)} data points for plotting")  # Debug
-
-            # Create the plots
-            plt.style.use('default')  # Ensure we're using default style
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10))
-            fig.suptitle(f'Mental Health Dashboard - {self.current_user.username}', fontsize=16, fontweight='bold')
-
-            # Plot 1: Mood Trends
-            ax1.plot(dates, mood_levels, marker='o', linestyle='-', linewidth=2, markersize=6, color='#2E86AB')
-            ax1.set_title('Mood Trends Over Time', fontweight='bold')
-            ax1.set_ylabel('Mood Level (1-10)')
-            ax1.grid(True, alpha=0.3)
-            ax1.set_ylim(0, 11)
-
-            # Add mood level labels
-            mood_labels = {1: 'Terrible', 3: 'Bad', 5: 'Okay', 7: 'Good', 10: 'Excellent'}
-            for level, label in mood_labels.items():
-                ax1.axhline(y=level, color='gray', linestyle='--', alpha=0.3)
-                ax1.text(min(dates), level, label, fontsize=8, alpha=0.7)
-
-            # Plot 2: Journaling Frequency
-            if journal_counts:
-                journal_dates = list(journal_counts.keys())
-                journal_freq = list(journal_counts.values())
-                ax2.bar(journal_dates, journal_freq, color='#A23B72', alpha=0.7)
-                ax2.set_title('Journaling Frequency', fontweight='bold')
-                ax2.set_ylabel('Journal Entries')
-            else:
-                ax2.text(0.5, 0.5, 'No journal entries available', 
-                        transform=ax2.transAxes, ha='center', va='center', fontsize=12)
-                ax2.set_title('Journaling Frequency', fontweight='bold')
-                ax2.set_ylabel('Journal Entries')
-
-            # Plot 3: Wellness Score (7-day rolling average)
-            if len(mood_levels) >= 7:
+        with self.view.batch():
+            try:
+                print("Starting to create mood plots...")  # Debug
+
+                # Get mood history for the last 30 days
+                mood_history = self.mood_service.get_user_mood_history(self.current_user.user_id, 30)
+                print(f"Retrieved {len(mood_history)} mood entries")  # Debug
+
+                if not mood_history:
+                    self.view.notify("No mood data available for plotting", ft.Colors.ORANGE_600)
+                    return
+
+                # Prepare data for plotting
+                dates = []
+                mood_levels = []
+                journal_counts = {}
+
+                for mood in mood_history:
+                    if mood.timestamp:
+                        # Handle different timestamp formats
+                        if isinstance(mood.timestamp, str):
+                            try:
+                                timestamp = datetime.fromisoformat(mood.timestamp)
+                            except:
+                                timestamp = datetime.strptime(mood.timestamp, '%Y-%m-%d %H:%M:%S')
+                        else:
+                            timestamp = mood.timestamp
+
+                        date = timestamp.date()
+                        dates.append(date)
+                        mood_levels.append(mood.mood_level)
+
+                        # Count journal entries (notes)
+                        if mood.notes and mood.notes.strip():
+                            journal_counts[date] = journal_counts.get(date, 0) + 1
+
+                if not dates:
+                    self.view.notify("No valid mood data for plotting", ft.Colors.ORANGE_600)
+                    return
+
+                print(f"Processed {len(dates)} data points for plotting")  # Debug
+
+                # Plot 3: Wellness Score (7-day rolling average)
                 wellness_scores = []
                 wellness_dates = []
+                if len(mood_levels) >= 7:
+                    for i in range(6, len(mood_levels)):
+                        window_moods = mood_levels[i-6:i+1]
+                        wellness_scores.append(sum(window_moods) / len(window_moods))
+                        wellness_dates.append(dates[i])
+
+                # Render with the shared object-oriented renderer (no pyplot state)
+                image = get_chart_renderer().render_mood_dashboard(
+                    f'Mental Health Dashboard - {self.current_user.username}',
+                    dates, mood_levels, journal_counts, wellness_dates, wellness_scores,
+                    profile="full"
+                )
 
-                for i in range(6, len(mood_levels)):
-                    window_moods = mood_levels[i-6:i+1]
-                    wellness_score = sum(window_moods) / len(window_moods)
-                    wellness_scores.append(wellness_score)
-                    wellness_dates.append(dates[i])
-
-                ax3.fill_between(wellness_dates, wellness_scores, alpha=0.3, color='#F18F01')
-                ax3.plot(wellness_dates, wellness_scores, color='#F18F01', linewidth=2)
-                ax3.set_title('Wellness Score (7-day Average)', fontweight='bold')
-                ax3.set_ylabel('Wellness Score')
-                ax3.set_ylim(0, 11)
-            else:
-                ax3.text(0.5, 0.5, 'Need at least 7 mood entries for wellness score', 
-                        transform=ax3.transAxes, ha='center', va='center', fontsize=12)
-                ax3.set_title('Wellness Score (7-day Average)', fontweight='bold')
-                ax3.set_ylabel('Wellness Score')
-
-            # Format x-axis for all plots
-            for ax in [ax1, ax2, ax3]:
-                if len(dates) > 1:
-                    ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-                    ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, len(dates)//10)))
-                    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-
-            plt.tight_layout()
-
-            # Save plot as image
-            plot_dir = os.path.dirname(__file__)
-            plot_path = os.path.join(plot_dir, 'mood_plot.png')
-            print(f"Saving plot to: {plot_path}")  # Debug
-            
-            plt.savefig(plot_path, dpi=150, bbox_inches='tight')
-            plt.close()  # Close to free memory
-
-            print("Plot saved successfully, showing dialog...")  # Debug
-
-            # Show a nice popup dialog
-            def close_dialog(e):
-                page.dialog.open = False
-                page.update()
-
-            dialog = ft.AlertDialog(
-                title=ft.Text("Analytics Created!", size=18, weight=ft.FontWeight.BOLD),
-                content=ft.Text(
-                    "Successfully created a Matplotlib graph! You can view it in the app or check your local folder for 'mood_plot.png'.",
-                    size=16,
-                    color=ft.Colors.BLUE_700
-                ),
-                actions=[ft.TextButton("OK", on_click=close_dialog)],
-                open=True
-            )
-            page.dialog = dialog
-            if dialog not in page.controls:
-                page.controls.append(dialog)
-            page.update()
+                print("Plot rendered, showing dialog...")  # Debug
 
-            # Optionally, still show the plot in-app as before:
-            self.show_plot_dialog(page, plot_path)
+                # Keep the image in memory so concurrent sessions never share a file
+                self.view.notify("Successfully created a Matplotlib graph!", ft.Colors.BLUE_600)
+                self.show_plot_dialog(page, image)
 
-        except Exception as e:
-            print(f"Error creating plots: {str(e)}")  # Debug
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"Error creating plots: {str(e)}"),
-                bgcolor=ft.Colors.RED_600
-            )
-            page.snack_bar.open = True
-            page.update()
+            except Exception as e:
+                print(f"Error creating plots: {str(e)}")  # Debug
+                self.view.notify(f"Error creating plots: {str(e)}", ft.Colors.RED_600)
 
-    def show_plot_dialog(self, page: ft.Page, plot_path: str):
-        """Display the matplotlib plot in a dialog."""
+    def show_plot_dialog(self, page: ft.Page, image: bytes):
+        """Display the rendered matplotlib plot (PNG bytes) in a dialog."""
         try:
-            print(f"Showing plot dialog for: {plot_path}")  # Debug
-
-            # Check if file exists
-            if not os.path.exists(plot_path):
-                raise FileNotFoundError(f"Plot file not found: {plot_path}")
+            print(f"Showing plot dialog ({len(image)} bytes)")  # Debug
 
             plot_image = ft.Image(
-                src=plot_path,
+                src_base64=base64.b64encode(image).decode('ascii'),
                 width=800,
                 height=600,
                 fit=ft.ImageFit.CONTAIN
             )
 
-            def close_plot(e):
-                page.dialog.open = False
-                page.update()
-
-            dialog = ft.AlertDialog(
-                title=ft.Text("Your Mental Health Analytics", size=18, weight=ft.FontWeight.BOLD),
-                content=ft.Container(
+            self.view.show_dialog(
+                ft.Text("Your Mental Health Analytics", size=18, weight=ft.FontWeight.BOLD),
+                ft.Container(
                     content=plot_image,
                     width=800,
                     height=600
-                ),
-                actions=[
-                    ft.TextButton("Close", on_click=close_plot)
-                ],
-                open=True
+                )
             )
 
-            page.dialog = dialog
-            page.update()
-
         except Exception as e:
             print(f"Error displaying plot: {str(e)}")  # Debug
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(f"Error displaying plot: {str(e)}"),
-                bgcolor=ft.Colors.RED_600
+            self.view.notify(f"Error displaying plot: {str(e)}", ft.Colors.RED_600)
+
+    def show_native_analytics(self, page: ft.Page):
+        """Display the full-history analytics with native, interactive Flet charts."""
+        if not self.current_user:
+            return
+
+        try:
+            report = self.mood_service.get_analytics_report(self.current_user.user_id)
+            if not report['total_entries']:
+                self.view.notify("No mood data available for plotting", ft.Colors.ORANGE_600)
+                return
+
+            self.view.show_dialog(
+                ft.Text("Your Mood Over Time", size=18, weight=ft.FontWeight.BOLD),
+                ft.Container(
+                    content=native_charts.analytics_view(report, width=760),
+                    width=800,
+                    height=600
+                )
             )
-            page.snack_bar.open = True
-            page.update()
+
+        except Exception as e:
+            print(f"Error displaying analytics: {str(e)}")  # Debug
+            self.view.notify(f"Error displaying analytics: {str(e)}", ft.Colors.RED_600)
 
     def show_welcome_screen(self, page: ft.Page):
         """Display the initial welcome screen"""
-        page.clean()
-        
+        self.view.navigate("welcome", lambda: self.build_welcome_screen(page))
+
+    def build_welcome_screen(self, page: ft.Page) -> ft.Control:
+        """Build the welcome screen (once per session)."""
         # Welcome title
         title = ft.Text(
             "Welcome to MindfulBalance",
@@ -263,13 +219,13 @@ class LoginApp:
             weight=ft.FontWeight.BOLD,
             color=ft.Colors.BLUE_700
         )
-        
+
         subtitle = ft.Text(
             "Your daily companion for mental wellness",
             size=16,
             color=ft.Colors.GREY_600
         )
-        
+
         # Login button
         login_btn = ft.ElevatedButton(
             "Sign In",
@@ -280,45 +236,38 @@ class LoginApp:
                 color=ft.Colors.WHITE
             )
         )
-        
+
         # Register button
         register_btn = ft.OutlinedButton(
             "Create Account",
             width=200,
             on_click=lambda e: self.show_register_page(page)
         )
-        
+
         # Layout
-        page.add(
-            ft.Container(
-                content=ft.Column([
-                    ft.Icon(ft.Icons.PSYCHOLOGY_ALT, size=100, color=ft.Colors.BLUE_600),
-                    ft.Container(height=20),
-                    title,
-                    subtitle,
-                    ft.Container(height=40),
-                    login_btn,
-                    ft.Container(height=10),
-                    register_btn,
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=40,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=10,
-                shadow=ft.BoxShadow(
-                    spread_radius=1,
-                    blur_radius=15,
-                    color=ft.Colors.BLUE_GREY_300,
-                    offset=ft.Offset(0, 0)
-                )
-            )
+        return card(
+            ft.Column([
+                ft.Icon(ft.Icons.PSYCHOLOGY_ALT, size=100, color=ft.Colors.BLUE_600),
+                ft.Container(height=20),
+                title,
+                subtitle,
+                ft.Container(height=40),
+                login_btn,
+                ft.Container(height=10),
+                register_btn,
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
         )
-        
-        page.update()
 
     def show_login_page(self, page: ft.Page):
         """Display the login page."""
-        page.clean()
-        
+        with self.view.batch():
+            self.view.navigate("login", lambda: self.build_login_page(page))
+            # The screen is reused; start from a clean form
+            self.password_field.value = ""
+            self.error_text.value = ""
+
+    def build_login_page(self, page: ft.Page) -> ft.Control:
+        """Build the login page (once per session)."""
         # Title
         title = ft.Text(
             "Welcome to MindfulBalance",
@@ -326,20 +275,20 @@ class LoginApp:
             weight=ft.FontWeight.BOLD,
             color=ft.Colors.BLUE_700
         )
-        
+
         subtitle = ft.Text(
             "Sign in to your account",
             size=14,
             color=ft.Colors.GREY_600
         )
-        
+
         # Input fields
         self.username_field = ft.TextField(
             label="Username or Email",
             width=300,
             prefix_icon=ft.Icons.PERSON
         )
-        
+
         self.password_field = ft.TextField(
             label="Password",
             width=300,
@@ -347,14 +296,14 @@ class LoginApp:
             can_reveal_password=True,
             prefix_icon=ft.Icons.LOCK
         )
-        
+
         # Error message display
         self.error_text = ft.Text(
             "",
             color=ft.Colors.RED_400,
             size=12
         )
-        
+
         # Login button
         login_btn = ft.ElevatedButton(
             "Sign In",
@@ -365,46 +314,41 @@ class LoginApp:
                 color=ft.Colors.WHITE
             )
         )
-        
+
         # Register link
         register_link = ft.TextButton(
             "Don't have an account? Sign up",
             on_click=lambda e: self.show_register_page(page),
             style=ft.ButtonStyle(color=ft.Colors.BLUE_600)
         )
-        
+
         # Layout
-        page.add(
-            ft.Container(
-                content=ft.Column([
-                    title,
-                    subtitle,
-                    ft.Container(height=20),
-                    self.username_field,
-                    self.password_field,
-                    self.error_text,
-                    ft.Container(height=10),
-                    login_btn,
-                    register_link
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=40,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=10,
-                shadow=ft.BoxShadow(
-                    spread_radius=1,
-                    blur_radius=15,
-                    color=ft.Colors.BLUE_GREY_300,
-                    offset=ft.Offset(0, 0)
-                )
-            )
+        return card(
+            ft.Column([
+                title,
+                subtitle,
+                ft.Container(height=20),
+                self.username_field,
+                self.password_field,
+                self.error_text,
+                ft.Container(height=10),
+                login_btn,
+                register_link
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
         )
-        
-        page.update()
-    
+
     def show_register_page(self, page: ft.Page):
         """Display the registration page."""
-        page.clean()
-        
+        with self.view.batch():
+            self.view.navigate("register", lambda: self.build_register_page(page))
+            # The screen is reused; start from a clean form
+            for field in (self.reg_username_field, self.reg_email_field,
+                          self.reg_password_field, self.reg_confirm_password_field):
+                field.value = ""
+            self.reg_error_text.value = ""
+
+    def build_register_page(self, page: ft.Page) -> ft.Control:
+        """Build the registration page (once per session)."""
         # Title
         title = ft.Text(
             "Create Account",
@@ -412,13 +356,13 @@ class LoginApp:
             weight=ft.FontWeight.BOLD,
             color=ft.Colors.GREEN_700
         )
-        
+
         subtitle = ft.Text(
             "Join our mental health community",
             size=14,
             color=ft.Colors.GREY_600
         )
-        
+
         # Input fields
         self.reg_username_field = ft.TextField(
             label="Username",
@@ -426,13 +370,13 @@ class LoginApp:
             prefix_icon=ft.Icons.PERSON,
             helper_text="3-20 characters, letters, numbers, underscore only"
         )
-        
+
         self.reg_email_field = ft.TextField(
             label="Email",
             width=300,
             prefix_icon=ft.Icons.EMAIL
         )
-        
+
         self.reg_password_field = ft.TextField(
             label="Password",
             width=300,
@@ -441,7 +385,7 @@ class LoginApp:
             prefix_icon=ft.Icons.LOCK,
             helper_text="Minimum 6 characters"
         )
-        
+
         self.reg_confirm_password_field = ft.TextField(
             label="Confirm Password",
             width=300,
@@ -449,14 +393,14 @@ class LoginApp:
             can_reveal_password=True,
             prefix_icon=ft.Icons.LOCK
         )
-        
+
         # Error message display
         self.reg_error_text = ft.Text(
             "",
             color=ft.Colors.RED_400,
             size=12
         )
-        
+
         # Register button
         register_btn = ft.ElevatedButton(
             "Create Account",
@@ -467,57 +411,90 @@ class LoginApp:
                 color=ft.Colors.WHITE
             )
         )
-        
+
         # Back to login link
         login_link = ft.TextButton(
             "Already have an account? Sign in",
             on_click=lambda e: self.show_login_page(page),
             style=ft.ButtonStyle(color=ft.Colors.BLUE_600)
         )
-        
+
         # Layout
-        page.add(
-            ft.Container(
-                content=ft.Column([
-                    title,
-                    subtitle,
-                    ft.Container(height=20),
-                    self.reg_username_field,
-                    self.reg_email_field,
-                    self.reg_password_field,
-                    self.reg_confirm_password_field,
-                    self.reg_error_text,
-                    ft.Container(height=10),
-                    register_btn,
-                    login_link
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=40,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=10,
-                shadow=ft.BoxShadow(
-                    spread_radius=1,
-                    blur_radius=15,
-                    color=ft.Colors.BLUE_GREY_300,
-                    offset=ft.Offset(0, 0)
-                )
-            )
+        return card(
+            ft.Column([
+                title,
+                subtitle,
+                ft.Container(height=20),
+                self.reg_username_field,
+                self.reg_email_field,
+                self.reg_password_field,
+                self.reg_confirm_password_field,
+                self.reg_error_text,
+                ft.Container(height=10),
+                register_btn,
+                login_link
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
         )
-        
-        page.update()
-    
+
     def handle_login(self, page: ft.Page):
         """Handle login form submission."""
         username_or_email = self.username_field.value
         password = self.password_field.value
-        
+
         success, message, user = self.user_service.authenticate_user(username_or_email, password)
-        
+
         if success:
-            self.current_user = user
-            self.show_dashboard(page)
+            self.remember_session(page, user)
+            self.start_user_session(page, user)
         else:
             self.error_text.value = message
-            page.update()
+            self.view.update()
+
+    def start_user_session(self, page: ft.Page, user):
+        """Show the dashboard for a logged in or restored user."""
+        self.current_user = user
+        self.watch_user_data(page)
+        # Start reading the dashboard data while the shell is being sent
+        self.start_dashboard_prefetch()
+        self.tip_provider.prefetch()
+        self.show_dashboard(page)
+
+    def restore_session(self, page: ft.Page):
+        """Return the user of the token saved on this client, if it is still valid."""
+        try:
+            token = page.client_storage.get(SESSION_STORAGE_KEY)
+        except Exception as e:
+            print(f"Client storage error: {e}")
+            return None
+        user = self.session_service.restore_session(token)
+        if user is None:
+            if token:
+                self.forget_session(page)
+            return None
+        self.session_token = token
+        return user
+
+    def remember_session(self, page: ft.Page, user):
+        """Save a new session token on this client so the next launch skips the login."""
+        token = self.session_service.create_session(user)
+        if token is None:
+            return
+        try:
+            page.client_storage.set(SESSION_STORAGE_KEY, token)
+        except Exception as e:
+            print(f"Client storage error: {e}")
+            self.session_service.revoke_session(token)
+            return
+        self.session_token = token
+
+    def forget_session(self, page: ft.Page):
+        """Revoke this client's session and remove its token."""
+        self.session_service.revoke_session(self.session_token)
+        self.session_token = None
+        try:
+            page.client_storage.remove(SESSION_STORAGE_KEY)
+        except Exception as e:
+            print(f"Client storage error: {e}")
 
     def handle_register(self, page: ft.Page):
         """Handle registration form submission."""
@@ -525,33 +502,30 @@ class LoginApp:
         email = self.reg_email_field.value
         password = self.reg_password_field.value
         confirm_password = self.reg_confirm_password_field.value
-        
+
         # Check if passwords match
         if password != confirm_password:
             self.reg_error_text.value = "Passwords do not match"
-            page.update()
+            self.view.update()
             return
-        
+
         success, message, user = self.user_service.register_user(username, email, password)
-        
+
         if success:
             # Show success message and redirect to login
             self.show_success_page(page, "Account created successfully! Please sign in.")
         else:
             self.reg_error_text.value = message
-            page.update()
-    
+            self.view.update()
+
     def show_success_page(self, page: ft.Page, message: str):
         """Show success message and redirect to login."""
-        page.clean()
-        
-        success_text = ft.Text(
-            message,
-            size=16,
-            color=ft.Colors.GREEN_600,
-            text_align=ft.TextAlign.CENTER
-        )
-        
+        with self.view.batch():
+            self.success_text.value = message
+            self.view.navigate("success", lambda: self.build_success_page(page))
+
+    def build_success_page(self, page: ft.Page) -> ft.Control:
+        """Build the success page (once per session)."""
         login_btn = ft.ElevatedButton(
             "Go to Login",
             on_click=lambda e: self.show_login_page(page),
@@ -560,44 +534,33 @@ class LoginApp:
                 color=ft.Colors.WHITE
             )
         )
-        
-        page.add(
-            ft.Container(
-                content=ft.Column([
-                    ft.Icon(ft.Icons.CHECK_CIRCLE, color=ft.Colors.GREEN_600, size=50),
-                    ft.Container(height=20),
-                    success_text,
-                    ft.Container(height=20),
-                    login_btn
-                ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                padding=40,
-                bgcolor=ft.Colors.WHITE,
-                border_radius=10,
-                shadow=ft.BoxShadow(
-                    spread_radius=1,
-                    blur_radius=15,
-                    color=ft.Colors.BLUE_GREY_300,
-                    offset=ft.Offset(0, 0)
-                )
-            )
+
+        return card(
+            ft.Column([
+                ft.Icon(ft.Icons.CHECK_CIRCLE, color=ft.Colors.GREEN_600, size=50),
+                ft.Container(height=20),
+                self.success_text,
+                ft.Container(height=20),
+                login_btn
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER)
         )
-        
-        page.update()
-    
+
     def show_dashboard(self, page: ft.Page):
         """Show main dashboard after successful login."""
-        page.clean()
-
+        with self.view.batch():
+            self.welcome_text.value = f"Welcome back, {self.current_user.username}!"
+            # Stats section: placeholders now, values patched in by the prefetch
+            self.reset_stats_section()
+            self.view.navigate("dashboard", lambda: self.build_dashboard(page))
+        self.patch_dashboard_when_ready(page)
+
+    def build_dashboard(self, page: ft.Page) -> ft.Control:
+        """Build the dashboard (once per session; values are patched in)."""
         # Header with welcome and logout
         header = ft.Container(
             content=ft.Row(
                 [
-                    ft.Text(
-                        f"Welcome back, {self.current_user.username}!",
-                        size=24,
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.BLUE_700
-                    ),
+                    self.welcome_text,
                     ft.ElevatedButton(
                         "Logout",
                         on_click=lambda e: self.logout(page),
@@ -622,12 +585,21 @@ class LoginApp:
     )
 )
 
+        # Interactive analytics (native charts, full history)
+        native_analytics_btn = ft.ElevatedButton(
+            "📈 Interactive Analytics",
+            on_click=lambda e: self.show_native_analytics(page),
+            style=ft.ButtonStyle(
+                bgcolor=ft.Colors.INDIGO_600,
+                color=ft.Colors.WHITE
+            )
+        )
+
         # Mood tracking section
         mood_section = self.create_mood_section(page)
-        
-        # Stats section
+
         stats_section = self.create_stats_section()
-        
+
         # Journal history button
         journal_history_btn = ft.ElevatedButton(
             "View Journal History",
@@ -638,25 +610,73 @@ class LoginApp:
             )
         )
 
-        # Add all sections to page
-        page.add(
-            header,
-            ft.Container(height=10),
-            analytics_btn,
-            ft.Container(height=20),
-            mood_section,
-            ft.Container(height=20),
-            journal_history_btn,  # <-- Add this line
-            ft.Container(height=20),
-            stats_section
+        # All sections in one column
+        return ft.Column(
+            [
+                header,
+                ft.Container(height=10),
+                ft.Row([analytics_btn, native_analytics_btn], alignment=ft.MainAxisAlignment.CENTER),
+                ft.Container(height=20),
+                mood_section,
+                ft.Container(height=20),
+                journal_history_btn,  # <-- Add this line
+                ft.Container(height=20),
+                stats_section
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER
+        )
+
+    def start_dashboard_prefetch(self):
+        """Read the dashboard snapshot for the current user on a background worker."""
+        self.dashboard_future = _prefetch_executor.submit(
+            self.mood_service.get_dashboard_snapshot, self.current_user.user_id
         )
-        
-        page.update()
+
+    def watch_user_data(self, page: ft.Page):
+        """Refresh the dashboard whenever the user's data changes, from any session or a sync."""
+        self.stop_watching_user_data()
+
+        def refresh(event):
+            if self.current_user is None or event.user_id != self.current_user.user_id:
+                return
+            self.start_dashboard_prefetch()
+            self.patch_dashboard_when_ready(page)
+
+        # Coalesced: a burst of writes triggers a single re-read
+        self.data_subscription = get_event_bus().subscribe(
+            (MoodLogged, MoodUpdated, MoodDeleted, JournalSaved, SyncApplied),
+            refresh, delivery="async", coalesce=True
+        )
+
+    def stop_watching_user_data(self):
+        if self.data_subscription is not None:
+            self.data_subscription.cancel()
+            self.data_subscription = None
+
+    def patch_dashboard_when_ready(self, page: ft.Page):
+        """Fill the dashboard placeholders once the prefetched snapshot arrives."""
+        if self.dashboard_future is None:
+            self.start_dashboard_prefetch()
+        future = self.dashboard_future
+
+        def apply(done):
+            # Drop results superseded by a newer prefetch or a logout
+            if done is not self.dashboard_future or self.current_user is None:
+                return
+            try:
+                snapshot = done.result()
+            except Exception as e:
+                print(f"Dashboard prefetch failed: {e}")
+                return
+            self.apply_dashboard_snapshot(snapshot)
+            self.view.update()
+
+        future.add_done_callback(apply)
 
     def create_mood_section(self, page: ft.Page):
         """Create the mood tracking section"""
-        return ft.Container(
-            content=ft.Column([
+        return card(
+            ft.Column([
                 ft.Text(
                     "How are you feeling today?",
                     size=20,
@@ -672,15 +692,7 @@ class LoginApp:
                     self.create_mood_button("😊", "Great", 10, page),
                 ], alignment=ft.MainAxisAlignment.SPACE_EVENLY)
             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-            padding=20,
-            bgcolor=ft.Colors.WHITE,
-            border_radius=10,
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=15,
-                color=ft.Colors.BLUE_GREY_300,
-                offset=ft.Offset(0, 0)
-            )
+            padding=20
         )
 
     def create_mood_button(self, emoji: str, text: str, level: int, page: ft.Page):
@@ -698,14 +710,33 @@ class LoginApp:
             )
         )
 
-    def create_stats_section(self):
-        """Create the statistics section"""
-        # Get stats
-        mood_stats = self.mood_service.get_mood_statistics(self.current_user.user_id)
+    def apply_dashboard_snapshot(self, snapshot):
+        """Copy a DashboardSnapshot into the stats controls (caller updates the page)."""
+        mood_stats = snapshot.stats
         self.average_mood_text.value = f"{mood_stats['average_mood']:.1f}"
         self.total_entries_text.value = str(mood_stats['total_entries'])
-        return ft.Container(
-            content=ft.Column([
+        if snapshot.today_mood:
+            self.today_mood_text.value = f"{snapshot.today_mood.mood_emoji} {snapshot.today_mood.mood_description}"
+        else:
+            self.today_mood_text.value = "Not logged"
+        self.update_wellness_texts(snapshot.wellness.to_dict())
+        # Oldest first, so the newest entry is on the right
+        self.recent_moods_row.controls = [
+            ft.Text(mood.mood_emoji, size=24, tooltip=f"{mood.mood_description} ({mood.timestamp})")
+            for mood in reversed(snapshot.recent_moods)
+        ] or [ft.Text("No entries yet", size=14, color=ft.Colors.GREY_600)]
+
+    def reset_stats_section(self):
+        """Put placeholder values into the stats controls"""
+        for text in (self.average_mood_text, self.total_entries_text, self.today_mood_text, self.wellness_text):
+            text.value = "…"
+        self.streak_text.value = ""
+        self.recent_moods_row.controls = [ft.ProgressRing(width=20, height=20, stroke_width=2)]
+
+    def create_stats_section(self):
+        """Create the statistics section around the long-lived stats controls"""
+        return card(
+            ft.Column([
                 ft.Text(
                     "Your Mood Statistics",
                     size=20,
@@ -734,27 +765,39 @@ class LoginApp:
                         border_radius=10,
                         width=200
                     ),
-                ], alignment=ft.MainAxisAlignment.SPACE_EVENLY)
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("Wellness Score", size=16),
+                            self.wellness_text,
+                            self.streak_text
+                        ], alignment=ft.MainAxisAlignment.CENTER),
+                        padding=20,
+                        bgcolor=ft.Colors.ORANGE_50,
+                        border_radius=10,
+                        width=200
+                    ),
+                    ft.Container(
+                        content=ft.Column([
+                            ft.Text("Today's Mood", size=16),
+                            self.today_mood_text
+                        ], alignment=ft.MainAxisAlignment.CENTER),
+                        padding=20,
+                        bgcolor=ft.Colors.AMBER_50,
+                        border_radius=10,
+                        width=200
+                    ),
+                ], alignment=ft.MainAxisAlignment.SPACE_EVENLY),
+                ft.Container(height=10),
+                ft.Text("Recent Entries", size=16),
+                self.recent_moods_row
             ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-            padding=20,
-            bgcolor=ft.Colors.WHITE,
-            border_radius=10,
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=15,
-                color=ft.Colors.BLUE_GREY_300,
-                offset=ft.Offset(0, 0)
-            )
+            padding=20
         )
 
     def log_mood(self, mood_level: int, page: ft.Page):
         """Log user's mood and update statistics in real-time."""
         if not self.current_user:
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text("Please log in first"),
-                bgcolor=ft.Colors.RED_600
-            )
-            page.update()
+            self.view.notify("Please log in first", ft.Colors.RED_600)
             return
 
         self.last_mood_level = mood_level  # Store the last mood selected
@@ -764,52 +807,48 @@ class LoginApp:
             mood_level
         )
 
-        if success and stats:
-            self.average_mood_text.value = f"{stats['average_mood']:.1f}"
-            self.total_entries_text.value = str(stats['total_entries'])
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text("Mood logged successfully!"),
-                bgcolor=ft.Colors.GREEN_600
-            )
-            self.show_hello_dialog(page)
-            page.update()
-        else:
-            page.snack_bar = ft.SnackBar(
-                content=ft.Text(message),
-                bgcolor=ft.Colors.RED_600
-            )
-            page.update()
+        # Stats, snack bar and dialog go out in one update
+        with self.view.batch():
+            if success and stats:
+                self.average_mood_text.value = f"{stats['average_mood']:.1f}"
+                self.total_entries_text.value = str(stats['total_entries'])
+                logged = Mood(user_id=self.current_user.user_id, mood_level=mood_level)
+                self.today_mood_text.value = f"{logged.mood_emoji} {logged.mood_description}"
+                self.update_wellness_texts(stats['wellness'])
+                # Recent entries are refreshed by the MoodLogged subscription
+                if stats['wellness']['is_anomaly']:
+                    message = "Mood logged. This is unusual for you - consider the tips below."
+                else:
+                    message = "Mood logged successfully!"
+                self.view.notify(message, ft.Colors.GREEN_600)
+                self.show_hello_dialog(page)
+            else:
+                self.view.notify(message, ft.Colors.RED_600)
+
+    def update_wellness_texts(self, wellness: dict):
+        """Show the running wellness score and logging streak."""
+        self.wellness_text.value = f"{wellness['wellness_score']:.1f}"
+        self.streak_text.value = f"Streak: {wellness['current_streak']} days (best {wellness['best_streak']})"
 
     def logout(self, page: ft.Page):
         """Handle user logout."""
+        self.stop_watching_user_data()
+        self.forget_session(page)
         self.current_user = None
+        self.dashboard_future = None
         page.window_width = 400
         page.window_height = 500
         self.show_welcome_screen(page)
 
     def show_hello_dialog(self, page: ft.Page):
         """Show a dialog window that asks about creating a journal."""
-        def close_dialog(e):
-            page.dialog.open = False
-            page.update()
-
-        def show_journal_input(e):
-            page.dialog.open = False
-            page.update()
-            self.show_journal_textbox(page)
-
-        dialog = ft.AlertDialog(
-            title=ft.Text("Do you want to create a journal?"),
+        self.view.show_dialog(
+            "Do you want to create a journal?",
             actions=[
-                ft.TextButton("Yes", on_click=show_journal_input),
-                ft.TextButton("No", on_click=close_dialog)
-            ],
-            open=True
+                ft.TextButton("Yes", on_click=lambda e: self.show_journal_textbox(page)),
+                ft.TextButton("No", on_click=lambda e: self.view.close_dialog())
+            ]
         )
-        page.dialog = dialog
-        if dialog not in page.controls:
-            page.controls.append(dialog)
-        page.update()
 
     def show_journal_textbox(self, page: ft.Page):
         """Show a dialog with a text box for writing a journal entry."""
@@ -822,95 +861,55 @@ class LoginApp:
         )
 
         def save_journal(e):
-            import datetime
-            journal_text = journal_field.value.strip()
-            if journal_text:
-                file_path = os.path.join(os.path.dirname(__file__), "journal_history.txt")
-                with open(file_path, "a", encoding="utf-8") as f:
-                    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    f.write(f"{timestamp}: {journal_text}\n")
-            page.dialog.open = False
-            page.update()
-            # Use business layer for tip
+            if journal_field.value.strip():
+                success, message, _ = self.journal_service.save_entry(
+                    self.current_user.user_id, journal_field.value
+                )
+                if not success:
+                    self.view.notify(message, ft.Colors.RED_600)
+            # Use business layer for tip; reuses the same dialog
             tip = self.get_mental_tip(self.last_mood_level)  # <-- FIXED
-            tip_dialog = ft.AlertDialog(
-                title=ft.Text("Mental Health Tip"),
-                content=ft.Text(tip),
-                actions=[ft.TextButton("OK", on_click=lambda e: self.close_tip_dialog(page))],
-                open=True
+            self.view.show_dialog(
+                "Mental Health Tip",
+                ft.Text(tip),
+                [ft.TextButton("OK", on_click=lambda e: self.close_tip_dialog(page))]
             )
-            page.dialog = tip_dialog
-            if tip_dialog not in page.controls:
-                page.controls.append(tip_dialog)
-            page.update()
-
-        def close_journal(e):
-            page.dialog.open = False
-            page.update()
-
-        dialog = ft.AlertDialog(
-            title=ft.Text("Journal Entry"),
-            content=journal_field,
-            actions=[
+
+        self.view.show_dialog(
+            "Journal Entry",
+            journal_field,
+            [
                 ft.TextButton("Save", on_click=save_journal),
-                ft.TextButton("Cancel", on_click=close_journal)
-            ],
-            open=True
+                ft.TextButton("Cancel", on_click=lambda e: self.view.close_dialog())
+            ]
         )
-        page.dialog = dialog
-        if dialog not in page.controls:
-            page.controls.append(dialog)
-        page.update()
 
     def close_tip_dialog(self, page: ft.Page):
-        page.dialog.open = False
-        page.update()
+        self.view.close_dialog()
 
     def get_mental_tip(self, mood_level: int) -> str:
-        """Return a mental health tip based on mood level."""
-        if mood_level <= 2:
-            return "It's okay to feel down. Try talking to a friend or practicing deep breathing."
-        elif mood_level <= 4:
-            return "Take a short walk or listen to your favorite music to lift your mood."
-        elif mood_level <= 6:
-            return "Keep going! A little self-care goes a long way."
-        elif mood_level <= 8:
-            return "Great job! Remember to share your positivity with others."
-        else:
-            return "You're doing amazing! Keep up the positive mindset!"
+        """Return a mental health tip based on mood level (never waits on the network)."""
+        return self.tip_provider.get_tip(mood_level)
 
     def show_journal_history(self, page: ft.Page):
-        """Show a dialog with the history of journal entries from file."""
-        file_path = os.path.join(os.path.dirname(__file__), "journal_history.txt")
-        if os.path.exists(file_path):
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = [line.strip() for line in f if line.strip()]
-            if lines:
-                content = ft.Column(
-                    [ft.Text(entry, size=14) for entry in lines],
-                    scroll="auto",
-                    width=400,
-                    height=400
-                )
-            else:
-                content = ft.Text("No journal entries found.", size=14)
+        """Show a dialog with the user's journal entries."""
+        entries = [ft.Text(f"{entry['timestamp']}: {entry['content']}", size=14)
+                   for entry in self.journal_service.get_history(self.current_user.user_id)]
+
+        if entries:
+            content = ft.Column(entries, scroll="auto", width=400, height=400)
         else:
             content = ft.Text("No journal entries found.", size=14)
 
-        dialog = ft.AlertDialog(
-            title=ft.Text("Journal History"),
-            content=content,
-            actions=[ft.TextButton("Close", on_click=lambda e: self.close_tip_dialog(page))],
-            open=True
+        self.view.show_dialog(
+            "Journal History",
+            content,
+            [ft.TextButton("Close", on_click=lambda e: self.close_tip_dialog(page))]
         )
-        page.dialog = dialog
-        if dialog not in page.controls:
-            page.controls.append(dialog)
-        page.update()
 
 def main(page: ft.Page):
     app = LoginApp()
     app.main(page)
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main)
@@ -0,0 +1,136 @@
+# presentation_layer/flet_app/native_charts.py
+from typing import List, Optional
+import numpy as np
+import flet as ft
+from business_layer.analytics.downsample import lttb
+
+AXIS_LABEL_COUNT = 6
+
+def _axis_labels(positions: List[float], texts: List[str]) -> List[ft.ChartAxisLabel]:
+    return [
+        ft.ChartAxisLabel(value=position, label=ft.Text(text, size=10, color=ft.Colors.GREY_700))
+        for position, text in zip(positions, texts)
+    ]
+
+def mood_line_chart(labels: List[str], values: List[float], width: int = 760, height: int = 260,
+                    title: str = "Daily Average Mood", color: str = ft.Colors.BLUE_600) -> ft.Control:
+    """
+    Build a native line chart for a dated series of any length.
+
+    The series is downsampled with LTTB to at most one point per horizontal
+    pixel, so a decade of daily values sends only `width` points to the client.
+
+    Args:
+        labels: ISO dates ('YYYY-MM-DD') in chronological order
+        values: Values matching labels
+        width: Chart width in pixels (caps the number of points)
+        height: Chart height in pixels
+        title: Caption shown above the chart
+        color: Line color
+
+    Returns:
+        Column with the caption and the chart
+    """
+    if not values:
+        return ft.Text(f"{title}: no data yet", size=14, color=ft.Colors.GREY_600)
+
+    days = np.array(labels, dtype='datetime64[D]')
+    offsets = (days - days[0]).astype(float)
+    x, y = lttb(offsets, values, width)
+    dates = days[0] + x.astype('timedelta64[D]')
+
+    points = [
+        ft.LineChartDataPoint(float(px), round(float(py), 2), tooltip=f"{str(day)}: {py:.1f}")
+        for px, py, day in zip(x, y, dates)
+    ]
+    tick_positions = np.linspace(0, offsets[-1], min(AXIS_LABEL_COUNT, len(offsets))).round().tolist()
+    tick_texts = [str(days[0] + np.timedelta64(int(p), 'D')) for p in tick_positions]
+
+    chart = ft.LineChart(
+        data_series=[
+            ft.LineChartData(
+                data_points=points,
+                stroke_width=2,
+                color=color,
+                curved=False,
+                below_line_bgcolor=ft.Colors.with_opacity(0.1, color)
+            )
+        ],
+        min_y=0,
+        max_y=11,
+        min_x=0,
+        max_x=max(1.0, float(offsets[-1])),
+        left_axis=ft.ChartAxis(
+            labels=_axis_labels([1, 3, 5, 7, 10], ["1", "3", "5", "7", "10"]),
+            labels_size=30
+        ),
+        bottom_axis=ft.ChartAxis(labels=_axis_labels(tick_positions, tick_texts), labels_size=24),
+        horizontal_grid_lines=ft.ChartGridLines(interval=1, color=ft.Colors.GREY_200, width=1),
+        tooltip_bgcolor=ft.Colors.with_opacity(0.9, ft.Colors.WHITE),
+        interactive=True,
+        width=width,
+        height=height
+    )
+    return ft.Column([ft.Text(title, size=16, weight=ft.FontWeight.BOLD), chart], spacing=8)
+
+def profile_bar_chart(labels: List, values: List[Optional[float]], width: int = 760, height: int = 200,
+                      title: str = "Average Mood by Day of Week", color: str = ft.Colors.PURPLE_400) -> ft.Control:
+    """
+    Build a native bar chart for a small categorical profile.
+
+    Args:
+        labels: Category labels
+        values: Values matching labels (None for categories without data)
+        width: Chart width in pixels
+        height: Chart height in pixels
+        title: Caption shown above the chart
+        color: Bar color
+
+    Returns:
+        Column with the caption and the chart
+    """
+    groups = [
+        ft.BarChartGroup(
+            x=index,
+            bar_rods=[
+                ft.BarChartRod(
+                    from_y=0,
+                    to_y=value or 0,
+                    width=max(4, width // (len(labels) * 2)),
+                    color=color,
+                    tooltip=f"{label}: {value:.1f}" if value is not None else f"{label}: no data",
+                    border_radius=3
+                )
+            ]
+        )
+        for index, (label, value) in enumerate(zip(labels, values))
+    ]
+    chart = ft.BarChart(
+        bar_groups=groups,
+        min_y=0,
+        max_y=10,
+        left_axis=ft.ChartAxis(labels=_axis_labels([0, 5, 10], ["0", "5", "10"]), labels_size=30),
+        bottom_axis=ft.ChartAxis(
+            labels=_axis_labels(list(range(len(labels))), [str(label) for label in labels]),
+            labels_size=24
+        ),
+        horizontal_grid_lines=ft.ChartGridLines(interval=5, color=ft.Colors.GREY_200, width=1),
+        tooltip_bgcolor=ft.Colors.with_opacity(0.9, ft.Colors.WHITE),
+        interactive=True,
+        width=width,
+        height=height
+    )
+    return ft.Column([ft.Text(title, size=16, weight=ft.FontWeight.BOLD), chart], spacing=8)
+
+def analytics_view(report: dict, width: int = 760) -> ft.Control:
+    """Build the native analytics view from MoodService.get_analytics_report output."""
+    return ft.Column(
+        [
+            mood_line_chart(report['daily']['labels'], report['daily']['values'], width=width),
+            mood_line_chart(report['weekly']['labels'], report['weekly']['values'], width=width,
+                            height=200, title="Weekly Average Mood", color=ft.Colors.ORANGE_600),
+            profile_bar_chart(report['day_of_week']['labels'], report['day_of_week']['values'], width=width),
+        ],
+        spacing=20,
+        scroll=ft.ScrollMode.AUTO
+    )
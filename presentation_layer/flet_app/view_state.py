@@ -0,0 +1,79 @@
+# presentation_layer/flet_app/view_state.py
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Union
+import flet as ft
+
+class ViewState:
+    """
+    Per-session UI state on top of a Flet page.
+
+    Screens are built once and kept; navigating swaps the page's single root
+    control instead of cleaning and rebuilding the tree. One AlertDialog and
+    one SnackBar live in the page overlay for the whole session and are
+    reconfigured on each use, so the control tree does not grow as dialogs
+    are shown. Changes made inside batch() are sent with a single
+    page.update(); Flet only serializes properties whose values changed.
+    """
+
+    def __init__(self, page: ft.Page):
+        self.page = page
+        self.screens: Dict[str, ft.Control] = {}
+        self.current_screen: Optional[str] = None
+        self.dialog = ft.AlertDialog(open=False)
+        self.snack_bar = ft.SnackBar(content=ft.Text(""))
+        page.overlay.extend([self.dialog, self.snack_bar])
+        self._local = threading.local()
+
+    @contextmanager
+    def batch(self):
+        """Defer update() calls on this thread until the outermost block exits."""
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self.page.update()
+
+    def update(self):
+        """Send pending changes now, or at the end of the enclosing batch()."""
+        if not getattr(self._local, 'depth', 0):
+            self.page.update()
+
+    def screen(self, name: str, builder: Callable[[], ft.Control]) -> ft.Control:
+        """Return the named screen, building it on first use."""
+        if name not in self.screens:
+            self.screens[name] = builder()
+        return self.screens[name]
+
+    def navigate(self, name: str, builder: Callable[[], ft.Control]) -> ft.Control:
+        """Show the named screen as the page's only content."""
+        root = self.screen(name, builder)
+        if self.current_screen != name:
+            self.page.controls = [root]
+            self.current_screen = name
+        self.update()
+        return root
+
+    def show_dialog(self, title: Union[str, ft.Control], content: Optional[ft.Control] = None,
+                    actions: Optional[List[ft.Control]] = None):
+        """Reconfigure and open the session's dialog."""
+        self.dialog.title = ft.Text(title) if isinstance(title, str) else title
+        self.dialog.content = content
+        self.dialog.actions = actions or [ft.TextButton("Close", on_click=lambda e: self.close_dialog())]
+        self.dialog.open = True
+        self.update()
+
+    def close_dialog(self):
+        """Close the session's dialog."""
+        self.dialog.open = False
+        self.update()
+
+    def notify(self, message: str, bgcolor: str = ft.Colors.GREEN_600):
+        """Show a message in the session's snack bar."""
+        self.snack_bar.content.value = message
+        self.snack_bar.bgcolor = bgcolor
+        self.snack_bar.open = True
+        self.update()
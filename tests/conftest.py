@@ -0,0 +1,55 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+# Keep every test away from data/mindfulbalance.db, before settings is imported
+_scratch = tempfile.mkdtemp(prefix="mindfulbalance-tests-")
+os.environ["MINDFULBALANCE_DATA_DIR"] = _scratch
+os.environ["MINDFULBALANCE_DATABASE"] = os.path.join(_scratch, "default.db")
+os.environ["MINDFULBALANCE_BCRYPT_ROUNDS"] = "4"
+os.environ.pop("MINDFULBALANCE_TIP_API_URL", None)
+os.environ.pop("MINDFULBALANCE_ONE_MOOD_PER_DAY", None)
+os.environ.pop("MINDFULBALANCE_SYNC_TOKEN", None)
+
+import pytest
+from data_layer import settings
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A fresh database file used by every DAO created during the test."""
+    from data_layer.database.connection import DatabaseConnection
+
+    path = str(tmp_path / "test.db")
+    monkeypatch.setattr(settings, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "DATABASE", path)
+    return DatabaseConnection(path)
+
+@pytest.fixture
+def add_user(database):
+    """Insert a user and return its id."""
+    def add(username: str = "alice", email: str = None, password: str = "secret1") -> int:
+        with database.get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
+                (username, email or f"{username}@example.com", password)
+            )
+            conn.commit()
+            return cursor.lastrowid
+    return add
+
+@pytest.fixture
+def add_mood(database):
+    """Insert a mood entry with an explicit UTC timestamp and return its id."""
+    def add(user_id: int, mood_level: int, timestamp: str, log_date: str = None) -> int:
+        with database.get_connection() as conn:
+            cursor = conn.execute(
+                "INSERT INTO mood_logs (user_id, mood_level, timestamp, log_date) VALUES (?, ?, ?, ?)",
+                (user_id, mood_level, timestamp, log_date)
+            )
+            conn.commit()
+            return cursor.lastrowid
+    return add
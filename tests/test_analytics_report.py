@@ -0,0 +1,66 @@
+# tests/test_analytics_report.py
+import numpy as np
+import pytest
+from business_layer.analytics.report import build_streaming_mood_report, longest_run
+from business_layer.analytics.streaming import Aggregate
+from business_layer.services.mood_service import MoodService
+from data_layer.dao.mood_dao import MoodDAO
+
+@pytest.fixture
+def history(add_user, add_mood):
+    user_id = add_user()
+    add_mood(user_id, 8, "2026-01-05 08:00:00")  # Monday
+    add_mood(user_id, 6, "2026-01-05 20:00:00")
+    add_mood(user_id, 9, "2026-01-06 09:00:00")  # Tuesday
+    add_mood(user_id, 2, "2026-01-08 10:00:00")  # Thursday, after a day without entries
+    return user_id
+
+def test_aggregates_must_implement_update_and_merge():
+    class UpdateOnly(Aggregate):
+        def update(self, block):
+            pass
+
+    with pytest.raises(TypeError):
+        Aggregate()
+    with pytest.raises(TypeError):
+        UpdateOnly()
+
+def test_longest_run():
+    assert longest_run(np.array([False, False])) is None
+    assert longest_run(np.array([True, False, True, True, False, True])) == (2, 2)
+
+def test_report_for_user_without_entries(add_user):
+    report = MoodService().get_analytics_report(add_user())
+    assert report['total_entries'] == 0
+    assert report['daily'] == {'labels': [], 'values': []}
+    assert report['streaks'] == {'best': None, 'worst': None, 'longest_logging': None}
+
+def test_report_summary_and_series(history):
+    report = MoodService().get_analytics_report(history)
+
+    assert report['total_entries'] == 4
+    assert report['first_entry'] == "2026-01-05T08:00:00"
+    assert report['last_entry'] == "2026-01-08T10:00:00"
+    assert report['average_mood'] == 6.25
+    # Days without entries are left out of the series
+    assert report['daily'] == {'labels': ["2026-01-05", "2026-01-06", "2026-01-08"], 'values': [7.0, 9.0, 2.0]}
+    # Weekly and monthly means weigh entries, not days
+    assert report['weekly'] == {'labels': ["2026-01-11"], 'values': [6.25]}
+    assert report['monthly'] == {'labels': ["2026-01"], 'values': [6.25]}
+    assert report['day_of_week']['values'] == [7.0, 9.0, None, 2.0, None, None, None]
+    hours = report['hour_of_day']['values']
+    assert (hours[8], hours[9], hours[10], hours[20]) == (8.0, 9.0, 2.0, 6.0)
+    assert report['volatility'] == {'std': 2.68, 'daily_change_std': 6.36}
+
+def test_report_streaks_break_on_missing_days(history):
+    streaks = MoodService().get_analytics_report(history)['streaks']
+
+    assert streaks['best'] == {'length': 2, 'start': "2026-01-05", 'end': "2026-01-06", 'average_mood': 8.0}
+    assert streaks['worst'] == {'length': 1, 'start': "2026-01-08", 'end': "2026-01-08", 'average_mood': 2.0}
+    assert streaks['longest_logging']['length'] == 2
+
+def test_report_does_not_depend_on_block_size(history):
+    dao = MoodDAO()
+    whole = build_streaming_mood_report(history, dao.iter_history_chunks(history, 4096))
+    single_rows = build_streaming_mood_report(history, dao.iter_history_chunks(history, 1))
+    assert whole == single_rows
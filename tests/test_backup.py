@@ -0,0 +1,102 @@
+# tests/test_backup.py
+import os
+import threading
+import pytest
+from business_layer.services.container import ServiceContainer
+from data_layer.dao.cached_mood_dao import CachedMoodDAO
+from data_layer.dao.mood_dao import MoodDAO
+from data_layer.database.backup import BackupManager
+from data_layer.events import DatabaseRestored, get_event_bus
+
+@pytest.fixture
+def manager(database, tmp_path):
+    return BackupManager(str(tmp_path / "backups"), keep=2, sleep_seconds=0)
+
+def mood_levels(database):
+    with database.read_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT mood_level FROM mood_logs ORDER BY mood_id")]
+
+def test_create_backup_is_a_verified_copy(database, manager, add_user):
+    user_id = add_user()
+    for level in (4, 6, 8):
+        MoodDAO().create_mood_entry(user_id, level)
+    steps = []
+
+    path = manager.create_backup(progress=lambda done, total: steps.append((done, total)))
+    assert path and manager.verify(path)
+    assert steps[-1][0] == steps[-1][1]
+    assert not os.path.exists(path + ".partial")
+    assert [backup['path'] for backup in manager.list_backups()] == [path]
+
+def test_verify_rejects_a_damaged_file(database, manager, tmp_path):
+    path = manager.create_backup()
+    with open(path, "r+b") as f:
+        f.seek(100)
+        f.write(b"\xff" * 4096)
+    assert not manager.verify(path)
+
+    garbage = tmp_path / "garbage.db"
+    garbage.write_bytes(b"not a database" * 100)
+    assert not manager.verify(str(garbage))
+    assert not manager.restore(str(garbage))
+
+def test_rotation_keeps_the_newest_generations(database, manager):
+    paths = [manager.create_backup() for _ in range(4)]
+    assert [backup['path'] for backup in manager.list_backups()] == paths[:1:-1]
+    assert not any(os.path.exists(path) for path in paths[:2])
+
+    manager.keep = 1
+    assert manager.rotate() == [paths[2]]
+
+def test_restore_while_another_thread_writes(database, manager, add_user):
+    user_id = add_user()
+    dao = MoodDAO()
+    for level in (4, 6):
+        dao.create_mood_entry(user_id, level)
+    path = manager.create_backup()
+    dao.create_mood_entry(user_id, 9)
+
+    stop = threading.Event()
+    failures = []
+    def write():
+        while not stop.is_set():
+            if dao.create_mood_entry(user_id, 5) is None:
+                failures.append(True)
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        assert manager.restore(path)
+    finally:
+        stop.set()
+        writer.join()
+
+    assert not failures
+    levels = mood_levels(database)
+    # The backup's rows, then only writes that committed after the restore
+    assert levels[:2] == [4, 6] and set(levels[2:]) <= {5}
+    assert dao.create_mood_entry(user_id, 7)
+    assert mood_levels(database)[-1] == 7
+
+def test_restore_drops_cached_reads(database, manager, add_user):
+    user_id = add_user()
+    dao = MoodDAO()
+    dao.create_mood_entry(user_id, 4)
+    path = manager.create_backup()
+    dao.create_mood_entry(user_id, 9)
+
+    cache = CachedMoodDAO()
+    services = ServiceContainer()
+    events = []
+    subscription = get_event_bus().subscribe(DatabaseRestored, events.append)
+    try:
+        assert cache.get_mood_statistics(user_id)['total_entries'] == 2
+        services.strategy_catalog.get_tip(5)
+
+        assert manager.restore(path)
+        assert events == [DatabaseRestored(0, path)]
+        assert cache.get_mood_statistics(user_id)['total_entries'] == 1
+        assert services.strategy_catalog._index is None
+    finally:
+        subscription.cancel()
+        services.restore_subscription.cancel()
+        cache.close()
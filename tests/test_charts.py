@@ -0,0 +1,44 @@
+# tests/test_charts.py
+import base64
+import os
+from datetime import date
+from business_layer.models.user import User
+from business_layer.services.container import ServiceContainer
+from presentation_layer.flet_app.charts import get_chart_renderer
+from presentation_layer.flet_app import main as flet_main
+from presentation_layer.flet_app.main import LoginApp
+from tools.load_test import HeadlessPage
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def test_renderer_returns_encoded_image():
+    dates = [date(2026, 1, day) for day in range(1, 9)]
+    image = get_chart_renderer().render_mood_dashboard(
+        "Dashboard", dates, [5, 6, 7, 4, 8, 6, 7, 9], {dates[0]: 1}, dates[6:], [6.1, 6.7],
+        profile="thumbnail"
+    )
+    assert image.startswith(PNG_SIGNATURE)
+
+def test_mood_plot_is_shown_from_memory(database, add_user):
+    user_id = add_user("plotter")
+    services = ServiceContainer()
+    for level in (4, 7, 9):
+        services.mood_service.log_mood(user_id, level)
+
+    # The old shared output file must no longer be (re)written
+    shared_plot = os.path.join(os.path.dirname(flet_main.__file__), "mood_plot.png")
+    before = os.stat(shared_plot).st_mtime_ns if os.path.exists(shared_plot) else None
+
+    app = LoginApp(services)
+    page = HeadlessPage()
+    app.main(page)
+    app.current_user = User.from_dict(services.user_service.user_dao.get_user_by_id(user_id))
+    app.create_mood_plots(page)
+
+    dialog = app.view.dialog
+    assert dialog.open
+    image = dialog.content.content
+    assert base64.b64decode(image.src_base64).startswith(PNG_SIGNATURE)
+    assert not image.src
+    after = os.stat(shared_plot).st_mtime_ns if os.path.exists(shared_plot) else None
+    assert after == before
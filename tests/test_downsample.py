@@ -0,0 +1,38 @@
+# tests/test_downsample.py
+import numpy as np
+from business_layer.analytics.downsample import lttb
+from presentation_layer.flet_app import native_charts
+
+def test_small_series_pass_through():
+    x, y = lttb([0, 1, 2], [5, 6, 7], 10)
+    assert x.tolist() == [0, 1, 2] and y.tolist() == [5, 6, 7]
+    # Fewer than three points cannot form triangles
+    assert lttb(range(10), range(10), 2)[0].size == 10
+
+def test_keeps_endpoints_and_threshold():
+    rng = np.random.default_rng(7)
+    x = np.arange(5000, dtype=float)
+    y = rng.normal(5, 1, x.size)
+    dx, dy = lttb(x, y, 100)
+    assert dx.size == dy.size == 100
+    assert (dx[0], dy[0]) == (x[0], y[0])
+    assert (dx[-1], dy[-1]) == (x[-1], y[-1])
+    assert np.all(np.diff(dx) > 0)
+    # Every kept point is an original one
+    assert np.array_equal(dy, y[dx.astype(int)])
+
+def test_preserves_peaks_and_dips():
+    y = np.full(1000, 5.0)
+    y[333], y[777] = 10.0, 1.0
+    dx, dy = lttb(np.arange(1000), y, 20)
+    assert 333 in dx and 777 in dx
+    assert dy.max() == 10.0 and dy.min() == 1.0
+
+def test_line_chart_caps_points_at_width():
+    days = np.arange('2016-01-01', '2026-01-01', dtype='datetime64[D]')
+    labels = [str(day) for day in days]
+    values = (5 + 4 * np.sin(np.arange(days.size) / 30)).tolist()
+    chart = native_charts.mood_line_chart(labels, values, width=300).controls[1]
+    points = chart.data_series[0].data_points
+    assert len(points) == 300
+    assert points[0].x == 0 and points[-1].x == days.size - 1
@@ -0,0 +1,111 @@
+# tests/test_events.py
+import threading
+import pytest
+from data_layer.events import DataEvent, EventBus, JournalSaved, MoodDeleted, MoodLogged, MoodUpdated
+
+@pytest.fixture
+def bus():
+    bus = EventBus()
+    yield bus
+    bus.flush()
+
+def logged(user_id: int, mood_id: int, level: int = 5) -> MoodLogged:
+    return MoodLogged(user_id, mood_id, level, "2026-03-01")
+
+def blocked_worker(bus):
+    """Hold the async worker inside a handler until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+    def hold(event):
+        started.set()
+        release.wait(5)
+    subscription = bus.subscribe(JournalSaved, hold, delivery="async")
+    bus.publish(JournalSaved(0, 0))
+    assert started.wait(5)
+    subscription.cancel()
+    return release
+
+def test_sync_handlers_run_before_publish_returns(bus):
+    calls = []
+    bus.subscribe(MoodLogged, lambda event: calls.append((event, threading.current_thread())))
+
+    event = logged(1, 10)
+    bus.publish(event)
+    assert calls == [(event, threading.current_thread())]
+
+def test_handlers_only_receive_their_types(bus):
+    moods, everything = [], []
+    bus.subscribe((MoodLogged, MoodUpdated), moods.append)
+    bus.subscribe(DataEvent, everything.append)
+
+    events = [logged(1, 10), MoodUpdated(1, 10, 7, 5), MoodDeleted(1, 10), JournalSaved(1, 3)]
+    for event in events:
+        bus.publish(event)
+    assert moods == events[:2]
+    assert everything == events
+
+def test_async_handlers_run_in_order_on_the_worker(bus):
+    calls = []
+    bus.subscribe(MoodLogged, lambda event: calls.append((event.mood_id, threading.current_thread().name)),
+                  delivery="async")
+
+    for mood_id in range(5):
+        bus.publish(logged(1, mood_id))
+    bus.flush()
+    assert calls == [(mood_id, "event-bus") for mood_id in range(5)]
+
+def test_coalescing_keeps_the_latest_event_per_user(bus):
+    calls = []
+    bus.subscribe(MoodLogged, calls.append, delivery="async", coalesce=True)
+    release = blocked_worker(bus)
+
+    for mood_id in range(5):
+        bus.publish(logged(1, mood_id))
+        bus.publish(logged(2, 100 + mood_id))
+    release.set()
+    bus.flush()
+    assert calls == [logged(1, 4), logged(2, 104)]
+
+    # Once handled, the next event is delivered again
+    bus.publish(logged(1, 5))
+    bus.flush()
+    assert calls[-1] == logged(1, 5)
+
+def test_cancel_stops_delivery_including_queued_events(bus):
+    sync_calls, async_calls = [], []
+    sync_subscription = bus.subscribe(MoodLogged, sync_calls.append)
+    async_subscription = bus.subscribe(MoodLogged, async_calls.append, delivery="async")
+    release = blocked_worker(bus)
+
+    bus.publish(logged(1, 1))
+    sync_subscription.cancel()
+    async_subscription.cancel()
+    bus.publish(logged(1, 2))
+    release.set()
+    bus.flush()
+
+    assert sync_calls == [logged(1, 1)]
+    assert async_calls == []
+    assert not async_subscription.active
+    assert bus._subscriptions == []
+
+def test_a_raising_handler_does_not_stop_the_others(bus, capsys):
+    calls = []
+    def broken(event):
+        raise RuntimeError("handler failed")
+    bus.subscribe(MoodLogged, broken)
+    bus.subscribe(MoodLogged, broken, delivery="async")
+    bus.subscribe(MoodLogged, calls.append)
+    bus.subscribe(MoodLogged, calls.append, delivery="async")
+
+    bus.publish(logged(1, 1))
+    bus.publish(logged(1, 2))
+    bus.flush()
+
+    assert sorted(event.mood_id for event in calls) == [1, 1, 2, 2]
+    assert capsys.readouterr().out.count("Event handler error (MoodLogged): handler failed") == 4
+
+def test_invalid_subscriptions_are_refused(bus):
+    with pytest.raises(ValueError):
+        bus.subscribe(MoodLogged, print, delivery="later")
+    with pytest.raises(ValueError):
+        bus.subscribe(MoodLogged, print, coalesce=True)
@@ -0,0 +1,116 @@
+# tests/test_mood_cache.py
+import sqlite3
+from datetime import datetime, timedelta
+from business_layer.services.container import ServiceContainer
+from business_layer.services.mood_service import MoodService
+from data_layer.dao.cached_mood_dao import CachedMoodDAO
+from data_layer.database.retention import RetentionManager
+from data_layer.events import HistoryCompacted, MoodLogged, get_event_bus
+
+def loads(cache, user_id, name="value"):
+    """Read a cached value and report whether it was loaded."""
+    loaded = []
+    cache.get_or_load(user_id, name, lambda: loaded.append(user_id) or user_id)
+    return bool(loaded)
+
+def test_writes_invalidate_the_user(database, add_user):
+    user_id = add_user()
+    cache = CachedMoodDAO()
+    try:
+        assert loads(cache, user_id) and loads(cache, user_id + 1)
+        assert not loads(cache, user_id)
+        get_event_bus().publish(MoodLogged(user_id, 1, 5, "2026-03-01"))
+        assert loads(cache, user_id)
+        assert not loads(cache, user_id + 1)
+    finally:
+        cache.close()
+
+def test_close_unsubscribes(database):
+    cache = CachedMoodDAO()
+    loads(cache, 1)
+    cache.close()
+
+    assert not cache.subscription.active
+    assert cache.subscription not in get_event_bus()._subscriptions
+    get_event_bus().publish(MoodLogged(1, 1, 5, "2026-03-01"))
+    assert cache.stats()['invalidations'] == 0
+    # Reads go straight to the DAO afterwards
+    assert loads(cache, 1) and loads(cache, 1)
+    assert cache.stats()['entries'] == 0
+
+def test_service_closes_only_its_own_cache(database):
+    owned = MoodService()
+    owned.close()
+    assert not owned.mood_dao.subscription.active
+
+    shared = CachedMoodDAO()
+    try:
+        MoodService(mood_dao=shared).close()
+        assert shared.subscription.active
+    finally:
+        shared.close()
+
+def test_container_shares_one_cache(database):
+    services = ServiceContainer()
+    try:
+        assert services.mood_service.mood_dao is services.mood_cache
+    finally:
+        services.mood_cache.close()
+
+def test_generations_are_bounded(database):
+    cache = CachedMoodDAO(max_entries=3)
+    try:
+        loads(cache, 1)
+        for user_id in range(2, 12):
+            cache.invalidate(user_id)
+        assert cache.stats()['tracked_users'] == 3
+        # Users whose generation was dropped never hit an entry cached before
+        assert loads(cache, 1)
+        loads(cache, 11)
+        cache.invalidate(5)
+        assert cache.stats()['tracked_users'] == 3
+        assert not loads(cache, 11)
+        cache.invalidate(12)
+        cache.invalidate(13)
+        assert loads(cache, 11)
+    finally:
+        cache.close()
+
+def test_retention_invalidates_compacted_users(database, add_user, add_mood):
+    alice, bob = add_user("alice"), add_user("bob")
+    stamp = (datetime.utcnow() - timedelta(days=400)).strftime('%Y-%m-%d %H:%M:%S')
+    add_mood(alice, 6, stamp)
+    add_mood(bob, 4, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+    with database.get_connection() as conn:
+        conn.execute("DELETE FROM sync_changes")
+        conn.commit()
+    compacted = []
+    subscription = get_event_bus().subscribe(HistoryCompacted, compacted.append)
+    cache = CachedMoodDAO()
+    try:
+        loads(cache, alice)
+        loads(cache, bob)
+
+        assert RetentionManager().run()['compacted'] == 1
+
+        assert compacted == [HistoryCompacted(alice, 1)]
+        assert loads(cache, alice)
+        assert not loads(cache, bob)
+    finally:
+        subscription.cancel()
+        cache.close()
+
+def test_failed_report_is_not_cached(database, add_user, add_mood, monkeypatch):
+    user_id = add_user()
+    add_mood(user_id, 6, datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'))
+    service = MoodService()
+    try:
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+        with monkeypatch.context() as patch:
+            patch.setattr(service.mood_dao.dao, "iter_history_chunks", locked)
+            assert service.get_analytics_report(user_id)['total_entries'] == 0
+
+        assert service.get_analytics_report(user_id)['total_entries'] == 1
+    finally:
+        service.close()
@@ -0,0 +1,75 @@
+# tests/test_one_mood_per_day.py
+import sqlite3
+import pytest
+from business_layer.services.mood_service import MoodService
+from business_layer.services.one_mood_per_day import OneMoodPerDayMigration
+from business_layer.services.wellness_service import WellnessService
+from data_layer import settings
+from data_layer.database.connection import ONE_MOOD_PER_DAY_MIGRATION
+
+def levels(database):
+    with database.read_connection() as conn:
+        return [row[0] for row in conn.execute("SELECT mood_level FROM mood_logs ORDER BY mood_id")]
+
+@pytest.fixture
+def repeated_day(database, add_user, add_mood, monkeypatch):
+    """A user with two entries on one day, then one-mood-per-day mode switched on."""
+    user_id = add_user()
+    add_mood(user_id, 4, "2026-02-01 08:00:00", "2026-02-01")
+    add_mood(user_id, 7, "2026-02-01 20:00:00", "2026-02-01")
+    add_mood(user_id, 5, "2026-02-02 08:00:00", "2026-02-02")
+    monkeypatch.setattr(settings, "ONE_MOOD_PER_DAY", True)
+    return user_id
+
+def test_opening_the_database_never_deletes_entries(database, repeated_day, capsys):
+    database.initialize_database()
+
+    assert levels(database) == [4, 7, 5]
+    assert not database.one_mood_per_day
+    assert ONE_MOOD_PER_DAY_MIGRATION in capsys.readouterr().out
+    # Logging keeps working as plain inserts until the migration has run
+    assert MoodService().log_mood(repeated_day, 9)[0]
+    assert levels(database) == [4, 7, 5, 9]
+
+def test_migration_backs_up_then_merges(database, repeated_day):
+    database.initialize_database()
+    WellnessService().rebuild()
+
+    result = OneMoodPerDayMigration().migrate()
+
+    assert result.success and result.removed_entries == 1 and result.users == 1
+    with sqlite3.connect(result.backup_path) as backup:
+        assert backup.execute("SELECT COUNT(*) FROM mood_logs").fetchone()[0] == 3
+    assert levels(database) == [7, 5]
+    assert database.one_mood_per_day
+    assert WellnessService().get_state(repeated_day).entry_count == 2
+    with database.read_connection() as conn:
+        assert conn.execute("SELECT op FROM sync_changes WHERE op = 'delete'").fetchall() != []
+
+    # Repeat taps now update today's entry in place
+    service = MoodService()
+    service.log_mood(repeated_day, 3)
+    service.log_mood(repeated_day, 8)
+    assert levels(database)[2:] == [8]
+    assert WellnessService().get_state(repeated_day).entry_count == 3
+
+def test_failed_backup_changes_nothing(database, repeated_day, monkeypatch):
+    database.initialize_database()
+    migration = OneMoodPerDayMigration()
+    monkeypatch.setattr(migration.backup_manager, "create_backup", lambda progress=None: None)
+
+    result = migration.migrate()
+
+    assert not result.success
+    assert levels(database) == [4, 7, 5]
+    assert not database.one_mood_per_day
+
+def test_clean_history_gets_the_unique_index(database, add_user, add_mood, monkeypatch):
+    user_id = add_user()
+    add_mood(user_id, 6, "2026-02-01 08:00:00", "2026-02-01")
+    monkeypatch.setattr(settings, "ONE_MOOD_PER_DAY", True)
+
+    database.initialize_database()
+
+    assert database.one_mood_per_day
+    assert OneMoodPerDayMigration().repeated_days() == 0
@@ -0,0 +1,93 @@
+# tests/test_passwords.py
+import hashlib
+import pytest
+from business_layer import passwords
+from business_layer.passwords import hash_password, is_hashed, needs_rehash, verify_password
+from business_layer.services.user_service import UserService
+
+def legacy_hash(password: str, salt: str = "pepper42") -> str:
+    return f"{salt}:{hashlib.sha256((password + salt).encode('utf-8')).hexdigest()}"
+
+def test_legacy_hash_format_of_the_shipped_database():
+    stored = "a2426f0a61064079dc4d151c35c6d3d0:a35a825b4541d985f0a1241896cb06ec9a81dddc639342aaafadb61fb6cee3a6"
+    assert verify_password("test123", stored)
+    assert not verify_password("test1234", stored)
+
+def stored_password(database, user_id):
+    with database.read_connection() as conn:
+        return conn.execute("SELECT password FROM users WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+def test_bcrypt_round_trip():
+    stored = hash_password("secret1")
+    assert verify_password("secret1", stored)
+    assert not verify_password("secret2", stored)
+    assert not needs_rehash(stored)
+    assert needs_rehash(hash_password("secret1", rounds=5))
+
+def test_legacy_hashes_verify_and_need_rehash():
+    stored = legacy_hash("secret1")
+    assert verify_password("secret1", stored)
+    assert not verify_password("secret2", stored)
+    assert needs_rehash(stored)
+
+@pytest.mark.parametrize("stored", [legacy_hash("secret1"), "secret1", hash_password("secret1"), "", None])
+def test_stored_value_is_never_accepted_as_the_password(stored):
+    assert not verify_password(stored or "", stored)
+
+def test_legacy_login_upgrades_to_bcrypt(database, add_user):
+    user_id = add_user("alice", password=legacy_hash("secret1"))
+    service = UserService()
+
+    assert service.authenticate_user("alice", "wrong1")[1] == "Incorrect password"
+    assert stored_password(database, user_id) == legacy_hash("secret1")
+
+    success, _, user = service.authenticate_user("alice", "secret1")
+    assert success and user.user_id == user_id
+    assert is_hashed(stored_password(database, user_id))
+    assert service.authenticate_user("alice", "secret1")[0]
+
+def test_plaintext_account_logs_in_and_is_hashed(database, add_user):
+    user_id = add_user("alice", password="secret1")
+    service = UserService()
+
+    assert service.authenticate_user("alice", "secret2") == (False, "Incorrect password", None)
+    assert stored_password(database, user_id) == "secret1"
+
+    success, _, user = service.authenticate_user("alice", "secret1")
+    assert success and user.user_id == user_id
+    assert is_hashed(stored_password(database, user_id))
+    assert service.authenticate_user("alice", "secret1")[0]
+
+def test_account_without_a_password_needs_a_reset(database, add_user):
+    add_user("alice", password="")
+    assert UserService().authenticate_user("alice", "secret1") == (
+        False, "This account needs a password reset", None
+    )
+
+def test_upgrade_command_hashes_the_remaining_plaintext(database, add_user, capsys):
+    user_id = add_user("alice", password="secret1")
+
+    passwords.main(["upgrade-plaintext", "--processes", "1"])
+    assert "Hashed 1 plaintext password(s)" in capsys.readouterr().out
+    assert is_hashed(stored_password(database, user_id))
+    assert UserService().authenticate_user("alice", "secret1")[0]
+    assert UserService().upgrade_plaintext_passwords(processes=1) == 0
+
+def test_early_returns_do_not_touch_the_connection(database):
+    service = UserService()
+    assert service.register_user("alice", "alice@example.com", "") == (False, "All fields are required", None)
+    assert service.authenticate_user("", "secret1") == (False, "Please enter both username/email and password", None)
+
+def test_emails_are_normalized(database):
+    service = UserService()
+    success, _, user = service.register_user("alice", "  Alice@Example.COM ", "secret1")
+    assert success and user.email == "alice@example.com"
+    with database.read_connection() as conn:
+        assert conn.execute("SELECT email FROM users").fetchone()[0] == "alice@example.com"
+
+    assert service.register_user("alice2", "ALICE@example.com", "secret1")[1] == "Username or email already exists"
+    assert service.authenticate_user(" ALICE@example.com", "secret1")[0]
+
+    results = service.provision_users([{'username': "bob", 'email': "Bob@Example.com", 'password': "secret1"}],
+                                      processes=1)
+    assert results[0].status == 'created' and results[0].email == "bob@example.com"
@@ -0,0 +1,53 @@
+# tests/test_population.py
+from business_layer.analytics.population import PopulationAnalyticsJob, partition_users
+
+def daily_stats(database):
+    with database.read_connection() as conn:
+        return {row['day']: dict(row) for row in conn.execute("SELECT * FROM population_daily_stats")}
+
+def test_partition_users():
+    assert partition_users([1, 2, 5, 9, 10], 2) == [(1, 2), (5, 9), (10, 10)]
+    assert partition_users([], 3) == []
+
+def test_daily_stats_and_distribution(database, add_user, add_mood):
+    alice, bob, _ = add_user("alice"), add_user("bob"), add_user("carol")
+    add_mood(alice, 8, "2026-03-01 09:00:00")
+    add_mood(alice, 6, "2026-03-01 18:00:00")
+    add_mood(bob, 4, "2026-03-01 12:00:00")
+    add_mood(bob, 10, "2026-03-03 12:00:00")
+
+    summary = PopulationAnalyticsJob(workers=2, chunk_size=1).run()
+
+    assert summary['entries'] == 4 and summary['days'] == 3
+    stats = daily_stats(database)
+    assert set(stats) == {"2026-03-01", "2026-03-03"}
+    assert stats["2026-03-01"]['active_users'] == 2
+    assert stats["2026-03-01"]['entries'] == 3
+    assert stats["2026-03-01"]['average_mood'] == 6.0
+    # Relative to the three users in scope, including carol who never logged
+    assert stats["2026-03-01"]['engagement_rate'] == round(2 / 3, 4)
+    with database.read_connection() as conn:
+        levels = dict(conn.execute("SELECT mood_level, entries FROM population_mood_distribution").fetchall())
+    assert (levels[4], levels[6], levels[8], levels[10], levels[1]) == (1, 1, 1, 1, 0)
+
+def test_rows_outside_the_scope_are_ignored(database, add_user, add_mood):
+    alice = add_user("alice")
+    add_mood(alice, 5, "2026-03-01 09:00:00")
+    add_mood(alice, 7, "2026-03-02 09:00:00")
+    job = PopulationAnalyticsJob(workers=1)
+    scope = job._scope
+
+    def scope_then_write():
+        result = scope()
+        # Logged after the scope was taken, and synced in with an older date
+        add_mood(alice, 9, "2026-03-05 00:30:00")
+        add_mood(alice, 1, "2025-12-31 23:00:00")
+        return result
+
+    job._scope = scope_then_write
+    summary = job.run()
+
+    assert summary['entries'] == 2
+    stats = daily_stats(database)
+    assert set(stats) == {"2026-03-01", "2026-03-02"}
+    assert stats["2026-03-01"]['average_mood'] == 5.0
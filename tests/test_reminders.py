@@ -0,0 +1,114 @@
+# tests/test_reminders.py
+import threading
+from calendar import timegm
+from datetime import datetime
+import pytest
+from business_layer.services.reminder_service import ReminderScheduler, ReminderService, ReminderSink
+
+def utc(stamp: str) -> float:
+    return float(timegm(datetime.strptime(stamp, "%Y-%m-%d %H:%M").timetuple()))
+
+NOW = utc("2026-03-10 12:00")
+
+class RecordingSink(ReminderSink):
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.received = []
+
+    def send(self, reminders):
+        if self.fail:
+            raise ConnectionError("push service unavailable")
+        self.received.extend(reminders)
+
+@pytest.fixture
+def users(database, add_user, add_mood):
+    """Users in three time zones; log dates are those of the (UTC) machine that logged."""
+    service = ReminderService()
+    alice, bob, carol, dave = (add_user(name) for name in ("alice", "bob", "carol", "dave"))
+    # UTC+10: 22:00 local on 2026-03-10; logged at 09:30 local that day (UTC date 03-09)
+    service.set_reminder(alice, "20:00", 600)
+    add_mood(alice, 6, "2026-03-09 23:30:00")
+    # UTC-5: 07:00 local on 2026-03-10; last logged at 23:00 local the day before (UTC date 03-10)
+    service.set_reminder(bob, "06:30", -300)
+    add_mood(bob, 4, "2026-03-10 04:00:00")
+    # UTC+1: reminder due later today, no entries
+    service.set_reminder(carol, "18:00", 60)
+    service.set_reminder(dave, "06:00", 60, enabled=False)
+    return {'alice': alice, 'bob': bob, 'carol': carol, 'dave': dave}
+
+def test_sink_must_implement_send():
+    with pytest.raises(TypeError):
+        ReminderSink()
+
+def test_pending_reminders_use_the_users_local_day(users):
+    sink = RecordingSink()
+    scheduler = ReminderService().create_scheduler(sink)
+
+    assert scheduler.plan(NOW) == 2
+    assert scheduler.next_due() == utc("2026-03-10 11:30")
+    assert scheduler.run_pending(NOW) == 1
+    assert [(r.username, r.local_date, r.due_at) for r in sink.received] == [
+        ("bob", "2026-03-10", utc("2026-03-10 11:30"))
+    ]
+
+    # Claimed reminders are not sent twice, even after replanning
+    assert scheduler.plan(NOW + 60) == 1
+    assert scheduler.run_pending(NOW + 60) == 0
+    assert scheduler.run_pending(utc("2026-03-10 17:00")) == 1
+    assert [r.username for r in sink.received] == ["bob", "carol"]
+
+def test_logging_before_the_due_time_cancels_the_reminder(users, add_mood):
+    scheduler = ReminderService().create_scheduler(RecordingSink())
+    scheduler.plan(NOW)
+    # 22:30 local on 2026-03-10 for carol (UTC+1)
+    add_mood(users['carol'], 7, "2026-03-10 21:30:00")
+    assert scheduler.run_pending(utc("2026-03-10 17:00")) == 1  # bob only
+
+    # The next local day plans again
+    assert scheduler.plan(utc("2026-03-11 12:00")) == 3
+
+def test_failed_delivery_is_retried(users):
+    sink = RecordingSink(fail=True)
+    scheduler = ReminderService().create_scheduler(sink)
+    scheduler.plan(NOW)
+    assert scheduler.run_pending(NOW) == 0
+
+    sink.fail = False
+    scheduler.plan(NOW + 60)
+    assert scheduler.run_pending(NOW + 60) == 1
+    assert [r.username for r in sink.received] == ["bob"]
+
+class FastForward(threading.Event):
+    """Stop event whose wait() advances a fake clock instead of sleeping."""
+
+    def __init__(self, now: float):
+        super().__init__()
+        self.now = now
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        self.now += timeout
+        if self.now > NOW + 24 * 60 * 60:
+            self.set()
+        return self.is_set()
+
+def test_scheduler_loop_sends_due_reminders(users):
+    stop = FastForward(NOW)
+
+    class StoppingSink(RecordingSink):
+        def send(self, reminders):
+            super().send(reminders)
+            if len(self.received) == 2:
+                stop.set()
+
+    sink = StoppingSink()
+    scheduler = ReminderScheduler(sink, replan_interval=7200, clock=lambda: stop.now)
+    scheduler.run(stop)
+
+    assert [(r.username, r.due_at) for r in sink.received] == [
+        ("bob", utc("2026-03-10 11:30")), ("carol", utc("2026-03-10 17:00"))
+    ]
+    # Woken by the replans at 14:00 and 16:00, then at carol's due time
+    assert stop.waits[:3] == [7200, 7200, 3600]
+    assert scheduler.sent == 2
@@ -0,0 +1,102 @@
+# tests/test_retention.py
+from datetime import datetime, timedelta
+import pytest
+from business_layer.analytics.population import PopulationAnalyticsJob
+from business_layer.services.mood_service import MoodService
+from business_layer.services.wellness_service import WellnessService
+from data_layer.dao.mood_dao import MoodDAO
+from data_layer.database.retention import RetentionManager, RetentionPolicy
+
+ALL_TIME = 5000
+
+@pytest.fixture
+def old_history(database, add_user, add_mood):
+    """Two users with entries older than a year, plus a few recent ones."""
+    alice, bob = add_user("alice"), add_user("bob")
+    start = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0) - timedelta(days=420)
+    levels = [3, 8, 8, 9, 2, 7, 7, 6, 10, 1, 5, 5, 4, 9]
+    for offset, level in enumerate(levels):
+        stamp = start + timedelta(days=offset // 2 * 3, hours=offset % 2 * 9)
+        add_mood(alice, level, stamp.strftime('%Y-%m-%d %H:%M:%S'))
+        add_mood(bob, 11 - level, (stamp + timedelta(hours=1)).strftime('%Y-%m-%d %H:%M:%S'))
+    for days_ago, level in ((3, 6), (2, 7), (2, 9)):
+        stamp = datetime.utcnow() - timedelta(days=days_ago)
+        add_mood(alice, level, stamp.strftime('%Y-%m-%d %H:%M:%S'))
+    # Everything so far has been pushed
+    with database.get_connection() as conn:
+        conn.execute("DELETE FROM sync_changes")
+        conn.commit()
+    return alice, bob
+
+def table(database, query):
+    with database.read_connection() as conn:
+        return [dict(row) for row in conn.execute(query)]
+
+def readers(user_id):
+    """Everything that reads the long-range history of a user."""
+    dao = MoodDAO()
+    extended = dao.get_extended_statistics(user_id, ALL_TIME)
+    extended.pop('trend_per_day')  # Compacted entries lose their time of day
+    report = MoodService().get_analytics_report(user_id)
+    report.pop('hour_of_day')
+    report.pop('first_entry')
+    report.pop('last_entry')
+    WellnessService().rebuild()
+    wellness = WellnessService().get_state(user_id).to_row()
+    # Fields of the latest entry depend on the order within a compacted day
+    for field in ('last_mood_id', 'last_mood_level', 'last_zscore', 'is_anomaly'):
+        wellness.pop(field)
+    return {
+        'statistics': dao.get_mood_statistics(user_id, ALL_TIME),
+        'extended': extended,
+        'report': report,
+        'wellness': wellness,
+    }
+
+def test_readers_see_compacted_history(database, old_history):
+    alice, bob = old_history
+    PopulationAnalyticsJob(workers=1).run()
+    population = table(database, "SELECT * FROM population_daily_stats ORDER BY day")
+    distribution = table(database, "SELECT mood_level, entries FROM population_mood_distribution ORDER BY mood_level")
+    before = {user_id: readers(user_id) for user_id in (alice, bob)}
+
+    result = RetentionManager(RetentionPolicy(raw_days=365, batch_size=5)).run()
+    assert result['compacted'] == 28
+    assert table(database, "SELECT COUNT(*) AS n FROM mood_logs") == [{'n': 3}]
+
+    for user_id in (alice, bob):
+        after = readers(user_id)
+        # The smoothed score depends on the order within a compacted day
+        score = before[user_id]['wellness'].pop('wellness_score')
+        assert after['wellness'].pop('wellness_score') == pytest.approx(score, abs=0.5)
+        assert after == before[user_id]
+    PopulationAnalyticsJob(workers=1).run()
+    assert table(database, "SELECT * FROM population_daily_stats ORDER BY day") == [
+        {**row, 'computed_at': after['computed_at']}
+        for row, after in zip(population, table(database, "SELECT computed_at FROM population_daily_stats ORDER BY day"))
+    ]
+    assert table(database, "SELECT mood_level, entries FROM population_mood_distribution ORDER BY mood_level") == distribution
+
+def test_summaries_use_the_local_log_date(database, add_user, add_mood):
+    user_id = add_user()
+    stamp = (datetime.utcnow() - timedelta(days=400)).replace(hour=23, minute=30)
+    local_day = (stamp + timedelta(days=1)).strftime('%Y-%m-%d')
+    add_mood(user_id, 6, stamp.strftime('%Y-%m-%d %H:%M:%S'), log_date=local_day)
+    with database.get_connection() as conn:
+        conn.execute("DELETE FROM sync_changes")
+        conn.commit()
+
+    assert RetentionManager().run()['compacted'] == 1
+    assert table(database, "SELECT day, mood_level, entries FROM mood_daily_summaries") == [
+        {'day': local_day, 'mood_level': 6, 'entries': 1}
+    ]
+
+def test_rows_waiting_to_be_pushed_are_kept(database, old_history):
+    alice, _ = old_history
+    with database.get_connection() as conn:
+        mood_id = conn.execute("SELECT MIN(mood_id) FROM mood_logs WHERE user_id = ?", (alice,)).fetchone()[0]
+    assert MoodDAO().update_mood_entry(mood_id, 5)
+    assert table(database, "SELECT COUNT(*) AS n FROM sync_changes") == [{'n': 1}]
+
+    assert RetentionManager().run()['compacted'] == 27
+    assert table(database, f"SELECT mood_level FROM mood_logs WHERE mood_id = {mood_id}") == [{'mood_level': 5}]
@@ -0,0 +1,132 @@
+# tests/test_sessions.py
+import pytest
+from business_layer.models.user import User
+from business_layer.services import session_service
+from business_layer.services.session_service import SessionService, hash_token
+
+T0 = 1_800_000_000
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake wall clock used by the session service."""
+    now = [float(T0)]
+    monkeypatch.setattr(session_service.time, "time", lambda: now[0])
+    return now
+
+@pytest.fixture
+def alice(add_user):
+    return User(user_id=add_user("alice"), username="alice", email="alice@example.com")
+
+def stored_expiry(database, token):
+    with database.read_connection() as conn:
+        row = conn.execute("SELECT expires_at FROM sessions WHERE token_hash = ?", (hash_token(token),)).fetchone()
+        return row[0] if row else None
+
+def make_service(**kwargs):
+    kwargs.setdefault("ttl", 1000)
+    kwargs.setdefault("renew_interval", 100)
+    return SessionService(**kwargs)
+
+def test_restore_returns_the_user(database, clock, alice):
+    token = make_service().create_session(alice)
+
+    with database.read_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sessions WHERE token_hash = ?", (token,)).fetchone()[0] == 0
+    # A fresh service (another process) finds it in the database
+    user = make_service().restore_session(token)
+    assert (user.user_id, user.username) == (alice.user_id, "alice")
+    assert make_service().restore_session("not-a-token") is None
+    assert make_service().restore_session(None) is None
+
+def test_use_renews_at_most_once_per_interval(database, clock, alice):
+    service = make_service()
+    token = service.create_session(alice)
+    assert stored_expiry(database, token) == T0 + 1000
+
+    clock[0] = T0 + 50
+    assert service.restore_session(token)
+    assert stored_expiry(database, token) == T0 + 1000
+
+    clock[0] = T0 + 150
+    assert service.restore_session(token)
+    assert stored_expiry(database, token) == T0 + 1150
+
+    # Regular use keeps the session alive past its first expiry
+    for step in range(1, 5):
+        clock[0] = T0 + 150 + step * 900
+        assert make_service().restore_session(token)
+    assert stored_expiry(database, token) == T0 + 150 + 4 * 900 + 1000
+
+def test_renewing_from_two_clients_keeps_the_later_expiry(database, clock, alice):
+    token = make_service().create_session(alice)
+    clock[0] = T0 + 500
+    first, second = make_service(), make_service(ttl=2000)
+    assert second.restore_session(token)
+    assert first.restore_session(token)
+    assert stored_expiry(database, token) == T0 + 500 + 2000
+
+def test_expired_sessions_are_refused_and_deleted(database, clock, alice):
+    service = make_service(cache_ttl=10_000)
+    token = service.create_session(alice)
+
+    clock[0] = T0 + 1000
+    assert service.restore_session(token) is None  # the cached entry expires too
+    assert stored_expiry(database, token) is None
+
+def test_purge_expired(database, clock, alice):
+    service = make_service()
+    old = service.create_session(alice)
+    clock[0] = T0 + 600
+    current = service.create_session(alice)
+
+    clock[0] = T0 + 1001
+    assert service.purge_expired() == 1
+    assert stored_expiry(database, old) is None
+    assert stored_expiry(database, current) == T0 + 1600
+
+def test_logins_purge_expired_sessions_once_per_interval(database, clock, alice):
+    service = make_service(purge_interval=500)
+    first = service.create_session(alice)
+    clock[0] = T0 + 400
+    second = service.create_session(alice)
+
+    clock[0] = T0 + 1001
+    service.create_session(alice)
+    assert stored_expiry(database, first) is None
+    # Expired, but the last purge was less than purge_interval ago
+    clock[0] = T0 + 1401
+    service.create_session(alice)
+    assert stored_expiry(database, second) == T0 + 1400
+
+    clock[0] = T0 + 1501
+    service.create_session(alice)
+    assert stored_expiry(database, second) is None
+
+def test_revoke_session(database, clock, alice):
+    service = make_service()
+    token, other = service.create_session(alice), service.create_session(alice)
+
+    assert service.revoke_session(token)
+    assert service.restore_session(token) is None
+    assert service.restore_session(other)
+    assert not service.revoke_session(token)
+
+def test_revoke_user_sessions(database, clock, alice, add_user):
+    service = make_service()
+    tokens = [service.create_session(alice) for _ in range(3)]
+    bob = User(user_id=add_user("bob"), username="bob")
+    bob_token = service.create_session(bob)
+
+    assert service.revoke_user_sessions(alice.user_id) == 3
+    assert all(service.restore_session(token) is None for token in tokens)
+    assert service.restore_session(bob_token).username == "bob"
+
+def test_revocation_elsewhere_applies_after_the_cache_ttl(database, clock, alice):
+    here = make_service(cache_ttl=60)
+    token = here.create_session(alice)
+    assert make_service().revoke_session(token)
+
+    clock[0] = T0 + 30
+    assert here.restore_session(token)  # still cached
+    clock[0] = T0 + 61
+    assert here.restore_session(token) is None
@@ -0,0 +1,85 @@
+# tests/test_statistics.py
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+from data_layer.dao.mood_dao import MoodDAO
+
+# (days ago, hour, mood level); two entries on the most recent day
+HISTORY = [(9, 8, 3), (8, 9, 4), (7, 10, 8), (6, 9, 9), (5, 9, 7), (3, 12, 2), (1, 8, 6), (1, 20, 10)]
+
+@pytest.fixture
+def history(add_user, add_mood):
+    user_id = add_user()
+    today = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    rows = []
+    for days_ago, hour, level in HISTORY:
+        stamp = (today - timedelta(days=days_ago)).replace(hour=hour)
+        add_mood(user_id, level, stamp.strftime('%Y-%m-%d %H:%M:%S'), stamp.strftime('%Y-%m-%d'))
+        rows.append((stamp, level))
+    # Outside a 30-day window
+    add_mood(user_id, 1, (today - timedelta(days=60)).strftime('%Y-%m-%d %H:%M:%S'))
+    return user_id, rows
+
+def test_basic_statistics(history):
+    user_id, rows = history
+    levels = [level for _, level in rows]
+    stats = MoodDAO().get_mood_statistics(user_id)
+    assert stats == {
+        'total_entries': len(levels),
+        'average_mood': round(np.mean(levels), 1),
+        'lowest_mood': min(levels),
+        'highest_mood': max(levels)
+    }
+    assert MoodDAO().get_mood_statistics(user_id, days=90)['total_entries'] == len(levels) + 1
+
+def test_extended_statistics(history):
+    user_id, rows = history
+    levels = np.array([level for _, level in rows], dtype=float)
+    stats = MoodDAO().get_extended_statistics(user_id)
+
+    assert stats['total_entries'] == levels.size
+    assert stats['average_mood'] == round(levels.mean(), 1)
+    assert stats['percentiles'] == {
+        name: round(float(np.percentile(levels, q)), 2)
+        for name, q in (('p25', 25), ('p50', 50), ('p75', 75), ('p90', 90))
+    }
+    assert stats['median'] == stats['percentiles']['p50']
+    assert stats['std_dev'] == round(float(levels.std(ddof=1)), 2)
+
+    # Least-squares slope of mood level against time in days
+    days = np.array([(stamp - rows[0][0]).total_seconds() / 86400 for stamp, _ in rows])
+    assert stats['trend_per_day'] == pytest.approx(np.polyfit(days, levels, 1)[0], abs=1e-4)
+
+    # Weekday means are means of daily averages
+    daily = {}
+    for stamp, level in rows:
+        daily.setdefault(stamp.date(), []).append(level)
+    weekday_means = {}
+    for day, values in daily.items():
+        weekday_means.setdefault(day.strftime('%a'), []).append(np.mean(values))
+    for name, value in stats['day_of_week'].items():
+        expected = weekday_means.get(name)
+        assert value == (round(float(np.mean(expected)), 2) if expected else None)
+
+def test_extended_statistics_streaks(history):
+    user_id, rows = history
+    streaks = MoodDAO().get_extended_statistics(user_id)['streaks']
+    first = rows[0][0].date()
+
+    def day(days_ago):
+        return (first + timedelta(days=9 - days_ago)).isoformat()
+
+    # Logged on days 9..5 ago, 3 ago and 1 ago
+    assert streaks['longest_logging'] == {
+        'length': 5, 'start': day(9), 'end': day(5), 'average_mood': 6.2
+    }
+    # Daily averages >= 7: days 7, 6, 5 and 1 ago (6 and 10 average to 8)
+    assert streaks['best'] == {'length': 3, 'start': day(7), 'end': day(5), 'average_mood': 8.0}
+    # Daily averages <= 4: days 9 and 8 ago, then day 3 ago
+    assert streaks['worst'] == {'length': 2, 'start': day(9), 'end': day(8), 'average_mood': 3.5}
+
+def test_extended_statistics_empty(add_user):
+    stats = MoodDAO().get_extended_statistics(add_user())
+    assert stats['total_entries'] == 0
+    assert stats['median'] is None and stats['trend_per_day'] is None
+    assert stats['streaks'] == {'best': None, 'worst': None, 'longest_logging': None}
@@ -0,0 +1,165 @@
+# tests/test_sync.py
+import threading
+import time
+import pytest
+import requests
+from business_layer.services.sync_service import SyncService
+from data_layer import settings
+from data_layer.dao.mood_dao import MoodDAO
+from data_layer.database.connection import DatabaseConnection
+from data_layer.sync.engine import HttpSyncTransport
+from data_layer.sync.server import SyncStore, serve
+
+@pytest.fixture
+def server():
+    """Local sync server with tokens for alice and bob."""
+    store = SyncStore()
+    httpd = serve(port=0, store=store)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}"
+    httpd.store = store
+    httpd.tokens = {account: store.set_token(account) for account in ("alice", "bob")}
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+class Device:
+    """One app installation: its own database, user and sync service."""
+
+    def __init__(self, path, monkeypatch, server, token=None, username="alice"):
+        self.path = path
+        with monkeypatch.context() as patch:
+            patch.setattr(settings, "DATABASE", path)
+            self.db = DatabaseConnection(path)
+            with self.db.get_connection() as conn:
+                self.user_id = conn.execute(
+                    "INSERT INTO users (username, email, password) VALUES (?, ?, 'x')",
+                    (username, f"{username}@example.com")
+                ).lastrowid
+                conn.commit()
+            self.moods = MoodDAO()
+            transport = HttpSyncTransport(server.url, token if token is not None else server.tokens[username])
+            self.sync_service = SyncService(transport)
+
+    def log(self, level, timestamp="2026-03-01 09:00:00"):
+        with self.db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO mood_logs (user_id, mood_level, timestamp) VALUES (?, ?, ?)",
+                (self.user_id, level, timestamp)
+            )
+            conn.commit()
+
+    def sync(self):
+        return self.sync_service.sync_user(self.user_id)
+
+    def entries(self):
+        with self.db.read_connection() as conn:
+            return {row["row_uuid"]: row["mood_level"] for row in conn.execute(
+                "SELECT row_uuid, mood_level FROM mood_logs ORDER BY mood_id"
+            )}
+
+    def mood_id(self, row_uuid):
+        with self.db.read_connection() as conn:
+            return conn.execute("SELECT mood_id FROM mood_logs WHERE row_uuid = ?", (row_uuid,)).fetchone()[0]
+
+@pytest.fixture
+def devices(tmp_path, monkeypatch, server, database):
+    return (Device(str(tmp_path / "phone.db"), monkeypatch, server),
+            Device(str(tmp_path / "laptop.db"), monkeypatch, server))
+
+def test_entries_replicate_between_devices(devices):
+    phone, laptop = devices
+    phone.log(4)
+    laptop.log(8, "2026-03-02 09:00:00")
+
+    assert phone.sync()[0]
+    success, _, result = laptop.sync()
+    assert success and result["pushed"] == 1 and result["applied"] == 1
+    assert phone.sync()[2]["applied"] == 1
+
+    assert phone.entries() == laptop.entries()
+    assert sorted(phone.entries().values()) == [4, 8]
+    # Nothing left to exchange
+    result = phone.sync()[2]
+    assert result["pushed"] == 0 and result["applied"] == 0
+
+def test_last_writer_wins_on_concurrent_edits(devices):
+    phone, laptop = devices
+    phone.log(5)
+    phone.sync()
+    laptop.sync()
+    (row_uuid,) = laptop.entries()
+
+    assert phone.moods.update_mood_entry(phone.mood_id(row_uuid), 3)
+    time.sleep(0.01)
+    assert laptop.moods.update_mood_entry(laptop.mood_id(row_uuid), 9)
+    phone.sync()
+    laptop.sync()
+    phone.sync()
+
+    assert phone.entries() == laptop.entries() == {row_uuid: 9}
+
+def test_more_edits_beat_a_later_single_edit(devices):
+    phone, laptop = devices
+    phone.log(5)
+    phone.sync()
+    laptop.sync()
+    (row_uuid,) = laptop.entries()
+
+    phone.moods.update_mood_entry(phone.mood_id(row_uuid), 2)
+    phone.moods.update_mood_entry(phone.mood_id(row_uuid), 3)
+    time.sleep(0.01)
+    laptop.moods.update_mood_entry(laptop.mood_id(row_uuid), 9)
+    laptop.sync()
+    phone.sync()
+    laptop.sync()
+
+    assert phone.entries() == laptop.entries() == {row_uuid: 3}
+
+def test_deletes_replicate(devices):
+    phone, laptop = devices
+    phone.log(5)
+    phone.sync()
+    laptop.sync()
+    (row_uuid,) = laptop.entries()
+
+    assert laptop.moods.delete_mood_entry(laptop.mood_id(row_uuid))
+    laptop.sync()
+    phone.sync()
+    assert phone.entries() == {}
+
+@pytest.mark.parametrize("token", ["", "not-a-token", "bob"])
+def test_requests_without_the_account_token_are_refused(tmp_path, monkeypatch, server, database, token):
+    token = server.tokens.get(token, token)
+    device = Device(str(tmp_path / "phone.db"), monkeypatch, server, token=token)
+    device.log(5)
+
+    success, message, _ = device.sync()
+
+    assert not success and "401" in message
+    assert server.store.pull("alice", "other-device", 0, 10)["changes"] == []
+    with device.db.read_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sync_changes").fetchone()[0] == 1
+
+def test_server_answers_401_with_a_challenge(server):
+    response = requests.post(f"{server.url}/accounts/alice/pull", json={"device_id": "d", "cursor": 0, "limit": 1},
+                             headers={"Authorization": f"Bearer {server.tokens['bob']}"})
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"].startswith("Bearer")
+
+def test_pull_updates_the_wellness_state(devices):
+    phone, laptop = devices
+    for day, level in ((1, 4), (2, 6), (3, 8)):
+        phone.log(level, f"2026-03-0{day} 09:00:00")
+    phone.sync()
+    laptop.sync()
+
+    state = laptop.sync_service.wellness_service.get_state(laptop.user_id)
+    assert (state.entry_count, state.mean) == (3, 6.0)
+
+    (first, *_) = phone.entries()
+    assert phone.moods.delete_mood_entry(phone.mood_id(first))
+    phone.sync()
+    laptop.sync()
+    state = laptop.sync_service.wellness_service.get_state(laptop.user_id)
+    assert (state.entry_count, state.mean) == (2, 7.0)
@@ -0,0 +1,176 @@
+# tests/test_tip_provider.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from data_layer.api import tip_provider
+from data_layer.api.tip_provider import CircuitBreaker, TipProvider
+
+class StubTipServer:
+    """Local tip endpoint that counts requests and can be switched to failing."""
+
+    def __init__(self):
+        self.requests = []
+        self.failing = False
+        self.body = None  # Raw response body overriding the default tips
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(self.path)
+                if stub.failing:
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                band = self.path.split("band=")[-1]
+                body = stub.body or json.dumps({"tips": [f"{band} tip 1", f"{band} tip 2"]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/tips"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+@pytest.fixture
+def stub():
+    server = StubTipServer()
+    yield server
+    server.server.shutdown()
+    server.server.server_close()
+
+@pytest.fixture
+def make_provider(tmp_path):
+    providers = []
+
+    def make(url, **kwargs):
+        kwargs.setdefault("cache_path", str(tmp_path / "tip_cache.json"))
+        provider = TipProvider(url=url, ttl=kwargs.pop("ttl", 3600), timeout=2.0,
+                               fallback=lambda level: f"bundled {level}", **kwargs)
+        providers.append(provider)
+        return provider
+    yield make
+    for provider in providers:
+        provider._executor.shutdown(wait=True)
+
+def wait_for_refresh(provider, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while provider._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_breaker_opens_after_repeated_failures(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tip_provider.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    now[0] += 30
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()  # a single trial call at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+def test_get_tip_answers_from_the_fallback_then_the_cache(stub, make_provider):
+    provider = make_provider(stub.url)
+
+    assert provider.get_tip(3) == "bundled 3"
+    wait_for_refresh(provider)
+    assert stub.requests == ["/tips?band=low"]
+
+    assert [provider.get_tip(4), provider.get_tip(3), provider.get_tip(4)] == ["low tip 1", "low tip 2", "low tip 1"]
+    assert len(stub.requests) == 1  # fresh cache, no further requests
+
+def test_cache_file_is_reused_across_providers(stub, make_provider):
+    assert make_provider(stub.url).fetch("great") == ["great tip 1", "great tip 2"]
+
+    provider = make_provider(stub.url)
+    assert provider.get_tip(10) == "great tip 1"
+    wait_for_refresh(provider)
+    assert len(stub.requests) == 1
+
+def test_expired_tips_are_served_while_refreshing(stub, make_provider):
+    provider = make_provider(stub.url, ttl=0)
+    provider.fetch("good")
+    stub.failing = True
+
+    assert provider.get_tip(7) == "good tip 1"
+    wait_for_refresh(provider)
+    assert len(stub.requests) == 2
+    assert provider.get_tip(8) == "good tip 2"
+
+def test_failing_endpoint_trips_the_breaker(stub, make_provider):
+    stub.failing = True
+    provider = make_provider(stub.url, breaker=CircuitBreaker(failure_threshold=3, reset_timeout=60))
+
+    for _ in range(5):
+        assert provider.fetch("neutral") is None
+    assert len(stub.requests) == 3
+    assert provider.breaker.state == "open"
+    assert provider.get_tip(5) == "bundled 5"
+
+def test_provider_without_url_never_calls_out(make_provider):
+    provider = make_provider("")
+    assert provider.get_tip(1) == "bundled 1"
+    assert provider.fetch("very_low") is None
+
+def test_container_injects_the_strategy_catalog(database, monkeypatch):
+    from business_layer.services.container import ServiceContainer
+
+    monkeypatch.setattr(tip_provider, "_provider", None)
+    services = ServiceContainer()
+    provider = services.tip_provider
+    assert provider.fallback(1) == services.strategy_catalog.get_tip(1)
+
+@pytest.mark.parametrize("body", [b'{"tips": 5}', b'{"tips": "one tip"}', b'{"tips": ["ok", 3]}',
+                                  b'["a tip"]', b'{"tip": 7}', b'{"tips": []}', b"not json"])
+def test_malformed_bodies_count_as_failures(stub, make_provider, body):
+    stub.body = body
+    provider = make_provider(stub.url, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60))
+
+    assert provider.fetch("low") is None
+    assert provider.breaker.state == "open"
+    assert provider.get_tip(3) == "bundled 3"
+
+def test_single_tip_bodies_are_accepted(stub, make_provider):
+    stub.body = b'{"tip": "  Breathe slowly.  "}'
+    assert make_provider(stub.url).fetch("low") == ["Breathe slowly."]
+
+def test_malformed_body_ends_the_half_open_trial(stub, make_provider, monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(tip_provider.time, "monotonic", lambda: now[0])
+    provider = make_provider(stub.url, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=30))
+    stub.failing = True
+    assert provider.fetch("good") is None
+
+    now[0] += 30
+    stub.failing, stub.body = False, b'{"tips": 5}'
+    assert provider.fetch("good") is None
+    assert provider.breaker.state == "open"
+
+    now[0] += 30
+    stub.body = None
+    assert provider.fetch("good") == ["good tip 1", "good tip 2"]
+    assert provider.breaker.state == "closed"
+
+def test_cli_survives_a_malformed_body(stub, tmp_path, capsys):
+    stub.body = b'{"tips": 5}'
+    tip_provider.main(["--url", stub.url, "--level", "3", "--cache", str(tmp_path / "tips.json")])
+    out = capsys.readouterr().out
+    assert "No remote tips for band 'low'" in out
+    assert tip_provider.DEFAULT_TIP in out
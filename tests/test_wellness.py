@@ -0,0 +1,137 @@
+# tests/test_wellness.py
+import threading
+from datetime import date
+import pytest
+from business_layer.services.mood_service import MoodService
+from business_layer.services.wellness_service import WellnessService
+
+def mood_count(database, user_id):
+    with database.read_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM mood_logs WHERE user_id = ?", (user_id,)).fetchone()[0]
+
+def test_log_mood_updates_state(add_user):
+    user_id = add_user()
+    service = MoodService()
+    for level in (6, 7, 8):
+        assert service.log_mood(user_id, level)[0]
+
+    state = service.get_wellness_state(user_id)
+    assert state.entry_count == 3
+    assert state.mean == pytest.approx(7.0)
+    assert state.last_mood_level == 8
+    # Streak days are local days, the same as mood_logs.log_date
+    assert state.last_log_date == date.today()
+    assert state.current_streak == 1
+
+def test_failed_state_update_rolls_back_the_entry(database, add_user, monkeypatch):
+    user_id = add_user()
+    service = MoodService()
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("state write failed")
+    monkeypatch.setattr(service.wellness_service, "apply_write", broken)
+
+    success, _, _ = service.log_mood(user_id, 5)
+    assert not success
+    assert mood_count(database, user_id) == 0
+
+def test_concurrent_writers_do_not_lose_updates(database, add_user):
+    user_id = add_user()
+    # Separate service instances share no in-process lock, like separate processes
+    services = [MoodService(WellnessService()) for _ in range(4)]
+
+    def write(service):
+        for level in range(1, 11):
+            assert service.log_mood(user_id, level)[0]
+
+    threads = [threading.Thread(target=write, args=(service,)) for service in services]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    state = WellnessService().get_state(user_id)
+    assert state.entry_count == mood_count(database, user_id) == 40
+    assert state.mean == pytest.approx(5.5)
+
+def test_update_mood_corrects_state(add_user):
+    user_id = add_user()
+    service = MoodService()
+    service.log_mood(user_id, 4)
+    mood_id = service.get_wellness_state(user_id).last_mood_id
+
+    assert service.update_mood(mood_id, 8)[0]
+    state = service.get_wellness_state(user_id)
+    assert (state.entry_count, state.mean, state.last_mood_level) == (1, 8.0, 8)
+    assert not service.update_mood(mood_id + 100, 8)[0]
+
+def test_delete_mood_rebuilds_state(database, add_user):
+    user_id = add_user()
+    service = MoodService()
+    for level in (4, 6, 8):
+        service.log_mood(user_id, level)
+    mood_id = service.get_wellness_state(user_id).last_mood_id
+
+    assert service.delete_mood(mood_id)[0]
+    state = service.get_wellness_state(user_id)
+    assert (state.entry_count, state.mean, state.last_mood_level) == (2, 5.0, 6)
+    assert state.last_mood_id != mood_id
+    assert mood_count(database, user_id) == 2
+    assert not service.delete_mood(mood_id)[0]
+
+def test_failed_rebuild_keeps_the_deleted_entry(database, add_user, monkeypatch):
+    user_id = add_user()
+    service = MoodService()
+    service.log_mood(user_id, 5)
+    mood_id = service.get_wellness_state(user_id).last_mood_id
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("rebuild failed")
+    monkeypatch.setattr(service.wellness_service, "rebuild_in_transaction", broken)
+    with pytest.raises(RuntimeError):
+        service.delete_mood(mood_id)
+    assert mood_count(database, user_id) == 1
+    assert service.get_wellness_state(user_id).entry_count == 1
+
+def test_rebuild_uses_local_days(add_user, add_mood):
+    user_id = add_user()
+    # Late-evening entries whose local day is already the next UTC day
+    add_mood(user_id, 5, "2026-01-01 23:30:00", log_date="2026-01-02")
+    add_mood(user_id, 6, "2026-01-02 23:30:00", log_date="2026-01-03")
+    add_mood(user_id, 7, "2026-01-05 08:00:00", log_date="2026-01-05")
+
+    service = WellnessService()
+    assert service.rebuild(user_id) == 1
+    state = service.get_state(user_id)
+    assert state.last_log_date == date(2026, 1, 5)
+    assert (state.entry_count, state.best_streak, state.current_streak) == (3, 2, 1)
+
+def test_streak_is_broken_after_a_missed_day(add_user, add_mood):
+    user_id = add_user()
+    add_mood(user_id, 5, "2026-01-01 09:00:00", log_date="2026-01-01")
+    add_mood(user_id, 6, "2026-01-02 09:00:00", log_date="2026-01-02")
+    service = WellnessService()
+    service.rebuild(user_id)
+    state = service.get_state(user_id)
+
+    assert state.streak_as_of(date(2026, 1, 2)) == 2
+    # Still alive the next day: today's entry can extend it
+    assert state.to_dict(today=date(2026, 1, 3))['current_streak'] == 2
+    assert state.to_dict(today=date(2026, 1, 4))['current_streak'] == 0
+    assert state.to_dict()['current_streak'] == 0
+    assert state.to_dict()['best_streak'] == 2
+
+def test_rebuild_matches_incremental_state(add_user):
+    user_id = add_user()
+    service = MoodService()
+    for level in (3, 9, 4, 10, 2, 8):
+        service.log_mood(user_id, level)
+    incremental = service.get_wellness_state(user_id)
+
+    service.wellness_service.rebuild(user_id)
+    rebuilt = service.get_wellness_state(user_id)
+    assert rebuilt.entry_count == incremental.entry_count
+    assert rebuilt.mean == pytest.approx(incremental.mean)
+    assert rebuilt.m2 == pytest.approx(incremental.m2)
+    assert rebuilt.wellness_score == pytest.approx(incremental.wellness_score)
+    assert rebuilt.last_log_date == incremental.last_log_date
@@ -0,0 +1,379 @@
+# tools/load_test.py
+"""
+Load generator simulating many concurrent app sessions.
+
+Each simulated session registers its own user, logs in and then loops over
+weighted operations (log a mood, open the dashboard, recommendations,
+analytics, extended statistics, save a journal entry) with exponentially
+distributed think times. Sessions run as threads, optionally spread over
+several processes (one SQLite writer per process then competes for the
+file lock, as separate app servers would).
+
+Failures whose database message is "database is locked" are retried with
+backoff up to --retries times. The report lists throughput and, per
+operation, p50/p99 latency, failures, lock errors and retries.
+
+Run from the project root, e.g. against a throw-away database:
+
+    MINDFULBALANCE_DATABASE=/tmp/load.db python -m tools.load_test --sessions 50 --duration 30
+    python -m tools.load_test --sessions 200 --processes 4 --think 0.2
+    python -m tools.load_test --sessions 20 --ui       # drive headless LoginApp flows
+
+In-memory databases are private to a process, so use a file with --processes.
+"""
+import argparse
+import io
+import multiprocessing as mp
+import random
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from business_layer.analytics.streaming import QuantileSketch
+
+LOCKED_MESSAGE = "database is locked"
+
+# Operation weights inside a session loop
+DEFAULT_MIX = {
+    "log_mood": 3,
+    "dashboard": 5,
+    "recommendations": 2,
+    "analytics": 1,
+    "extended_stats": 1,
+    "save_journal": 1,
+}
+
+class _LockWatch(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that counts "database is locked" messages per thread.
+
+    DAOs report database errors by printing them, so this is where lock
+    errors become visible to the harness. Other output is passed through
+    only when verbose.
+    """
+
+    def __init__(self, target, verbose: bool = False):
+        self.target = target
+        self.verbose = verbose
+        self.local = threading.local()
+
+    @property
+    def locked(self) -> int:
+        return getattr(self.local, 'locked', 0)
+
+    def write(self, text: str) -> int:
+        if LOCKED_MESSAGE in text:
+            self.local.locked = self.locked + 1
+        if self.verbose:
+            return self.target.write(text)
+        return len(text)
+
+    def flush(self):
+        self.target.flush()
+
+class OperationStats:
+    """Mergeable per-operation counters and latency sketch (milliseconds)."""
+
+    def __init__(self):
+        self.count = 0
+        self.failures = 0
+        self.lock_errors = 0
+        self.retries = 0
+        self.latencies: List[float] = []
+        self.sketch = QuantileSketch('ms', relative_accuracy=0.01)
+
+    def fold(self):
+        """Move the buffered latencies into the sketch."""
+        if self.latencies:
+            block = np.zeros(len(self.latencies), dtype=[('ms', 'f8')])
+            block['ms'] = self.latencies
+            self.sketch.update(block)
+            self.latencies = []
+
+    def merge(self, other: "OperationStats") -> "OperationStats":
+        self.fold()
+        other.fold()
+        self.count += other.count
+        self.failures += other.failures
+        self.lock_errors += other.lock_errors
+        self.retries += other.retries
+        self.sketch.merge(other.sketch)
+        return self
+
+class Session:
+    """One simulated user: registers, logs in, then runs the operation mix."""
+
+    def __init__(self, services, watch: _LockWatch, stats: Dict[str, OperationStats],
+                 stats_lock: threading.Lock, think: float, retries: int, ui: bool, rng: random.Random):
+        self.services = services
+        self.watch = watch
+        self.stats = stats
+        self.stats_lock = stats_lock
+        self.think = think
+        self.retries = retries
+        self.ui = ui
+        self.rng = rng
+        self.username = f"load_{uuid.uuid4().hex[:12]}"
+        self.password = "LoadTest123!"
+        self.user = None
+        self.app = None
+        self.page = None
+
+    def timed(self, name: str, operation: Callable[[], bool]) -> bool:
+        """Run an operation, retrying lock failures, and record the outcome."""
+        attempt = 0
+        lock_errors = 0
+        while True:
+            locked_before = self.watch.locked
+            started = time.perf_counter()
+            try:
+                ok = bool(operation())
+            except sqlite3.OperationalError as e:
+                ok = False
+                if LOCKED_MESSAGE in str(e):
+                    self.watch.local.locked = self.watch.locked + 1
+            except Exception:
+                ok = False
+            elapsed = (time.perf_counter() - started) * 1000
+            locked = self.watch.locked > locked_before
+            lock_errors += int(locked)
+            if ok or not locked or attempt >= self.retries:
+                break
+            attempt += 1
+            time.sleep(min(1.0, 0.01 * 2 ** attempt) * self.rng.random())
+
+        with self.stats_lock:
+            stats = self.stats.setdefault(name, OperationStats())
+            stats.count += 1
+            stats.failures += int(not ok)
+            stats.lock_errors += lock_errors
+            stats.retries += attempt
+            stats.latencies.append(elapsed)
+        return ok
+
+    def pause(self):
+        if self.think > 0:
+            time.sleep(self.rng.expovariate(1 / self.think))
+
+    def start(self) -> bool:
+        user_service = self.services.user_service
+        registered = self.timed("register", lambda: user_service.register_user(
+            self.username, f"{self.username}@example.com", self.password)[0])
+        if not registered:
+            return False
+        if self.ui:
+            return self.timed("ui_login", self._ui_login)
+
+        def login():
+            success, _, user = user_service.authenticate_user(self.username, self.password)
+            self.user = user
+            return success
+        return self.timed("login", login)
+
+    def _ui_login(self) -> bool:
+        from presentation_layer.flet_app.main import LoginApp
+        self.page = HeadlessPage()
+        self.app = LoginApp(self.services)
+        self.app.main(self.page)
+        self.app.show_login_page(self.page)
+        self.app.username_field.value = self.username
+        self.app.password_field.value = self.password
+        self.app.handle_login(self.page)
+        self.user = self.app.current_user
+        return self.user is not None
+
+    def _ui_log_mood(self, level: int) -> bool:
+        import flet as ft
+        self.app.log_mood(level, self.page)
+        # LoginApp reports the outcome in the snack bar
+        return self.app.view.snack_bar.bgcolor == ft.Colors.GREEN_600
+
+    def step(self, operation: str):
+        mood_service = self.services.mood_service
+        user_id = self.user.user_id
+        if operation == "log_mood":
+            level = self.rng.randint(1, 10)
+            if self.ui:
+                self.timed("log_mood", lambda: self._ui_log_mood(level))
+            else:
+                self.timed("log_mood", lambda: mood_service.log_mood(user_id, level)[0])
+        elif operation == "dashboard":
+            self.timed("dashboard", lambda: mood_service.get_dashboard_snapshot(user_id) is not None)
+        elif operation == "recommendations":
+            self.timed("recommendations", lambda: mood_service.get_mood_recommendations(user_id) is not None)
+        elif operation == "analytics":
+            self.timed("analytics", lambda: mood_service.get_analytics_report(user_id) is not None)
+        elif operation == "extended_stats":
+            self.timed("extended_stats", lambda: mood_service.get_extended_statistics(user_id) is not None)
+        elif operation == "save_journal":
+            self.timed("save_journal", lambda: self.services.journal_service.save_entry(
+                user_id, f"Load test entry {uuid.uuid4().hex[:8]}")[0])
+
+    def logout(self):
+        if self.ui and self.app is not None:
+            self.app.logout(self.page)
+
+class HeadlessStorage(dict):
+    """In-memory stand-in for ft.Page.client_storage."""
+
+    def set(self, key, value):
+        self[key] = value
+        return True
+
+    def remove(self, key):
+        return self.pop(key, None) is not None
+
+class HeadlessPage:
+    """Just enough of ft.Page for LoginApp to run without a Flet client."""
+
+    def __init__(self):
+        self.overlay = []
+        self.controls = []
+        self.updates = 0
+        self.title = ""
+        self.on_close = None
+        self.client_storage = HeadlessStorage()
+
+    def update(self, *controls):
+        self.updates += 1
+
+def run_sessions(sessions: int, duration: float, think: float, retries: int, ui: bool,
+                 mix: Dict[str, int], seed: int, verbose: bool = False) -> Tuple[Dict[str, OperationStats], float]:
+    """
+    Run `sessions` concurrent sessions as threads in this process.
+
+    Returns:
+        Tuple of (stats per operation, elapsed seconds)
+    """
+    from business_layer.services.container import get_services
+
+    services = get_services()
+    if ui:
+        import presentation_layer.flet_app.main  # Keep the import out of the first login's latency
+    watch = _LockWatch(sys.stdout, verbose)
+    stats: Dict[str, OperationStats] = {}
+    stats_lock = threading.Lock()
+    operations, weights = list(mix), list(mix.values())
+    deadline = time.monotonic() + duration
+
+    def run(index: int):
+        rng = random.Random(seed * 100003 + index)
+        session = Session(services, watch, stats, stats_lock, think, retries, ui, rng)
+        if not session.start():
+            return
+        while time.monotonic() < deadline:
+            session.step(rng.choices(operations, weights)[0])
+            session.pause()
+        session.logout()
+
+    previous_stdout, sys.stdout = sys.stdout, watch
+    started = time.perf_counter()
+    try:
+        threads = [threading.Thread(target=run, args=(i,), name=f"session-{i}") for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.stdout = previous_stdout
+    elapsed = time.perf_counter() - started
+
+    for operation in stats.values():
+        operation.fold()
+    return stats, elapsed
+
+def _process_main(args: Tuple) -> Tuple[Dict[str, OperationStats], float]:
+    return run_sessions(*args)
+
+def run_load_test(sessions: int = 20, duration: float = 30.0, think: float = 0.5, processes: int = 1,
+                  retries: int = 3, ui: bool = False, mix: Optional[Dict[str, int]] = None,
+                  seed: int = 1, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Run the load test and summarize it.
+
+    Args:
+        sessions: Total concurrent sessions
+        duration: Seconds each session keeps running operations
+        think: Mean think time between operations in seconds (0 = none)
+        processes: Worker processes the sessions are spread over
+        retries: Retries of an operation that failed with a lock error
+        ui: Drive headless LoginApp flows instead of the services directly
+        mix: Operation weights (default DEFAULT_MIX)
+        seed: Random seed
+        verbose: Pass application output through
+
+    Returns:
+        Dictionary with totals, throughput and per-operation figures
+    """
+    mix = mix or DEFAULT_MIX
+    processes = max(1, min(processes, sessions))
+    if processes == 1:
+        stats, elapsed = run_sessions(sessions, duration, think, retries, ui, mix, seed, verbose)
+    else:
+        from data_layer.database.connection import DatabaseConnection
+        DatabaseConnection()  # Create the schema once, before the workers race for it
+        shares = [sessions // processes + (1 if i < sessions % processes else 0) for i in range(processes)]
+        jobs = [(share, duration, think, retries, ui, mix, seed + i, verbose) for i, share in enumerate(shares)]
+        with mp.get_context("spawn").Pool(processes) as pool:
+            results = pool.map(_process_main, jobs)
+        stats = {}
+        for process_stats, _ in results:
+            for name, operation in process_stats.items():
+                stats.setdefault(name, OperationStats()).merge(operation)
+        elapsed = max(process_elapsed for _, process_elapsed in results)
+
+    total = sum(operation.count for operation in stats.values())
+    return {
+        'sessions': sessions,
+        'processes': processes,
+        'elapsed_seconds': round(elapsed, 2),
+        'operations': total,
+        'throughput': round(total / elapsed, 1) if elapsed else 0.0,
+        'failures': sum(operation.failures for operation in stats.values()),
+        'lock_errors': sum(operation.lock_errors for operation in stats.values()),
+        'retries': sum(operation.retries for operation in stats.values()),
+        'per_operation': {
+            name: {
+                'count': operation.count,
+                'p50_ms': round(operation.sketch.quantile(0.5) or 0, 2),
+                'p99_ms': round(operation.sketch.quantile(0.99) or 0, 2),
+                'failures': operation.failures,
+                'lock_errors': operation.lock_errors,
+                'retries': operation.retries,
+            } for name, operation in sorted(stats.items())
+        }
+    }
+
+def print_report(report: Dict[str, Any]):
+    print(f"{report['sessions']} sessions in {report['processes']} process(es), "
+          f"{report['elapsed_seconds']} s: {report['operations']} operations, "
+          f"{report['throughput']} ops/s")
+    print(f"failures {report['failures']}, '{LOCKED_MESSAGE}' errors {report['lock_errors']}, "
+          f"retries {report['retries']}")
+    print(f"{'operation':<16}{'count':>8}{'p50 ms':>10}{'p99 ms':>10}{'failed':>8}{'locked':>8}{'retries':>9}")
+    for name, row in report['per_operation'].items():
+        print(f"{name:<16}{row['count']:>8}{row['p50_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+              f"{row['failures']:>8}{row['lock_errors']:>8}{row['retries']:>9}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent MindfulBalance sessions.")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions (default 20)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run (default 30)")
+    parser.add_argument("--think", type=float, default=0.5, help="mean think time in seconds (default 0.5)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes (default 1)")
+    parser.add_argument("--retries", type=int, default=3, help="retries after a lock error (default 3)")
+    parser.add_argument("--ui", action="store_true", help="drive headless LoginApp flows")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verbose", action="store_true", help="show application output")
+    args = parser.parse_args(argv)
+
+    print_report(run_load_test(args.sessions, args.duration, args.think, args.processes,
+                               args.retries, args.ui, seed=args.seed, verbose=args.verbose))
+
+if __name__ == "__main__":
+    main()